@@ -0,0 +1,184 @@
+# batched_collision_simulator.py
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Keep each chunk's (trials x items) matrix around 32 MB of int64
+DEFAULT_CHUNK_ELEMENTS = 2 ** 22
+
+
+@dataclass
+class SimulationResult:
+    """Monte Carlo collision estimate with a confidence interval."""
+    probability: float
+    lower: float
+    upper: float
+    collisions: int
+    trials: int
+    confidence: float
+
+
+def wilson_interval(successes: int, trials: int,
+                    confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion.
+
+    Unlike the normal approximation it stays inside [0, 1] and behaves
+    well when the estimate is 0 or 1.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half_width = (z / denominator) * math.sqrt(
+        p * (1 - p) / trials + z * z / (4 * trials * trials))
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def _rows_with_collision(values: np.ndarray,
+                         total_possible_values: int) -> np.ndarray:
+    """
+    Flag rows of a (trials x items) matrix that contain a repeated value.
+
+    Small spaces use a per-row bitmap (bincount over row-offset values);
+    larger ones sort each row and look for equal neighbours.
+    """
+    rows, items = values.shape
+    if total_possible_values <= 8 * items:
+        offsets = np.arange(rows, dtype=np.int64)[:, None] * total_possible_values
+        counts = np.bincount((values + offsets).ravel(),
+                             minlength=rows * total_possible_values)
+        return (counts.reshape(rows, total_possible_values) > 1).any(axis=1)
+
+    values.sort(axis=1)
+    return (values[:, 1:] == values[:, :-1]).any(axis=1)
+
+
+def _simulate_chunk(task) -> int:
+    """Worker entry point: run one chunk of trials, return its collision count."""
+    number_of_items, total_possible_values, trials, chunk_elements, seed_sequence = task
+    rng = np.random.default_rng(seed_sequence)
+    dtype = np.int32 if total_possible_values <= 2 ** 31 else np.int64
+
+    # Bitmaps need rows * d counters, so shrink the batch for dense spaces
+    if total_possible_values <= 8 * number_of_items:
+        batch = max(1, chunk_elements // total_possible_values)
+    else:
+        batch = trials
+
+    collisions = 0
+    for start in range(0, trials, batch):
+        rows = min(batch, trials - start)
+        values = rng.integers(0, total_possible_values,
+                              size=(rows, number_of_items), dtype=dtype)
+        collisions += int(_rows_with_collision(values,
+                                               total_possible_values).sum())
+    return collisions
+
+
+def batched_collision_simulator(number_of_items: int,
+                                total_possible_values: int,
+                                trials: int = 10000,
+                                seed: Optional[int] = None,
+                                processes: int = 1,
+                                chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+                                confidence: float = 0.95) -> SimulationResult:
+    """
+    Vectorized Monte Carlo simulation of collision probability.
+
+    Trials are drawn as (trials x items) integer matrices in memory-bounded
+    chunks. Each chunk gets its own child of one SeedSequence, so results
+    are reproducible for a given seed no matter how many processes run.
+
+    Args:
+        number_of_items: Items drawn per trial (n)
+        total_possible_values: Size of the value space (d), at most 2^63
+        trials: Number of independent trials
+        seed: Root seed for reproducible runs
+        processes: Worker processes (1 runs in the calling process)
+        chunk_elements: Approximate matrix (or bitmap) size per chunk
+        confidence: Confidence level for the Wilson interval
+
+    Returns:
+        SimulationResult with the estimate and its confidence interval
+    """
+    if trials <= 0:
+        raise ValueError(f"trials must be positive, got {trials}")
+    if total_possible_values > 2 ** 63:
+        raise ValueError("Spaces above 2^63 can't be sampled as int64; "
+                         "use exact_collision_probability instead")
+
+    # Trivial cases need no sampling
+    if number_of_items <= 1 or number_of_items > total_possible_values:
+        collisions = 0 if number_of_items <= 1 else trials
+        lower, upper = wilson_interval(collisions, trials, confidence)
+        return SimulationResult(collisions / trials, lower, upper,
+                                collisions, trials, confidence)
+
+    chunk_trials = max(1, chunk_elements // number_of_items)
+    chunk_sizes = [min(chunk_trials, trials - start)
+                   for start in range(0, trials, chunk_trials)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [(number_of_items, total_possible_values, size, chunk_elements, child)
+             for size, child in zip(chunk_sizes, seeds)]
+
+    if processes <= 1:
+        collisions = sum(map(_simulate_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            collisions = sum(pool.map(_simulate_chunk, tasks))
+
+    lower, upper = wilson_interval(collisions, trials, confidence)
+    return SimulationResult(collisions / trials, lower, upper,
+                            collisions, trials, confidence)
+
+
+if __name__ == "__main__":
+    import os
+    import time
+    from collision_threshold import collision_simulator
+    from exact_collision_probability import exact_collision_probability
+
+    print("=" * 60)
+    print("Batched Monte Carlo Collision Simulator")
+    print("=" * 60)
+
+    processes = os.cpu_count() or 1
+    cases = [
+        (23, 365, 1_000_000),        # Birthday problem
+        (5, 10, 1_000_000),          # Tiny space (bitmap path)
+        (10_000, 2 ** 32, 20_000),   # 32-bit IDs
+    ]
+
+    for n, d, trials in cases:
+        start = time.perf_counter()
+        result = batched_collision_simulator(n, d, trials, seed=2024,
+                                             processes=processes)
+        elapsed = time.perf_counter() - start
+        exact = exact_collision_probability(n, d)
+        inside = result.lower <= exact <= result.upper
+
+        print(f"\nn={n:,}, d={d:,}, {trials:,} trials "
+              f"({processes} process(es), {elapsed:.2f} s)")
+        print(f"  Simulated: {result.probability:.4%} "
+              f"[{result.lower:.4%}, {result.upper:.4%}] "
+              f"({result.confidence:.0%} CI)")
+        print(f"  Exact:     {exact:.4%} {'✓' if inside else '✗'}")
+
+    # Compare against the original set()-based loop
+    print("\nSpeed vs collision_simulator (n=10,000, d=2^32, 200 trials):")
+    start = time.perf_counter()
+    collision_simulator(10_000, 2 ** 32, 200)
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    batched_collision_simulator(10_000, 2 ** 32, 200, seed=1)
+    batched = time.perf_counter() - start
+    print(f"  Python loop: {loop:.3f} s, batched: {batched:.3f} s "
+          f"({loop / batched:.0f}x faster)")
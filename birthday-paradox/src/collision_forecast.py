@@ -0,0 +1,352 @@
+# collision_forecast.py
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+from batched_collision_simulator import DEFAULT_CHUNK_ELEMENTS
+from collision_threshold import find_collision_threshold
+from vectorized_collision_probability import log_no_collision_probability_array
+
+SECONDS_PER_DAY = 24 * 3600
+SECONDS_PER_YEAR = 365.25 * SECONDS_PER_DAY
+
+# Forecasts stop looking after this many days (about a million years)
+MAX_FORECAST_DAYS = 365.25e6
+
+
+@dataclass
+class LinearGrowth:
+    """N(t) = initial + rate·t, t in days."""
+    initial: float
+    rate: float  # items per day
+
+    def items(self, days):
+        return self.initial + self.rate * np.asarray(days, dtype=float)
+
+    def items_per_day(self, days):
+        return np.full(np.shape(days), float(self.rate))
+
+    def time_at(self, items):
+        """Day the item count reaches `items` (0 if already there)."""
+        items = np.asarray(items, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            days = (items - self.initial) / self.rate
+        days = np.where(self.rate > 0, days, np.inf)
+        return np.where(items <= self.initial, 0.0, days)
+
+
+@dataclass
+class ExponentialGrowth:
+    """N(t) = initial·e^(rate·t), t in days."""
+    initial: float
+    rate: float  # continuous growth rate per day (0.01 = ~1%/day)
+
+    def items(self, days):
+        return self.initial * np.exp(self.rate * np.asarray(days, dtype=float))
+
+    def items_per_day(self, days):
+        return self.rate * self.items(days)
+
+    def time_at(self, items):
+        items = np.asarray(items, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            days = np.log(items / self.initial) / self.rate
+        days = np.where(self.rate > 0, days, np.inf)
+        return np.where(items <= self.initial, 0.0, days)
+
+
+@dataclass
+class LogisticGrowth:
+    """N(t) = K / (1 + (K/initial - 1)·e^(-rate·t)), saturating at K."""
+    initial: float
+    rate: float      # growth rate per day while far below capacity
+    capacity: float  # K, the eventual item count
+
+    def items(self, days):
+        days = np.asarray(days, dtype=float)
+        ratio = self.capacity / self.initial - 1
+        return self.capacity / (1 + ratio * np.exp(-self.rate * days))
+
+    def items_per_day(self, days):
+        items = self.items(days)
+        return self.rate * items * (1 - items / self.capacity)
+
+    def time_at(self, items):
+        items = np.asarray(items, dtype=float)
+        ratio = self.capacity / self.initial - 1
+        reachable = items < self.capacity
+        safe = np.where(reachable, items, self.initial)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            days = -np.log((self.capacity / safe - 1) / ratio) / self.rate
+        days = np.where(reachable, days, np.inf)
+        return np.where(items <= self.initial, 0.0, days)
+
+
+GrowthModel = Union[LinearGrowth, ExponentialGrowth, LogisticGrowth]
+
+
+def _log1p_minus_x(x: np.ndarray) -> np.ndarray:
+    """ln(1 + x) - x, using the series -x²/2 + x³/3 - ... for small x."""
+    small = x < 0.05
+    x_small = np.where(small, x, 0.0)
+    series = np.zeros_like(x_small)
+    for k in range(20, 1, -1):
+        series = x_small * ((-1) ** (k + 1) / k + series)
+    series *= x_small
+    return np.where(small, series, np.log1p(x) - x)
+
+
+def log_survival(growth: GrowthModel, total_possible_values: int, days,
+                 poisson: bool = False) -> np.ndarray:
+    """
+    ln P(no collision by day t).
+
+    With poisson=False items arrive exactly on the growth curve, so this
+    is the exact birthday probability at n = floor(N(t)). With poisson=True
+    arrivals form a Poisson process with mean N(t); each value then holds
+    Poisson(x) items with x = N(t)/d and
+
+        P(no collision) = (e^(-x)(1 + x))^d = exp(d·(ln(1 + x) - x))
+    """
+    items = growth.items(days)
+    space = float(total_possible_values)
+    if not poisson:
+        return log_no_collision_probability_array(np.floor(items), space)
+    return space * _log1p_minus_x(items / space)
+
+
+def first_collision_cdf(growth: GrowthModel, total_possible_values: int,
+                        days, poisson: bool = False) -> np.ndarray:
+    """P(first collision happens by day t), kept precise for tiny risks."""
+    return -np.expm1(log_survival(growth, total_possible_values, days,
+                                  poisson)) + 0.0
+
+
+def first_collision_density(growth: GrowthModel, total_possible_values: int,
+                            days) -> np.ndarray:
+    """
+    Density of the first-collision day under Poisson arrivals.
+
+    f(t) = S(t)·N'(t)·x/(1 + x), from d/dt ln S = -N'(t)·x/(1 + x)
+    """
+    x = growth.items(days) / float(total_possible_values)
+    survival = np.exp(log_survival(growth, total_possible_values, days,
+                                   poisson=True))
+    return survival * growth.items_per_day(days) * x / (1 + x)
+
+
+def _solve_days(growth: GrowthModel, total_possible_values: int, targets,
+                poisson: bool, max_days: float, tolerance: float) -> np.ndarray:
+    """
+    Earliest day the collision CDF reaches each target (lockstep bisection).
+
+    Works on ln S(t) <= ln(1 - target), so tiny targets keep their digits.
+    Targets never reached within max_days come back as inf.
+    """
+    targets = np.asarray(targets, dtype=float)
+    log_targets = np.log1p(-np.clip(targets.ravel(), 0.0, 1.0))
+
+    def reached(days):
+        return log_survival(growth, total_possible_values, days,
+                            poisson) <= log_targets
+
+    low = np.zeros_like(log_targets)
+    high = np.ones_like(log_targets)
+    done = reached(low)
+
+    # Bracket: double the horizon until every target is crossed or out of reach
+    while True:
+        short = ~done & ~reached(high) & (high < max_days)
+        if not short.any():
+            break
+        low = np.where(short, high, low)
+        high = np.where(short, np.minimum(2 * high, max_days), high)
+    unreachable = ~done & ~reached(high)
+
+    # Invariant: CDF(low) < target <= CDF(high)
+    for _ in range(200):
+        active = ~done & ~unreachable & (high - low > tolerance * np.maximum(1.0, high))
+        if not active.any():
+            break
+        middle = (low + high) / 2
+        hit = reached(middle)
+        high = np.where(active & hit, middle, high)
+        low = np.where(active & ~hit, middle, low)
+
+    days = np.where(done, 0.0, np.where(unreachable, np.inf, high))
+    return days.reshape(targets.shape)
+
+
+def crossing_time(growth: GrowthModel, total_possible_values: int,
+                  risk=1e-6, max_days: float = MAX_FORECAST_DAYS,
+                  tolerance: float = 1e-9) -> np.ndarray:
+    """
+    Days until the exact collision probability reaches `risk`.
+
+    Root finding over the vectorized probability, so it works for any
+    monotone growth curve, and `risk` may be an array.
+    """
+    return _solve_days(growth, total_possible_values, risk, poisson=False,
+                       max_days=max_days, tolerance=tolerance)
+
+
+def first_collision_quantiles(growth: GrowthModel, total_possible_values: int,
+                              quantiles, poisson: bool = True,
+                              max_days: float = MAX_FORECAST_DAYS,
+                              tolerance: float = 1e-9) -> np.ndarray:
+    """Quantiles (in days) of the first-collision time distribution."""
+    return _solve_days(growth, total_possible_values, quantiles, poisson,
+                       max_days, tolerance)
+
+
+def _first_repeat(values: np.ndarray) -> np.ndarray:
+    """Per row, the index of the first value seen earlier in the row (-1 if none)."""
+    columns = values.shape[1]
+    order = np.argsort(values, axis=1, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=1)
+
+    # In each run of equal values, every element after the first is a
+    # repeat; the earliest such position is where the first collision is
+    repeats = ordered[:, 1:] == ordered[:, :-1]
+    first = np.where(repeats, order[:, 1:], columns).min(axis=1)
+    return np.where(first < columns, first, -1)
+
+
+def simulate_first_collision_days(growth: GrowthModel,
+                                  total_possible_values: int,
+                                  trials: int = 100_000,
+                                  seed: Optional[int] = None,
+                                  poisson: bool = True,
+                                  chunk_elements: int = DEFAULT_CHUNK_ELEMENTS
+                                  ) -> np.ndarray:
+    """
+    Monte Carlo first-collision days, as a cross-check for small spaces.
+
+    Each trial draws IDs until the first repeat (at item K), in batched
+    (trials x items) matrices. K maps to a day through the growth curve;
+    with poisson=True the K-th arrival of a Poisson process with mean N(t)
+    happens when N(t) reaches a Gamma(K, 1) draw.
+    """
+    d = int(total_possible_values)
+    # Most trials repeat within the 99.9% threshold; the rest get more columns
+    columns = min(d + 1, find_collision_threshold(d, 0.999, exact=True))
+    chunk_trials = max(1, chunk_elements // columns)
+    chunk_sizes = [min(chunk_trials, trials - start)
+                   for start in range(0, trials, chunk_trials)]
+
+    first_repeat = np.empty(trials, dtype=np.int64)
+    position = 0
+    for size, child in zip(chunk_sizes,
+                           np.random.SeedSequence(seed).spawn(len(chunk_sizes))):
+        rng = np.random.default_rng(child)
+        values = rng.integers(0, d, size=(size, columns), dtype=np.int64)
+        found = _first_repeat(values)
+
+        # Extend the few trials still without a repeat (each pass doubles them)
+        pending = np.flatnonzero(found < 0)
+        while len(pending):
+            tail = values[pending]
+            extra = rng.integers(0, d, size=tail.shape, dtype=np.int64)
+            values = np.concatenate([tail, extra], axis=1)[:, :d + 1]
+            extended = _first_repeat(values)
+            found[pending] = extended
+            pending = pending[extended < 0]
+            values = values[extended < 0]
+
+        first_repeat[position:position + size] = found + 1
+        position += size
+
+    items = first_repeat.astype(float)
+    if poisson:
+        items = np.random.default_rng(seed).gamma(items)
+    return growth.time_at(items)
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable duration: '77 μs', '5.1 seconds', '86 years'."""
+    units = [
+        (1e-9, "ns"), (1e-6, "μs"), (1e-3, "ms"), (1, "seconds"),
+        (60, "minutes"), (3600, "hours"), (SECONDS_PER_DAY, "days"),
+        (SECONDS_PER_YEAR, "years"),
+    ]
+    scale, name = units[0]
+    for unit_seconds, unit_name in units:
+        if seconds >= unit_seconds:
+            scale, name = unit_seconds, unit_name
+    value = seconds / scale
+    text = f"{value:,.0f}" if value >= 100 else f"{value:.2g}"
+    return f"{text} {name}"
+
+
+if __name__ == "__main__":
+    from collision_scenario import CollisionScenario
+    from id_system import IDSystem
+
+    print("=" * 60)
+    print("Collision Forecaster")
+    print("=" * 60)
+
+    # 1. Linear growth reproduces CollisionScenario.days_until_risk
+    scenario = CollisionScenario("New service (64-bit IDs, 100K users/day)",
+                                 IDSystem.INT64, 1_000_000, 100_000)
+    linear = LinearGrowth(scenario.current_items, scenario.growth_rate)
+    days = float(crossing_time(linear, scenario.system.space_size,
+                               scenario.acceptable_risk))
+    expected = scenario.days_until_risk()
+    print(f"\n1. {scenario.name}, risk {scenario.acceptable_risk:g}:")
+    print(f"   Root finding: {days:.3f} days, "
+          f"days_until_risk(): {expected:.3f} days "
+          f"{'✓' if math.isclose(days, expected, rel_tol=1e-6) else '✗'}")
+
+    # 2. The same system under other growth curves
+    space = scenario.system.space_size
+    models = [
+        ("linear", linear),
+        ("exponential, 1%/day", ExponentialGrowth(1_000_000, 0.01)),
+        ("logistic, cap 2B", LogisticGrowth(1_000_000, 0.02, 2e9)),
+        ("logistic, cap 100M", LogisticGrowth(1_000_000, 0.02, 1e8)),
+    ]
+    risks = np.array([1e-6, 1e-3, 0.01, 0.5])
+    print("\n2. Days until each risk level (64-bit IDs, 1M items today):")
+    print(f"   {'growth':<22}" + "".join(f"{r:>12g}" for r in risks))
+    for label, model in models:
+        row = crossing_time(model, space, risks)
+        print(f"   {label:<22}" + "".join(f"{d:>12,.1f}" for d in row))
+
+    # 3. Full distribution of first-collision time
+    model = ExponentialGrowth(1_000_000, 0.01)
+    quantiles = np.array([0.01, 0.1, 0.5, 0.9, 0.99])
+    print("\n3. First-collision day quantiles (exponential growth, 1%/day):")
+    for q, exact, poisson in zip(
+            quantiles,
+            first_collision_quantiles(model, space, quantiles, poisson=False),
+            first_collision_quantiles(model, space, quantiles, poisson=True)):
+        print(f"   q={q:<5g} exact arrivals {exact:8.2f}, "
+              f"Poisson arrivals {poisson:8.2f}")
+
+    # 4. Monte Carlo cross-check in a small space
+    small_space = 10 ** 5
+    model = LogisticGrowth(10, 0.05, 2_000)
+    trials = 50_000
+    print(f"\n4. Monte Carlo cross-check (d={small_space:,}, logistic growth, "
+          f"{trials:,} trials):")
+    for poisson in (False, True):
+        simulated = simulate_first_collision_days(model, small_space, trials,
+                                                  seed=11, poisson=poisson)
+        grid = np.linspace(0, 150, 301)
+        empirical = np.searchsorted(np.sort(simulated), grid,
+                                    side="right") / trials
+        analytic = first_collision_cdf(model, small_space, grid, poisson)
+        distance = np.abs(empirical - analytic).max()
+        print(f"   {'Poisson' if poisson else 'Exact'} arrivals: "
+              f"max CDF difference {distance:.4f} "
+              f"{'✓' if distance < 0.01 else '✗'}")
+
+    # 5. Time to a 50% collision risk at 1 billion IDs/second
+    print("\n5. Time to 50% risk at 1 billion IDs/second:")
+    for system in (IDSystem.INT32, IDSystem.INT64, IDSystem.UUID_V4):
+        seconds = find_collision_threshold(system.space_size, 0.5,
+                                           exact=True) / 1e9
+        print(f"   {system.description:<16} {format_duration(seconds)}")
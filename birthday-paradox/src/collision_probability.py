@@ -1,21 +1,35 @@
 # collision_probability.py
 
 import math
+from decimal import Decimal
+from typing import Union
+from precise_collision_probability import precise_collision_probability
 
-def collision_probability(number_of_items: int, total_possible_values: int) -> float:
+def collision_probability(number_of_items: int,
+                          total_possible_values: int) -> Union[float, Decimal]:
 
     """
     Approximate collision probability for large spaces.
-    P(collision) ≈ 1 - exp(-n²/2d)
+    P(collision) ≈ 1 - exp(-n²/2d), evaluated as -expm1(-n²/2d) so tiny
+    risks keep their digits. Risks below float range come back as a
+    Decimal from precise_collision_probability.
     """
     if number_of_items > total_possible_values:
         return 1.0
     if number_of_items <= 1:
         return 0.0
 
-    exponent = (-(number_of_items * (number_of_items - 1))
-                / (2 * total_possible_values))
-    return 1 - math.exp(exponent)
+    try:
+        exponent = ((number_of_items * (number_of_items - 1))
+                    / (2 * total_possible_values))
+    except OverflowError:
+        return 1.0  # n²/2d beyond float range: P(no collision) is 0
+
+    if exponent < 2.0 ** -1000:
+        return precise_collision_probability(number_of_items,
+                                             total_possible_values,
+                                             exact=False)
+    return -math.expm1(-exponent)
 
 if __name__ == "__main__":
     input_data = [
@@ -26,7 +26,8 @@ class CollisionScenario:
         """Days until we hit acceptable_risk threshold"""
         threshold_items = find_collision_threshold(
             self.system.space_size,
-            self.acceptable_risk
+            self.acceptable_risk,
+            exact=True
         )
         if self.current_items >= threshold_items:
             return 0.0
@@ -34,5 +35,6 @@ class CollisionScenario:
 
     def safety_factor(self) -> float:
         """How many times current load before 50% collision"""
-        n_half = find_collision_threshold(self.system.space_size, 0.5)
+        n_half = find_collision_threshold(self.system.space_size, 0.5,
+                                          exact=True)
         return n_half / self.current_items
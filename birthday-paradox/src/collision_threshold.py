@@ -2,10 +2,101 @@
 
 import math
 import random
+from collections import OrderedDict
+from decimal import Decimal
+from fractions import Fraction
+from exact_collision_probability import log_no_collision_probability
+from precise_collision_probability import (FLOAT_MAX_SPACE_BITS,
+                                           precise_collision_probability)
+
+# Bounded LRU of thresholds keyed by (space, target) for the exact integer
+# search, and by (space, target, "float64") for the vectorized float search
+EXACT_CACHE_SIZE = 4096
+FLOAT_KEY = "float64"
+_exact_cache: "OrderedDict[tuple, int]" = OrderedDict()
+
+
+def _cache_get(key: tuple):
+    value = _exact_cache.get(key)
+    if value is not None:
+        _exact_cache.move_to_end(key)
+    return value
+
+
+def _cache_put(key: tuple, value: int) -> None:
+    _exact_cache[key] = value
+    _exact_cache.move_to_end(key)
+    while len(_exact_cache) > EXACT_CACHE_SIZE:
+        _exact_cache.popitem(last=False)
+
+
+def _sqrt_approximation(total_possible_values: int, log_target: float) -> int:
+    """
+    ceil(sqrt(-2·d·ln(1 - p))) in integer arithmetic, given ln(1 - p).
+
+    The float ln(1 - p) is converted to an exact fraction, so d is never
+    converted to float and spaces beyond 2^1024 work.
+    """
+    scale = Fraction(-2 * log_target)
+    product = total_possible_values * scale.numerator
+    root = math.isqrt(product // scale.denominator)
+    # root <= sqrt(product / denominator) < root + 1; round up unless exact
+    if root * root * scale.denominator < product:
+        root += 1
+    return root
+
+
+def _exact_collision_threshold(total_possible_values: int,
+                               target_prob: float) -> int:
+    """
+    Smallest n with exact P(collision) >= target, by binary search.
+
+    Compares ln P(no collision) against ln(1 - target), so each probe is
+    O(1) and the search takes O(log n) probes.
+    """
+    key = (total_possible_values, target_prob)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    log_target = math.log1p(-target_prob)
+
+    if total_possible_values.bit_length() <= FLOAT_MAX_SPACE_BITS:
+        def reaches_target(n: int) -> bool:
+            return log_no_collision_probability(n, total_possible_values) <= log_target
+    else:
+        # Beyond float range: Decimal probabilities, with enough digits to
+        # tell n from n + 1 (they differ by about 1/n ≈ d^-1/2)
+        target = Decimal(target_prob)
+        digits = total_possible_values.bit_length() * 16 // 100 + 20
+
+        def reaches_target(n: int) -> bool:
+            return precise_collision_probability(
+                n, total_possible_values, precision=digits) >= target
+
+    # Bracket the answer, starting from the square-root approximation
+    low = 1  # P(1) = 0, never reaches a positive target
+    high = max(2, _sqrt_approximation(total_possible_values, log_target))
+    while not reaches_target(high):
+        low = high
+        high = min(2 * high, total_possible_values + 1)
+
+    # Invariant: P(low) < target <= P(high)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if reaches_target(middle):
+            high = middle
+        else:
+            low = middle
+
+    _cache_put(key, high)
+    return high
+
 
 def find_collision_threshold(
         total_possible_values: int,
-        target_prob: float = 0.5
+        target_prob: float = 0.5,
+        exact: bool = False
 ) -> int:
     """
     Find how many items you can generate before hitting a collision
@@ -13,6 +104,10 @@ def find_collision_threshold(
 
     Example: With 365 possible birthdays, how many people before
     50% chance of a shared birthday? Answer: 23 people.
+
+    With exact=True the answer is the smallest n whose exact collision
+    probability reaches the target (the square-root approximation is off
+    for small spaces). Exact results are memoized per (space, target).
     """
 
     # If target is 0% or negative, you can't generate ANY items
@@ -25,14 +120,94 @@ def find_collision_threshold(
     if target_prob >= 1:
         return total_possible_values + 1
 
+    if exact:
+        return _exact_collision_threshold(total_possible_values, target_prob)
+
     # The formula is solving: "If I want 50% collision chance, and I have
     # 365 possible values, how many items do I need?"
-    n_approx = math.sqrt(-2 * total_possible_values
-                         * math.log(1 - target_prob))
+    # n = sqrt(-2·d·ln(1 - p)), rounded up because we can't have 22.8
+    # people - it's either 22 or 23. Integer arithmetic keeps spaces past
+    # float range (2^1024) from overflowing.
+    return _sqrt_approximation(total_possible_values, math.log(1 - target_prob))
+
+def find_collision_thresholds(total_possible_values: int, target_probs,
+                              exact: bool = True):
+    """
+    Vectorized find_collision_threshold over an array of target probabilities.
+
+    Cached (space, target) pairs are reused; the remaining unique targets
+    are binary-searched together, one vectorized probability evaluation
+    per step. Returns float64 counts, since thresholds for spaces above
+    2^106 exceed int64; spaces past float range fall back to the scalar
+    search per target (thresholds beyond 1.8e308 come back as inf).
+
+    The float bisection is only as precise as float64, so its results are
+    cached apart from find_collision_threshold(exact=True)'s integers.
+    """
+    import numpy as np
+    from vectorized_collision_probability import log_no_collision_probability_array
+
+    targets = np.asarray(target_probs, dtype=float)
+    unique, inverse = np.unique(targets, return_inverse=True)
+    results = np.empty(unique.shape, dtype=float)
+
+    if total_possible_values.bit_length() > FLOAT_MAX_SPACE_BITS:
+        for index, target in enumerate(unique.tolist()):
+            threshold = find_collision_threshold(total_possible_values, target, exact)
+            try:
+                results[index] = float(threshold)
+            except OverflowError:
+                results[index] = math.inf
+    elif not exact:
+        n_approx = np.sqrt(-2 * float(total_possible_values)
+                           * np.log1p(-np.clip(unique, 0, 1 - 1e-16)))
+        results[:] = np.ceil(n_approx)
+    else:
+        # Targets outside (0, 1) follow the scalar edge cases, uncached
+        pending = []
+        for index, target in enumerate(unique.tolist()):
+            if not 0 < target < 1:
+                continue
+            cached = _cache_get((total_possible_values, target, FLOAT_KEY))
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+
+        if pending:
+            pending = np.array(pending)
+            todo = unique[pending]
+            log_targets = np.log1p(-todo)
+            space = float(total_possible_values)
+
+            # Bracket every target, then bisect them in lockstep
+            low = np.ones_like(todo)
+            high = np.maximum(2.0, np.ceil(np.sqrt(-2 * space * log_targets)))
+            while True:
+                short = log_no_collision_probability_array(high, space) > log_targets
+                if not short.any():
+                    break
+                low = np.where(short, high, low)
+                high = np.where(short, np.minimum(2 * high, space + 1), high)
+
+            while True:
+                middle = np.floor((low + high) / 2)
+                active = (high - low > 1) & (middle > low) & (middle < high)
+                if not active.any():
+                    break
+                hit = log_no_collision_probability_array(middle, space) <= log_targets
+                high = np.where(active & hit, middle, high)
+                low = np.where(active & ~hit, middle, low)
+
+            results[pending] = high
+            for target, value in zip(todo.tolist(), high.tolist()):
+                _cache_put((total_possible_values, target, FLOAT_KEY), value)
+
+        results[unique <= 0] = 0
+        results[unique >= 1] = float(total_possible_values) + 1
+
+    return results[inverse].reshape(targets.shape)
 
-    # Round up because we can't have 22.8 people - it's either 22 or 23
-    # ceil(22.1) = 23, ceil(22.9) = 23, ceil(23.0) = 23
-    return int(math.ceil(n_approx))
 
 def collision_simulator(number_of_items: int,
                         total_possible_values: int,
@@ -131,5 +306,24 @@ if __name__ == '__main__':
     print(f"   Probability at {threshold}: {at:.2%} (should be ≥ {target:.0%})")
     print(f"   ✓ PASS" if below < target <= at + 0.05 else f"   ✗ FAIL")
 
+    # Test 8: Exact mode on small spaces
+    print("\n8. Exact mode (binary search on exact probability):")
+    for space in (10, 365):
+        approx = find_collision_threshold(space, 0.5)
+        exact = find_collision_threshold(space, 0.5, exact=True)
+        simulated = collision_simulator(exact, space, 10000)
+        print(f"   {space} values, 50% risk: approx {approx}, exact {exact} "
+              f"(simulated {simulated:.2%})")
+        print(f"   ✓ PASS" if simulated >= 0.48 else f"   ✗ FAIL")
+
+    # Test 9: Vectorized thresholds agree with the scalar exact search
+    print("\n9. Vectorized thresholds over many targets:")
+    targets = [0.01, 0.10, 0.50, 0.90, 0.99]
+    vectorized = find_collision_thresholds(365, targets)
+    scalar = [find_collision_threshold(365, p, exact=True) for p in targets]
+    print(f"   Vectorized: {vectorized.astype(int).tolist()}")
+    print(f"   Scalar:     {scalar}")
+    print(f"   ✓ PASS" if vectorized.astype(int).tolist() == scalar else f"   ✗ FAIL")
+
     print("\n" + "=" * 60)
     print("Testing complete!")
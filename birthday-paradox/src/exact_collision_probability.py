@@ -1,21 +1,84 @@
 # exact_collision_probability.py
 
+import math
+from decimal import Decimal
+from typing import Union
+from precise_collision_probability import (needs_high_precision,
+                                           precise_collision_probability)
+
+# Below this many "unused" values (d - n), Stirling's series is not accurate
+# enough and we fall back to lgamma, which is precise for such small spaces.
+STIRLING_MIN_REMAINING = 100
+
+# Switch from the closed form to the power series for f(x) below this x = n/d
+SERIES_CUTOFF = 0.05
+
+
+def _stirling_core(x: float) -> float:
+    """
+    f(x) = (1 - x)·ln(1 - x) + x, without cancellation for small x.
+
+    For small x the closed form subtracts two nearly equal numbers, so use
+    the series f(x) = Σ x^k / (k(k-1)) for k >= 2 instead.
+    """
+    if x >= SERIES_CUTOFF:
+        return (1 - x) * math.log1p(-x) + x
+    total = 0.0
+    for k in range(20, 1, -1):
+        total = x * (total + 1.0 / (k * (k - 1)))
+    return x * total
+
+
+def log_no_collision_probability(number_of_items: int,
+                                 total_possible_values: int) -> float:
+    """
+    Natural log of the exact probability that n draws from d values are unique.
+
+    ln P(no collision) = ln(d!) - ln((d-n)!) - n·ln(d)
+
+    Evaluated in O(1) with Stirling's series arranged around log1p so it
+    stays precise for spaces as large as 2^256 (where lgamma differences
+    would cancel catastrophically).
+    """
+    n = number_of_items
+    d = total_possible_values
+    if n <= 1:
+        return 0.0
+    if n > d:
+        return -math.inf
+
+    remaining = d - n
+    if remaining < STIRLING_MIN_REMAINING:
+        return (math.lgamma(d + 1) - math.lgamma(remaining + 1)
+                - n * math.log(d))
+
+    x = n / d
+    inv_d = 1.0 / d
+    inv_m = 1.0 / remaining
+    return (-float(d) * _stirling_core(x)
+            - 0.5 * math.log1p(-x)
+            - n * inv_d * inv_m / 12.0
+            + (inv_m ** 3 - inv_d ** 3) / 360.0
+            - (inv_m ** 5 - inv_d ** 5) / 1260.0)
+
+
 def exact_collision_probability(number_of_items: int,
-                                total_possible_values: int) -> float:
+                                total_possible_values: int) -> Union[float, Decimal]:
     """
     Calculate exact probability of at least one collision.
     P(collision) = 1 - П(1 - i/d) for i from 0 to n-1
-    Accurate for small n, may lose precision for large n.
+    Evaluated in log space, so it is O(1) and keeps tiny risks (1e-30)
+    instead of rounding them to zero. Spaces or risks outside float range
+    are handed to precise_collision_probability and come back as a Decimal.
     """
     if number_of_items > total_possible_values:
         return 1.0
     if number_of_items <= 1:
         return 0.0
-    prob_no_collision = 1.0
-    for i in range(number_of_items):
-        prob_no_collision *= ((total_possible_values - i)
-                           / total_possible_values)
-        # Early exit for numerical stability
-        if prob_no_collision < 1e-15:
-            return 1.0
-    return 1 - prob_no_collision
\ No newline at end of file
+
+    if needs_high_precision(number_of_items, total_possible_values):
+        return precise_collision_probability(number_of_items,
+                                             total_possible_values)
+    log_p = log_no_collision_probability(number_of_items,
+                                         total_possible_values)
+    return -math.expm1(log_p)
@@ -0,0 +1,230 @@
+# fleet_risk.py
+
+import csv
+from dataclasses import dataclass
+from typing import Iterable, List
+
+import numpy as np
+from collision_scenario import CollisionScenario
+from collision_threshold import find_collision_thresholds
+from vectorized_collision_probability import exact_collision_probability_array
+
+COLUMNS = ("name", "space_bits", "current_items", "growth_rate",
+           "acceptable_risk")
+
+
+@dataclass
+class ScenarioTable:
+    """Columnar collection of collision scenarios (one row per table/shard)."""
+    names: np.ndarray
+    space_bits: np.ndarray       # int, log2 of the ID space
+    current_items: np.ndarray    # float
+    growth_rate: np.ndarray      # float, items per day
+    acceptable_risk: np.ndarray  # float
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_scenarios(cls, scenarios: Iterable[CollisionScenario]) -> "ScenarioTable":
+        """Build a table from CollisionScenario objects."""
+        scenarios = list(scenarios)
+        return cls(
+            names=np.array([s.name for s in scenarios], dtype=object),
+            space_bits=np.array([s.system.value for s in scenarios], dtype=np.int64),
+            current_items=np.array([s.current_items for s in scenarios], dtype=float),
+            growth_rate=np.array([s.growth_rate for s in scenarios], dtype=float),
+            acceptable_risk=np.array([s.acceptable_risk for s in scenarios], dtype=float),
+        )
+
+    @classmethod
+    def read_csv(cls, path: str) -> "ScenarioTable":
+        """
+        Load a table from CSV with a header row of
+        name,space_bits,current_items,growth_rate,acceptable_risk.
+        """
+        # csv quotes names containing commas, so parse with csv rather than
+        # a plain delimiter split
+        with open(path, newline="") as handle:
+            reader = csv.DictReader(handle)
+            missing = set(COLUMNS) - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"{path} is missing columns: {sorted(missing)}")
+            rows = list(reader)
+
+        column = lambda name, dtype: np.array([row[name] for row in rows], dtype=dtype)
+        return cls(
+            names=np.array([row["name"] for row in rows], dtype=object),
+            space_bits=column("space_bits", float).astype(np.int64),
+            current_items=column("current_items", float),
+            growth_rate=column("growth_rate", float),
+            acceptable_risk=column("acceptable_risk", float),
+        )
+
+    @classmethod
+    def read_parquet(cls, path: str) -> "ScenarioTable":
+        """Load a table from Parquet (requires pyarrow)."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Reading Parquet requires pyarrow: "
+                              "pip install pyarrow") from error
+
+        table = pq.read_table(path, columns=list(COLUMNS))
+        column = lambda name: table.column(name).to_numpy()
+        return cls(
+            names=column("name").astype(object),
+            space_bits=column("space_bits").astype(np.int64),
+            current_items=column("current_items").astype(float),
+            growth_rate=column("growth_rate").astype(float),
+            acceptable_risk=column("acceptable_risk").astype(float),
+        )
+
+    def write_csv(self, path: str) -> None:
+        """Write the table as CSV in the format read_csv expects."""
+        with open(path, "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(COLUMNS)
+            writer.writerows(zip(self.names, self.space_bits.tolist(),
+                                 self.current_items.tolist(),
+                                 self.growth_rate.tolist(),
+                                 self.acceptable_risk.tolist()))
+
+
+@dataclass
+class FleetRisk:
+    """Per-row risk metrics, aligned with the ScenarioTable rows."""
+    current_risk: np.ndarray
+    threshold_items: np.ndarray
+    days_until_risk: np.ndarray  # 0 when already over, inf when not growing
+    safety_factor: np.ndarray    # multiples of current load before 50% risk
+
+
+def _thresholds_by_space(space_bits: np.ndarray,
+                         targets: np.ndarray) -> np.ndarray:
+    """Exact thresholds per row, computed once per unique (space, target)."""
+    thresholds = np.empty(len(space_bits), dtype=float)
+    for bits in np.unique(space_bits).tolist():
+        rows = space_bits == bits
+        thresholds[rows] = find_collision_thresholds(2 ** bits, targets[rows])
+    return thresholds
+
+
+def evaluate_fleet(table: ScenarioTable) -> FleetRisk:
+    """
+    Evaluate every scenario in one vectorized pass.
+
+    Equivalent to calling current_risk(), days_until_risk() and
+    safety_factor() on each CollisionScenario, but thresholds are solved
+    once per unique (space, risk) pair and everything else is array math.
+    """
+    spaces = np.exp2(table.space_bits.astype(float))
+    current_risk = exact_collision_probability_array(table.current_items, spaces)
+
+    threshold_items = _thresholds_by_space(table.space_bits, table.acceptable_risk)
+    half_items = _thresholds_by_space(table.space_bits,
+                                      np.full(len(table), 0.5))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = (threshold_items - table.current_items) / table.growth_rate
+        days = np.where(table.growth_rate > 0, days, np.inf)
+        days = np.where(table.current_items >= threshold_items, 0.0, days)
+        safety = half_items / table.current_items
+
+    return FleetRisk(current_risk=current_risk,
+                     threshold_items=threshold_items,
+                     days_until_risk=days,
+                     safety_factor=safety)
+
+
+def top_k_riskiest(values: np.ndarray, k: int = 10,
+                   largest: bool = True) -> np.ndarray:
+    """
+    Indices of the k most extreme values, ordered most extreme first.
+
+    Uses argpartition, so only the top k rows get sorted. Pass
+    largest=False for metrics where small is bad (days_until_risk).
+    """
+    keys = -values if largest else values
+    k = min(k, len(keys))
+    if k == 0:
+        return np.array([], dtype=np.int64)
+    candidates = np.argpartition(keys, k - 1)[:k]
+    return candidates[np.argsort(keys[candidates], kind="stable")]
+
+
+def synthetic_fleet(rows: int, seed: int = 0) -> ScenarioTable:
+    """Random fleet of 32/64/122-bit tables for benchmarking."""
+    rng = np.random.default_rng(seed)
+    space_bits = rng.choice(np.array([32, 64, 122]), size=rows, p=[0.2, 0.6, 0.2])
+    return ScenarioTable(
+        names=np.array([f"shard-{i:07d}" for i in range(rows)], dtype=object),
+        space_bits=space_bits,
+        current_items=np.floor(10 ** rng.uniform(2, 12, size=rows)),
+        growth_rate=np.floor(10 ** rng.uniform(0, 9, size=rows)),
+        acceptable_risk=rng.choice(np.array([1e-9, 1e-6, 1e-3]), size=rows),
+    )
+
+
+def print_report(table: ScenarioTable, risk: FleetRisk,
+                 indices: List[int]) -> None:
+    """Print one line per selected row."""
+    for i in indices:
+        days = risk.days_until_risk[i]
+        days_text = "now" if days == 0 else f"{days:,.1f} days"
+        print(f"  {table.names[i]:<45} {table.space_bits[i]:>3}-bit "
+              f"risk {risk.current_risk[i]:.2e}  threshold in {days_text:>14}  "
+              f"safety {risk.safety_factor[i]:,.1f}x")
+
+
+if __name__ == "__main__":
+    import time
+    from id_system import IDSystem
+
+    print("=" * 70)
+    print(" Fleet-Scale Collision Risk Engine")
+    print("=" * 70)
+
+    # The four scenarios from main.py, now as one table
+    scenarios = [
+        CollisionScenario("Startup MVP (32-bit IDs, 1K users/day)",
+                          IDSystem.INT32, 10_000, 1_000),
+        CollisionScenario("Growing SaaS (64-bit IDs, 100K users/day)",
+                          IDSystem.INT64, 10_000_000, 100_000),
+        CollisionScenario("Social Platform (64-bit IDs, 10M posts/day)",
+                          IDSystem.INT64, 1_000_000_000, 10_000_000),
+        CollisionScenario("Distributed Logs (UUID v4, 1B events/day)",
+                          IDSystem.UUID_V4, 100_000_000_000, 1_000_000_000),
+    ]
+    table = ScenarioTable.from_scenarios(scenarios)
+
+    # Round trip through CSV; the names contain quoted commas
+    import os
+    import tempfile
+    csv_path = os.path.join(tempfile.mkdtemp(prefix="fleet_"), "scenarios.csv")
+    table.write_csv(csv_path)
+    table = ScenarioTable.read_csv(csv_path)
+
+    risk = evaluate_fleet(table)
+    print("\nProduction scenarios:")
+    print_report(table, risk, range(len(table)))
+
+    # A million-row fleet
+    rows = 1_000_000
+    fleet = synthetic_fleet(rows)
+    start = time.perf_counter()
+    fleet_risk = evaluate_fleet(fleet)
+    elapsed = time.perf_counter() - start
+    print(f"\nEvaluated {rows:,} scenarios in {elapsed:.3f} seconds")
+
+    print("\nTop 5 by current collision risk:")
+    print_report(fleet, fleet_risk, top_k_riskiest(fleet_risk.current_risk, 5))
+
+    growing = np.flatnonzero(fleet_risk.days_until_risk > 0)
+    soonest = growing[top_k_riskiest(fleet_risk.days_until_risk[growing], 5,
+                                     largest=False)]
+    print("\nTop 5 closest to their risk threshold:")
+    print_report(fleet, fleet_risk, soonest)
+
+    over = np.count_nonzero(fleet_risk.current_risk > fleet.acceptable_risk)
+    print(f"\n{over:,} of {rows:,} scenarios already exceed their acceptable risk")
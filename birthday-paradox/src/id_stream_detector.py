@@ -0,0 +1,333 @@
+# id_stream_detector.py
+
+import math
+import os
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from heapq import merge
+from itertools import groupby, islice
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from id_system import IDSystem
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def bloom_filter_parameters(expected_items: int,
+                            false_positive_rate: float) -> Tuple[int, int]:
+    """
+    Optimal Bloom filter size for n items at false positive rate p.
+
+    m = -n·ln(p) / ln(2)²  bits,  k = (m/n)·ln(2)  hash functions
+    """
+    expected_items = max(1, expected_items)
+    bits = math.ceil(-expected_items * math.log(false_positive_rate)
+                     / math.log(2) ** 2)
+    hashes = max(1, round(bits / expected_items * math.log(2)))
+    return bits, hashes
+
+
+def key_width(system: IDSystem) -> int:
+    """Bytes per fixed-width key (UUIDs keep all 128 bits, version included)."""
+    if system is IDSystem.UUID_V4:
+        return 16
+    return (system.value + 7) // 8
+
+
+def encode_id(value, system: IDSystem) -> bytes:
+    """Encode one ID (int, str, bytes or uuid.UUID) as a big-endian key."""
+    width = key_width(system)
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    if isinstance(value, int):
+        return value.to_bytes(width, "big")
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) != width:
+            raise ValueError(f"Expected {width}-byte IDs, got {len(value)} bytes")
+        return bytes(value)
+    text = value.strip()
+    if system is IDSystem.UUID_V4:
+        return uuid.UUID(text).bytes
+    if system is IDSystem.SHA256:
+        return bytes.fromhex(text)
+    return int(text, 0).to_bytes(width, "big")
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer; uint64 arithmetic wraps like the C original."""
+    x = (x + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+    x = ((x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+    x = ((x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+    return x ^ (x >> np.uint64(31))
+
+
+def _hash_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Two independent 64-bit hashes per fixed-width key."""
+    width = keys.dtype.itemsize
+    padded_width = -(-width // 8) * 8
+    raw = np.zeros((len(keys), padded_width), dtype=np.uint8)
+    raw[:, :width] = keys.view(np.uint8).reshape(len(keys), width)
+    words = raw.view(">u8").astype(np.uint64)
+
+    h = np.zeros(len(keys), dtype=np.uint64)
+    for column in range(words.shape[1]):
+        h = _splitmix64(h ^ words[:, column])
+    return h, _splitmix64(h ^ np.uint64(0x5851F42D4C957F2D)) | np.uint64(1)
+
+
+class BloomFilter:
+    """Bit-packed Bloom filter (uint64 words) with batched test-and-add."""
+
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self._words = np.zeros(-(-bits // 64), dtype=np.uint64)
+
+    @property
+    def nbytes(self) -> int:
+        return self._words.nbytes
+
+    def add_batch(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Add distinct keys, returning which ones were (probably) present before.
+        """
+        h1, h2 = _hash_keys(keys)
+        present = np.ones(len(keys), dtype=bool)
+        modulus = np.uint64(self.bits)
+        for i in range(self.hashes):
+            positions = (h1 + np.uint64(i) * h2) % modulus
+            word_index = (positions >> np.uint64(6)).astype(np.int64)
+            masks = np.uint64(1) << (positions & np.uint64(63))
+            present &= (self._words[word_index] & masks) != 0
+            np.bitwise_or.at(self._words, word_index, masks)
+        return present
+
+
+class _SortedSpill:
+    """Append-only buffer of keys, spilled to disk as sorted .npy runs."""
+
+    def __init__(self, directory: str, prefix: str, dtype: np.dtype,
+                 buffer_items: int):
+        self.directory = directory
+        self.prefix = prefix
+        self.dtype = dtype
+        self.buffer_items = buffer_items
+        self._buffer: List[np.ndarray] = []
+        self._buffered = 0
+        self.runs: List[str] = []
+
+    def append(self, keys: np.ndarray) -> None:
+        if len(keys):
+            self._buffer.append(keys)
+            self._buffered += len(keys)
+            if self._buffered >= self.buffer_items:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self._buffered:
+            return
+        run = np.sort(np.concatenate(self._buffer))
+        path = os.path.join(self.directory,
+                            f"{self.prefix}-{len(self.runs):05d}.npy")
+        np.save(path, run)
+        self.runs.append(path)
+        self._buffer, self._buffered = [], 0
+
+    def merged(self, block: int = 1 << 16) -> Iterator[bytes]:
+        """Yield every spilled key in sorted order (k-way merge of runs)."""
+        self.flush()
+
+        def read_run(path: str) -> Iterator[bytes]:
+            run = np.load(path, mmap_mode="r")
+            for start in range(0, len(run), block):
+                yield from run[start:start + block].tolist()
+
+        return merge(*(read_run(path) for path in self.runs))
+
+
+@dataclass
+class DetectionReport:
+    """Outcome of one streaming detection run."""
+    items: int
+    filter_bits: int
+    filter_hashes: int
+    candidates: int                  # distinct IDs flagged by the filter
+    duplicates: List[Tuple[bytes, int]] = field(default_factory=list)
+    expected_duplicates: float = 0.0  # birthday-paradox expectation
+
+    @property
+    def false_positives(self) -> int:
+        return self.candidates - len(self.duplicates)
+
+
+class StreamingCollisionDetector:
+    """
+    Find repeated IDs in a stream with bounded memory.
+
+    Pass 1 pushes every ID through a Bloom filter; only filter positives
+    (possible repeats) are spilled to sorted runs on disk, and the parsed
+    keys are spooled to a flat binary file. Pass 2 replays the spool,
+    keeps only IDs that are among the candidates (binary search over a
+    memory-mapped sorted candidate file), and counts them exactly with a
+    second sorted spill. Memory is the filter plus one batch; disk holds
+    the spool and the (small) candidate runs.
+    """
+
+    def __init__(self, system: IDSystem, expected_items: int,
+                 false_positive_rate: Optional[float] = None,
+                 max_candidates: int = 1_000_000,
+                 spill_dir: Optional[str] = None,
+                 batch_size: int = 1 << 16):
+        """
+        Args:
+            system: ID system the stream draws from (sets the key width)
+            expected_items: Expected stream length, for sizing the filter
+            false_positive_rate: Filter FP rate; by default chosen so the
+                expected number of false candidates stays near
+                max_candidates
+            max_candidates: Candidate budget used to pick the default rate
+            spill_dir: Directory for spool and spill files (temp dir if None)
+            batch_size: IDs processed per vectorized batch
+        """
+        if false_positive_rate is None:
+            false_positive_rate = min(0.01, max_candidates / max(1, expected_items))
+        self.system = system
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.batch_size = batch_size
+        self.spill_dir = spill_dir
+        self.dtype = np.dtype(f"S{key_width(system)}")
+        self.bits, self.hashes = bloom_filter_parameters(expected_items,
+                                                         false_positive_rate)
+
+    def _batches(self, source: Union[str, Iterable]) -> Iterator[np.ndarray]:
+        """Parse the source into arrays of fixed-width keys."""
+        if isinstance(source, (str, os.PathLike)):
+            with open(source) as handle:
+                lines = (line for line in handle if line.strip())
+                yield from self._batches(lines)
+            return
+
+        iterator = iter(source)
+        while True:
+            chunk = list(islice(iterator, self.batch_size))
+            if not chunk:
+                return
+            encoded = b"".join(encode_id(value, self.system) for value in chunk)
+            yield np.frombuffer(encoded, dtype=self.dtype)
+
+    def detect(self, source: Union[str, Iterable]) -> DetectionReport:
+        """
+        Scan a file (one ID per line) or any iterable of IDs for repeats.
+
+        Returns:
+            DetectionReport listing each repeated key and its count
+        """
+        directory = tempfile.mkdtemp(dir=self.spill_dir, prefix="idscan-")
+        try:
+            return self._detect(source, directory)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _detect(self, source, directory: str) -> DetectionReport:
+        bloom = BloomFilter(self.bits, self.hashes)
+        spill_items = max(self.batch_size, 1 << 20)
+        candidates = _SortedSpill(directory, "candidates", self.dtype, spill_items)
+        spool_path = os.path.join(directory, "spool.bin")
+
+        # Pass 1: filter every ID, spill possible repeats, spool the keys
+        items = 0
+        with open(spool_path, "wb") as spool:
+            for keys in self._batches(source):
+                items += len(keys)
+                spool.write(keys.tobytes())
+
+                unique, counts = np.unique(keys, return_counts=True)
+                seen_before = bloom.add_batch(unique)
+                candidates.append(unique[seen_before | (counts > 1)])
+
+        # Deduplicate candidates into one sorted, memory-mapped file
+        candidate_path = os.path.join(directory, "candidates.bin")
+        candidate_count = 0
+        with open(candidate_path, "wb") as handle:
+            for key, _ in groupby(candidates.merged()):
+                handle.write(key.ljust(self.dtype.itemsize, b"\0"))
+                candidate_count += 1
+
+        report = DetectionReport(items=items, filter_bits=self.bits,
+                                 filter_hashes=self.hashes,
+                                 candidates=candidate_count)
+        space = self.system.space_size
+        report.expected_duplicates = items * (items - 1) / (2 * space)
+        if candidate_count == 0:
+            return report
+
+        # Pass 2: replay the spool, keep candidate IDs, count them exactly
+        candidate_keys = np.memmap(candidate_path, dtype=self.dtype, mode="r")
+        hits = _SortedSpill(directory, "hits", self.dtype, spill_items)
+        spool_keys = np.memmap(spool_path, dtype=self.dtype, mode="r")
+        for start in range(0, len(spool_keys), self.batch_size):
+            keys = np.asarray(spool_keys[start:start + self.batch_size])
+            index = np.searchsorted(candidate_keys, keys)
+            index = np.minimum(index, candidate_count - 1)
+            hits.append(keys[candidate_keys[index] == keys])
+
+        for key, group in groupby(hits.merged()):
+            count = sum(1 for _ in group)
+            if count > 1:
+                report.duplicates.append(
+                    (key.ljust(self.dtype.itemsize, b"\0"), count))
+        return report
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from collections import Counter
+    from collision_probability import collision_probability
+
+    print("=" * 60)
+    print("Streaming ID Collision Detector")
+    print("=" * 60)
+
+    # 1. UUIDs with a handful of planted duplicates
+    rng = random.Random(7)
+    count = 500_000
+    ids = [str(uuid.UUID(int=rng.getrandbits(128), version=4))
+           for _ in range(count)]
+    for _ in range(5):
+        ids.insert(rng.randrange(len(ids)), rng.choice(ids))
+
+    detector = StreamingCollisionDetector(IDSystem.UUID_V4, len(ids),
+                                          false_positive_rate=1e-3)
+    start = time.perf_counter()
+    report = detector.detect(ids)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n1. {report.items:,} UUIDs with 5 planted duplicates "
+          f"({elapsed:.2f} s)")
+    print(f"   Filter: {report.filter_bits / 8 / 1e6:.2f} MB, "
+          f"{report.filter_hashes} hashes")
+    print(f"   Filter positives: {report.candidates}, "
+          f"confirmed duplicates: {len(report.duplicates)}, "
+          f"false positives: {report.false_positives}")
+    for key, seen in report.duplicates:
+        print(f"     {uuid.UUID(bytes=key)} seen {seen}x")
+
+    # 2. 32-bit IDs: real birthday collisions, checked against Counter
+    count = 300_000
+    ints = [rng.getrandbits(32) for _ in range(count)]
+    detector = StreamingCollisionDetector(IDSystem.INT32, count)
+    report = detector.detect(ints)
+    exact = {value: seen for value, seen in Counter(ints).items() if seen > 1}
+    found = {int.from_bytes(key, "big"): seen for key, seen in report.duplicates}
+
+    print(f"\n2. {count:,} random 32-bit IDs")
+    print(f"   Collision probability: "
+          f"{collision_probability(count, IDSystem.INT32.space_size):.4f}")
+    print(f"   Expected repeated pairs: {report.expected_duplicates:.1f}")
+    print(f"   Detected repeated IDs: {len(found)}, exact answer: {len(exact)} "
+          f"{'✓' if found == exact else '✗'}")
@@ -1,12 +1,17 @@
 # main.py
 
-from collision_scenario import CollisionScenario
+import argparse
+import os
+import sys
+from decimal import Decimal
+from collision_probability import collision_probability
 from id_system import IDSystem
 from exact_collision_probability import exact_collision_probability
 from collision_threshold import collision_simulator, find_collision_threshold
 
 def analyze_production_systems() -> None:
     """Analyze collision risk in realistic scenarios"""
+    from collision_scenario import CollisionScenario
 
     scenarios = [
         CollisionScenario(
@@ -59,12 +64,19 @@ def analyze_production_systems() -> None:
 
         print(f"  Safety factor: {safety:.1f}x before 50% collision")
 
-def plot_collision_curves() -> None:
-    """Visualize collision probabilities across ID systems."""
+def _pyplot():
+    """Import pyplot on the non-interactive Agg backend (no display needed)."""
+    import matplotlib
+    matplotlib.use("Agg")
     import matplotlib.pyplot as plt
+    return plt
+
+def plot_collision_curves(path: str = "collision_curves.png") -> str:
+    """Visualize collision probabilities across ID systems, saved to path."""
+    plt = _pyplot()
     import numpy as np
     import math
-    from collision_probability import collision_probability
+    from vectorized_collision_probability import collision_probability_array
 
     fig, ax = plt.subplots(figsize=(10, 6))
 
@@ -81,8 +93,8 @@ def plot_collision_curves() -> None:
         max_n = min(int(math.sqrt(space) * 100), 10 ** 15)
         n_values = np.logspace(1, np.log10(max_n), 200)
 
-        # Calculate probabilities
-        probs = [collision_probability(int(n), space) for n in n_values]
+        # Calculate probabilities in one vectorized pass
+        probs = collision_probability_array(np.floor(n_values), space)
 
         ax.loglog(n_values, probs, color=color,
                   linewidth=2, label=label)
@@ -112,12 +124,15 @@ def plot_collision_curves() -> None:
     ax.set_ylim([10 ** -18, 1])
 
     plt.tight_layout()
-    plt.show()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+    return path
 
-def plot_time_to_collision() -> None:
-    """Show how long systems last before first collision."""
-    import matplotlib.pyplot as plt
+def plot_time_to_collision(path: str = "time_to_collision.png") -> str:
+    """Show how long systems last before first collision, saved to path."""
+    plt = _pyplot()
     import numpy as np
+    from collision_forecast import SECONDS_PER_YEAR, format_duration
 
     fig, ax = plt.subplots(figsize=(10, 6))
 
@@ -132,7 +147,7 @@ def plot_time_to_collision() -> None:
 
     for system, label, color in systems:
         n_50 = find_collision_threshold(system.space_size, 0.5)
-        years = n_50 / (rates * 365.25 * 24 * 3600)
+        years = n_50 / (rates * SECONDS_PER_YEAR)
         ax.loglog(rates, years, color=color, linewidth=2, label=label)
 
     # Add reference lines
@@ -141,17 +156,15 @@ def plot_time_to_collision() -> None:
     ax.axhline(y=100, color='gray', linestyle='--', alpha=0.5)
     ax.text(1e9, 150, "100 years", fontsize=10)
 
-    # Add collision time annotations at 1 billion IDs/second
-    # 32-bit: 77 microseconds
-    ax.axhline(y=2.44e-9, color='red', linestyle=':', alpha=0.3)  # 77 microseconds in years
-    ax.text(5e8, 3e-9, "77 μs", fontsize=9, color='red')
-
-    # 64-bit: 1.4 hours
-    ax.axhline(y=1.6e-4, color='blue', linestyle=':', alpha=0.3)  # 1.4 hours in years
-    ax.text(5e8, 2e-4, "1.4 hours", fontsize=9, color='blue')
-
-    # UUID v4: 86 years (already close to the 100 years line)
-    ax.text(5e8, 70, "86 years", fontsize=9, color='green')
+    # Annotate the time to 50% risk at 1 billion IDs/second
+    rate = 1e9
+    for system, label, color in systems:
+        seconds = find_collision_threshold(system.space_size, 0.5,
+                                           exact=True) / rate
+        years = seconds / SECONDS_PER_YEAR
+        ax.axhline(y=years, color=color, linestyle=':', alpha=0.3)
+        ax.text(5e8, years * 1.25, format_duration(seconds),
+                fontsize=9, color=color)
 
     ax.set_xlabel('Generation Rate (IDs per second)', fontsize=12)
     ax.set_ylabel('Time to 50% Collision (years)', fontsize=12)
@@ -160,10 +173,11 @@ def plot_time_to_collision() -> None:
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.show()
-
-if __name__ == "__main__":
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+    return path
 
+def run_demo() -> None:
     """Run birthday paradox demonstrations and analysis."""
 
     # Classic birthday problem
@@ -193,5 +207,129 @@ if __name__ == "__main__":
         n_50 = find_collision_threshold(2 ** bits, 0.5)
         print(f"  {name:10s}: {n_50:,.0f} items")
 
-    plot_collision_curves()
-    plot_time_to_collision()
\ No newline at end of file
+def _space(args: argparse.Namespace) -> int:
+    """Resolve --system / --bits / --space to a space size."""
+    if args.space is not None:
+        return args.space
+    if args.bits is not None:
+        return 2 ** args.bits
+    return IDSystem[args.system.upper()].space_size
+
+def _positive_int(text: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def _format_space(space: int) -> str:
+    """Scientific notation for any size of space; Decimal formats ints past
+    float range (2^1024), where f"{space:.3e}" would overflow."""
+    return f"{Decimal(space):.3e}"
+
+def _format_items(items: int) -> str:
+    """Item counts with digit grouping, or scientific notation once they
+    run past 20 digits."""
+    return f"{items:,}" if items < 10 ** 20 else _format_space(items)
+
+def _add_space_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--system", default="uuid_v4",
+                       choices=[system.name.lower() for system in IDSystem],
+                       help="ID system (default: uuid_v4)")
+    group.add_argument("--bits", type=_positive_int, help="Space of 2^BITS values")
+    group.add_argument("--space", type=_positive_int, help="Explicit number of values")
+
+def _risk_command(args: argparse.Namespace) -> None:
+    space = _space(args)
+    for items in args.items:
+        exact = exact_collision_probability(items, space)
+        approx = collision_probability(items, space)
+        print(f"{items:,} items in {_format_space(space)} values: "
+              f"exact {exact:.6e}, approx {approx:.6e}")
+
+def _threshold_command(args: argparse.Namespace) -> None:
+    space = _space(args)
+    for risk in args.risk:
+        items = find_collision_threshold(space, risk, exact=not args.approx)
+        print(f"{risk:g} risk in {_format_space(space)} values: {_format_items(items)} items")
+
+def _simulate_command(args: argparse.Namespace) -> None:
+    space = _space(args)
+    exact = exact_collision_probability(args.items, space)
+    small = args.items * args.trials <= 100_000
+    if args.engine == "loop" or (args.engine == "auto" and small):
+        simulated = collision_simulator(args.items, space, args.trials)
+        print(f"Simulated: {simulated:.4%} ({args.trials:,} trials)")
+    else:
+        from batched_collision_simulator import batched_collision_simulator
+        result = batched_collision_simulator(args.items, space, args.trials,
+                                             seed=args.seed,
+                                             processes=args.processes)
+        print(f"Simulated: {result.probability:.4%} "
+              f"[{result.lower:.4%}, {result.upper:.4%}] "
+              f"({result.confidence:.0%} CI, {args.trials:,} trials)")
+    print(f"Exact:     {exact:.4%}")
+
+def _plot_command(args: argparse.Namespace) -> None:
+    os.makedirs(args.output_dir, exist_ok=True)
+    plots = {
+        "curves": (plot_collision_curves, "collision_curves.png"),
+        "time": (plot_time_to_collision, "time_to_collision.png"),
+    }
+    names = plots if args.which == "all" else [args.which]
+    for name in names:
+        plot, filename = plots[name]
+        print(f"Saved {plot(os.path.join(args.output_dir, filename))}")
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Birthday paradox collision analysis "
+                    "(no subcommand runs the text demo)")
+    commands = parser.add_subparsers(dest="command")
+
+    risk = commands.add_parser("risk", help="Collision probability for n items")
+    risk.add_argument("items", type=int, nargs="+", help="Number of items")
+    _add_space_arguments(risk)
+    risk.set_defaults(handler=_risk_command)
+
+    threshold = commands.add_parser("threshold",
+                                    help="Items before reaching a risk level")
+    threshold.add_argument("risk", type=float, nargs="+",
+                           help="Target probabilities, e.g. 1e-6 0.5")
+    threshold.add_argument("--approx", action="store_true",
+                           help="Use the square-root approximation")
+    _add_space_arguments(threshold)
+    threshold.set_defaults(handler=_threshold_command)
+
+    simulate = commands.add_parser("simulate",
+                                   help="Monte Carlo check of the exact risk")
+    simulate.add_argument("items", type=int, help="Items drawn per trial")
+    simulate.add_argument("--trials", type=int, default=10_000)
+    simulate.add_argument("--seed", type=int)
+    simulate.add_argument("--processes", type=int, default=1)
+    simulate.add_argument("--engine", default="auto",
+                          choices=["auto", "loop", "batched"],
+                          help="Python loop or NumPy batches "
+                               "(auto: loop for small runs)")
+    _add_space_arguments(simulate)
+    simulate.set_defaults(handler=_simulate_command)
+
+    plot = commands.add_parser("plot", help="Render figures to PNG files")
+    plot.add_argument("which", nargs="?", default="all",
+                      choices=["all", "curves", "time"])
+    plot.add_argument("--output-dir", default=".",
+                      help="Directory for the images (default: .)")
+    plot.set_defaults(handler=_plot_command)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        run_demo()
+    else:
+        args.handler(args)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,175 @@
+# precise_collision_probability.py
+
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+
+# Significant digits reported by the high-precision path
+DEFAULT_PRECISION = 50
+
+# The float path is safe while n(n-1)/2d stays above 2^-1000 (well clear of
+# subnormals) and d below 2^500 (so (n/d)^2 in the exact formula can't
+# underflow either)
+FLOAT_MIN_EXPONENT_BITS = 1000
+FLOAT_MAX_SPACE_BITS = 500
+
+# Spaces up to this size are summed term by term; larger ones use a series
+SMALL_SPACE = 10 ** 6
+
+
+def needs_high_precision(number_of_items: int,
+                         total_possible_values: int) -> bool:
+    """
+    True when float math would underflow or overflow for (n, d).
+
+    Uses only integer arithmetic, so checking is as cheap as the float
+    path it guards.
+    """
+    n, d = number_of_items, total_possible_values
+    if n <= 1 or n > d:
+        return False
+    return (d.bit_length() > FLOAT_MAX_SPACE_BITS
+            or (n * (n - 1)) << FLOAT_MIN_EXPONENT_BITS < 2 * d)
+
+
+@lru_cache(maxsize=None)
+def _bernoulli(k: int) -> Fraction:
+    """Bernoulli number B_k (with B_1 = -1/2)."""
+    if k == 0:
+        return Fraction(1)
+    return -sum(comb(k + 1, j) * _bernoulli(j) for j in range(k)) / (k + 1)
+
+
+def _power_sum(n: int, k: int) -> int:
+    """Σ i^k for i from 0 to n-1, by Faulhaber's formula (exact)."""
+    total = sum(comb(k + 1, j) * _bernoulli(j) * n ** (k + 1 - j)
+                for j in range(k + 1))
+    return int(total / (k + 1))
+
+
+def _neg_log_no_collision(n: int, d: int, precision: int) -> Decimal:
+    """
+    -ln P(no collision) = -Σ ln(1 - i/d), to `precision` digits.
+
+    Small spaces sum the logs directly. Large spaces expand each log:
+
+        -ln P = Σ_k S_k(n) / (k·d^k),  S_k(n) = Σ_{i<n} i^k
+
+    which converges like (n/d)^k, and n/d is tiny whenever the risk
+    isn't already indistinguishable from 1.
+    """
+    if d <= SMALL_SPACE:
+        return -sum(((Decimal(d - i) / d).ln() for i in range(1, n)),
+                    Decimal(0))
+
+    total = Decimal(0)
+    space = Decimal(d)
+    epsilon = Decimal(10) ** -(precision + 5)
+    k = 1
+    while True:
+        term = Decimal(_power_sum(n, k)) / (k * space ** k)
+        total += term
+        if term <= epsilon * total:
+            return total
+        k += 1
+
+
+def _neg_expm1_neg(value: Decimal) -> Decimal:
+    """1 - e^(-value) without cancellation for tiny values."""
+    if value >= Decimal("1e-3"):
+        return 1 - (-value).exp()
+
+    # Taylor series: value - value²/2 + value³/6 - ...
+    total = Decimal(0)
+    term = value
+    k = 1
+    while total + term != total:
+        total += term
+        k += 1
+        term = -term * value / k
+    return total
+
+
+def precise_collision_probability(number_of_items: int,
+                                  total_possible_values: int,
+                                  exact: bool = True,
+                                  precision: int = DEFAULT_PRECISION) -> Decimal:
+    """
+    Collision probability as a Decimal with `precision` significant digits.
+
+    Works for any integer space, including ones far beyond float range
+    (2^2048) and risks far below float range (1e-400).
+
+    Args:
+        number_of_items: Items generated (n)
+        total_possible_values: Size of the value space (d)
+        exact: Exact product formula if True, else 1 - exp(-n(n-1)/2d)
+        precision: Significant digits in the result
+    """
+    n, d = number_of_items, total_possible_values
+    with localcontext() as context:
+        context.prec = precision + 10
+        if n > d:
+            return Decimal(1)
+        if n <= 1:
+            return Decimal(0)
+
+        exponent = Decimal(n * (n - 1)) / (2 * Decimal(d))
+        # -ln P >= n(n-1)/2d, so past this point P rounds to 0 (risk to 1)
+        if exponent > (precision + 10) * Decimal(10).ln():
+            return +Decimal(1)
+
+        if exact:
+            exponent = _neg_log_no_collision(n, d, precision)
+        risk = _neg_expm1_neg(exponent)
+
+    with localcontext() as context:
+        context.prec = precision
+        return +risk
+
+
+if __name__ == "__main__":
+    import time
+    from collision_probability import collision_probability
+    from exact_collision_probability import exact_collision_probability
+    from id_system import IDSystem
+
+    print("=" * 60)
+    print("High-Precision Collision Probability")
+    print("=" * 60)
+
+    # 1. Agreement with the float path where floats are enough
+    print("\n1. Agreement with the float functions:")
+    for n, d in [(23, 365), (1000, 10 ** 6), (77_163, 2 ** 32),
+                 (10 ** 9, 2 ** 64), (10 ** 12, 2 ** 122)]:
+        precise = precise_collision_probability(n, d, precision=20)
+        floating = exact_collision_probability(n, d)
+        error = abs(float(precise) - floating) / float(precise)
+        print(f"   n={n:<14,} d=2^{d.bit_length() - 1:<4} "
+              f"decimal {precise:.12e}  float {floating:.12e}  "
+              f"rel. error {error:.1e}")
+
+    # 2. Tiny risks that used to print as 0
+    print("\n2. Tiny risks (float path with expm1, auto-selected):")
+    for n, system in [(2, IDSystem.UUID_V4), (10 ** 6, IDSystem.SHA256),
+                      (2, IDSystem.SHA256)]:
+        print(f"   {n:,} IDs in {system.description}: "
+              f"{collision_probability(n, system.space_size):.6e}")
+
+    # 3. Beyond float range: auto-selected Decimal
+    print("\n3. Beyond float range (auto-selected Decimal):")
+    for n, bits in [(10 ** 6, 2048), (2, 1100), (2 ** 1000, 2048)]:
+        start = time.perf_counter()
+        risk = exact_collision_probability(n, 2 ** bits)
+        elapsed = time.perf_counter() - start
+        print(f"   n={n:.3e} in 2^{bits}: {risk:.6e} "
+              f"({type(risk).__name__}, {elapsed * 1e3:.2f} ms)")
+
+    # 4. The float path stays fast
+    count = 100_000
+    start = time.perf_counter()
+    for i in range(count):
+        collision_probability(1000 + i, 2 ** 64)
+    elapsed = time.perf_counter() - start
+    print(f"\n4. Float path: {elapsed / count * 1e6:.2f} μs per call")
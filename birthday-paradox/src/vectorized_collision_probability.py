@@ -0,0 +1,132 @@
+# vectorized_collision_probability.py
+
+import math
+import numpy as np
+from exact_collision_probability import (SERIES_CUTOFF,
+                                         STIRLING_MIN_REMAINING)
+
+
+def _as_float_arrays(number_of_items, total_possible_values):
+    """Broadcast n and d to float64 arrays (handles Python ints up to 2^1023)."""
+    n = np.asarray(number_of_items, dtype=float)
+    d = np.asarray(total_possible_values, dtype=float)
+    return np.broadcast_arrays(n, d)
+
+
+def collision_probability_array(number_of_items, total_possible_values) -> np.ndarray:
+    """
+    Approximate collision probability over arrays of n and d.
+    P(collision) ≈ 1 - exp(-n(n-1)/2d), evaluated as -expm1(...)
+    so risks far below 1e-16 keep their significant digits.
+    """
+    n, d = _as_float_arrays(number_of_items, total_possible_values)
+    exponent = -(n * (n - 1)) / (2 * d)
+    probability = -np.expm1(exponent)
+    probability = np.where(n <= 1, 0.0, probability)
+    return np.where(n > d, 1.0, probability)
+
+
+def _stirling_core_array(x: np.ndarray) -> np.ndarray:
+    """f(x) = (1 - x)·ln(1 - x) + x, with the series below SERIES_CUTOFF."""
+    small = x < SERIES_CUTOFF
+    x_small = np.where(small, x, 0.0)
+    series = np.zeros_like(x)
+    for k in range(20, 1, -1):
+        series = x_small * (series + 1.0 / (k * (k - 1)))
+    series *= x_small
+
+    x_large = np.where(small, 0.5, x)  # placeholder keeps log1p finite
+    closed = (1 - x_large) * np.log1p(-x_large) + x_large
+    return np.where(small, series, closed)
+
+
+def log_no_collision_probability_array(number_of_items,
+                                       total_possible_values) -> np.ndarray:
+    """
+    Natural log of the exact no-collision probability over arrays of n and d.
+
+    Same Stirling/log1p formulation as log_no_collision_probability, so each
+    point is O(1) and stays precise for spaces up to 2^256.
+    """
+    n, d = _as_float_arrays(number_of_items, total_possible_values)
+    shape = n.shape
+    n, d = n.ravel(), d.ravel()
+    remaining = d - n
+
+    # Stirling's series, valid when plenty of values remain unused
+    stirling = remaining >= STIRLING_MIN_REMAINING
+    x = np.where(stirling, n / d, 0.0)
+    inv_d = 1.0 / d
+    inv_m = np.where(stirling, 1.0 / np.where(stirling, remaining, 1.0), 0.0)
+    with np.errstate(under="ignore"):
+        log_p = (-d * _stirling_core_array(x)
+                 - 0.5 * np.log1p(-x)
+                 - n * inv_d * inv_m / 12.0
+                 + (inv_m ** 3 - inv_d ** 3) / 360.0
+                 - (inv_m ** 5 - inv_d ** 5) / 1260.0)
+
+    # Nearly exhausted spaces are small enough for lgamma (rare elements)
+    fallback = ~stirling & (n > 1) & (n <= d)
+    if np.any(fallback):
+        log_p[fallback] = [
+            math.lgamma(dv + 1) - math.lgamma(dv - nv + 1) - nv * math.log(dv)
+            for nv, dv in zip(n[fallback], d[fallback])
+        ]
+
+    log_p = np.where(n <= 1, 0.0, log_p)
+    return np.where(n > d, -np.inf, log_p).reshape(shape)
+
+
+def exact_collision_probability_array(number_of_items,
+                                      total_possible_values) -> np.ndarray:
+    """
+    Exact collision probability over arrays of n and d.
+    P(collision) = 1 - П(1 - i/d), computed as -expm1(ln P(no collision))
+    in O(1) per point.
+    """
+    log_p = log_no_collision_probability_array(number_of_items,
+                                               total_possible_values)
+    return -np.expm1(log_p) + 0.0  # + 0.0 turns -0.0 into 0.0
+
+
+if __name__ == "__main__":
+    import time
+    from collision_probability import collision_probability
+    from exact_collision_probability import exact_collision_probability
+
+    print("=" * 60)
+    print("Vectorized Collision Probability")
+    print("=" * 60)
+
+    # Agreement with the scalar functions
+    print("\n1. Agreement with scalar functions:")
+    cases = [(23, 365), (2, 1000), (1000, 10 ** 6), (77_163, 2 ** 32),
+             (10 ** 12, 2 ** 122), (2, 2 ** 256)]
+    n_values = np.array([n for n, _ in cases], dtype=float)
+    d_values = np.array([d for _, d in cases], dtype=float)
+    approx = collision_probability_array(n_values, d_values)
+    exact = exact_collision_probability_array(n_values, d_values)
+    for (n, d), a, e in zip(cases, approx, exact):
+        print(f"   n={n:<14,} d={d:.3e}: approx {a:.6e} "
+              f"(scalar {collision_probability(n, d):.6e}), "
+              f"exact {e:.6e} (scalar {exact_collision_probability(n, d):.6e})")
+
+    # Tiny risks survive
+    print("\n2. Tiny risks don't round to zero:")
+    n = np.array([2, 1_000, 1_000_000])
+    print(f"   UUID v4 exact risk at n={n.tolist()}: "
+          f"{exact_collision_probability_array(n, 2 ** 122)}")
+
+    # Speed: one array call vs a Python loop
+    print("\n3. Speed (20,000 points x 3 systems):")
+    grid = np.logspace(1, 15, 20_000)
+    spaces = np.array([2 ** 32, 2 ** 64, 2 ** 122], dtype=float)[:, None]
+    start = time.perf_counter()
+    for space in (2 ** 32, 2 ** 64, 2 ** 122):
+        [collision_probability(int(v), space) for v in grid]
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    exact_collision_probability_array(grid, spaces)
+    vectorized = time.perf_counter() - start
+    print(f"   Python loop: {loop * 1e3:.2f} ms, "
+          f"vectorized exact: {vectorized * 1e3:.2f} ms")
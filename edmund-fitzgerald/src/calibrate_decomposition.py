@@ -0,0 +1,251 @@
+# calibrate_decomposition.py
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.special import expit
+from body_density_with_gas import body_density_with_gas
+from decomposition_rate import decomposition_rate
+from model_parameters import ModelParameters
+
+# Fitted quantities, in the order of the optimizer's vector. margin_scale
+# (kg/m³) sets how sharply recovery odds change with the buoyancy margin.
+PARAMETER_NAMES = ("baseline_rate", "q10", "gas_per_kg_ml", "base_density",
+                   "margin_scale")
+DEFAULT_BOUNDS = ((0.01, 1.0), (1.0, 5.0), (100.0, 3000.0), (950.0, 1100.0),
+                  (0.05, 50.0))
+
+
+@dataclass
+class RecoveryData:
+    """Labeled outcomes as parallel arrays, one entry per body."""
+    depth_m: np.ndarray
+    temp_c: np.ndarray
+    days: np.ndarray               # time at which the outcome was observed
+    body_mass_kg: np.ndarray
+    water_density: np.ndarray      # kg/m³ at depth
+    pressure_atm: np.ndarray       # absolute pressure at depth
+    recovered: np.ndarray          # bool
+
+    @classmethod
+    def from_wreck_records(cls, records, body_mass_kg: float = 70.0) -> "RecoveryData":
+        """
+        One entry per scenario_runner WreckRecord, with pressure and water
+        density from the same record_profile the scenario runner uses.
+        """
+        from scenario_runner import record_profile
+
+        columns = [record_profile(r).profile(r.depth_m) for r in records]
+        _, pressure, water = np.array(columns, dtype=float).reshape(-1, 3).T
+        return cls(depth_m=np.array([r.depth_m for r in records]),
+                   temp_c=np.array([r.temp_c for r in records]),
+                   days=np.array([r.horizon_days for r in records]),
+                   body_mass_kg=np.full(len(records), body_mass_kg),
+                   water_density=water,
+                   pressure_atm=pressure,
+                   recovered=np.array([r.recovered for r in records]))
+
+
+@dataclass
+class CalibrationResult:
+    """Best fit across all starts."""
+    parameters: ModelParameters
+    margin_scale: float
+    negative_log_likelihood: float
+    records: int
+    starts: List[dict]             # per start: x, nll, converged, iterations
+
+
+def buoyancy_margin(theta: np.ndarray, data: RecoveryData):
+    """
+    Water density minus body density (kg/m³) for every record, plus the
+    pieces the gradient needs. Positive means the body floats.
+
+    Same model as will_body_surface given the records' lake profile:
+    gas_production_model's exponential approach, compressed by Boyle's
+    law to data.pressure_atm.
+    """
+    baseline_rate, q10, gas_per_kg_ml, base_density = theta[:4]
+    exponent = (data.temp_c - 20.0) / 10.0
+    rate = decomposition_rate(data.temp_c, baseline_rate, q10)
+    decay = np.exp(-rate * data.days)
+    pressure = data.pressure_atm
+
+    gas_ml = gas_per_kg_ml * data.body_mass_kg * (1.0 - decay) / pressure
+    margin = data.water_density - body_density_with_gas(base_density, gas_ml,
+                                                        data.body_mass_kg)
+    gas_m3 = gas_ml * 1e-6
+    volume = data.body_mass_kg / base_density + gas_m3
+
+    # d(margin)/d(volume) and d(volume)/d(each parameter)
+    d_volume = data.body_mass_kg / volume ** 2
+    d_rate = gas_per_kg_ml * data.body_mass_kg * data.days * decay * 1e-6 / pressure
+    jacobian = np.stack([
+        d_volume * d_rate * rate / baseline_rate,
+        d_volume * d_rate * rate * exponent / q10,
+        d_volume * gas_m3 / gas_per_kg_ml,
+        d_volume * -data.body_mass_kg / base_density ** 2,
+    ])
+    return margin, jacobian
+
+
+def negative_log_likelihood(theta: np.ndarray, data: RecoveryData):
+    """
+    Logistic likelihood P(recovered) = σ(margin / margin_scale), summed
+    over the whole dataset in one pass, with its analytic gradient.
+    """
+    margin, jacobian = buoyancy_margin(theta, data)
+    scale = theta[4]
+    z = margin / scale
+    nll = np.sum(np.logaddexp(0.0, z) - data.recovered * z)
+
+    residual = expit(z) - data.recovered
+    gradient = np.append(jacobian @ residual / scale,
+                         -(residual * z).sum() / scale)
+    return nll, gradient
+
+
+# Set in each worker by the pool initializer so the dataset is sent once
+_DATA: Optional[RecoveryData] = None
+
+
+def _set_data(data: RecoveryData) -> None:
+    global _DATA
+    _DATA = data
+
+
+def _fit_from(task) -> dict:
+    """
+    One L-BFGS-B run from a starting point in the unit cube. Parameters
+    are rescaled to [0, 1] so their wildly different units don't skew the
+    quasi-Newton steps.
+    """
+    start, bounds = task
+    low, high = np.array(bounds).T
+    span = high - low
+
+    def objective(x):
+        nll, gradient = negative_log_likelihood(low + x * span, _DATA)
+        return nll, gradient * span
+
+    result = minimize(objective, start, jac=True, method="L-BFGS-B",
+                      bounds=[(0.0, 1.0)] * len(start))
+    return {"x": (low + result.x * span).tolist(), "nll": float(result.fun),
+            "converged": bool(result.success), "iterations": int(result.nit)}
+
+
+def calibrate(
+        data: RecoveryData,
+        starts: int = 8,
+        processes: int = 1,
+        seed: Optional[int] = None,
+        bounds=DEFAULT_BOUNDS
+) -> CalibrationResult:
+    """
+    Maximum-likelihood fit of baseline_rate, Q10, gas per kg and base
+    density against recovery outcomes.
+
+    The likelihood is vectorized over every record and has an analytic
+    gradient, so each L-BFGS-B iteration costs one pass over the data.
+    Several random starts guard against the ridges where faster gas
+    production trades off against a denser body; they run in parallel
+    when processes > 1.
+
+    Args:
+        data: Labeled outcomes
+        starts: Number of random starting points
+        processes: Worker processes (1 runs in the calling process)
+        seed: Seed for the starting points
+        bounds: (low, high) per entry of PARAMETER_NAMES
+
+    Returns:
+        CalibrationResult with the best parameters and every start's outcome
+    """
+    rng = np.random.default_rng(seed)
+    tasks = [(start, bounds) for start in rng.uniform(0.05, 0.95, (starts, len(bounds)))]
+
+    if processes <= 1:
+        _set_data(data)
+        fits = list(map(_fit_from, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_set_data,
+                                 initargs=(data,)) as pool:
+            fits = list(pool.map(_fit_from, tasks))
+
+    best = min(fits, key=lambda fit: fit["nll"])
+    fitted = dict(zip(PARAMETER_NAMES, best["x"]))
+    margin_scale = fitted.pop("margin_scale")
+    return CalibrationResult(parameters=ModelParameters(**fitted),
+                             margin_scale=margin_scale,
+                             negative_log_likelihood=best["nll"],
+                             records=len(data.depth_m), starts=fits)
+
+
+def synthetic_recoveries(
+        n: int,
+        truth: ModelParameters,
+        margin_scale: float = 1.0,
+        seed: Optional[int] = None
+) -> RecoveryData:
+    """
+    Simulated outcomes drawn from the logistic model itself, for checking
+    that calibrate() recovers known parameters.
+    """
+    rng = np.random.default_rng(seed)
+    depth = rng.uniform(2.0, 200.0, n)
+    data = RecoveryData(depth_m=depth,
+                        temp_c=rng.uniform(2.0, 22.0, n),
+                        days=rng.uniform(1.0, 120.0, n),
+                        body_mass_kg=np.clip(rng.normal(75.0, 15.0, n), 40.0, 150.0),
+                        # superior_conditions' water column
+                        water_density=1000.0 + 0.0044 * depth,
+                        pressure_atm=1.0 + depth / 10.0,
+                        recovered=np.zeros(n, dtype=bool))
+    theta = np.array([truth.baseline_rate, truth.q10, truth.gas_per_kg_ml,
+                      truth.base_density, margin_scale])
+    margin, _ = buoyancy_margin(theta, data)
+    data.recovered = rng.random(n) < expit(margin / margin_scale)
+    return data
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+    from will_body_surface import will_body_surface
+
+    print("=" * 60)
+    print(" Decomposition Model Calibration")
+    print("=" * 60)
+
+    truth = ModelParameters(baseline_rate=0.12, q10=2.2, gas_per_kg_ml=800.0,
+                            base_density=1045.0)
+    data = synthetic_recoveries(100_000, truth, margin_scale=1.5, seed=1975)
+    print(f"\n{len(data.depth_m):,} synthetic records, "
+          f"{data.recovered.mean():.1%} recovered")
+
+    processes = os.cpu_count() or 1
+    start = time.perf_counter()
+    result = calibrate(data, starts=8, processes=processes, seed=1)
+    elapsed = time.perf_counter() - start
+    converged = sum(fit["converged"] for fit in result.starts)
+    print(f"Fit: {elapsed:.2f} s, {len(result.starts)} starts on {processes} "
+          f"process(es), {converged} converged")
+
+    print(f"\n{'Parameter':15} {'True':>10} {'Fitted':>10}")
+    for name in ("baseline_rate", "q10", "gas_per_kg_ml", "base_density"):
+        print(f"{name:15} {getattr(truth, name):>10.4g} "
+              f"{getattr(result.parameters, name):>10.4g}")
+    print(f"{'margin_scale':15} {1.5:>10.4g} {result.margin_scale:>10.4g}")
+
+    # Round trip through JSON into will_body_surface
+    path = os.path.join(tempfile.gettempdir(), "fitted_parameters.json")
+    result.parameters.save(path)
+    loaded = ModelParameters.load(path)
+    floats, density, _ = will_body_surface(93, 14, parameters=loaded)
+    print(f"\nSaved to {path}")
+    print(f"Lusitania (93 m, 14 days) with fitted parameters: "
+          f"{'surfaces' if floats else 'stays down'} (body {density:.1f} kg/m³)")
@@ -2,7 +2,11 @@
 
 import math
 
-def decomposition_rate(temp_celsius: float, baseline_rate: float = 0.15) -> float:
+def decomposition_rate(
+        temp_celsius: float,
+        baseline_rate: float = 0.15,
+        q10: float = 2.5
+) -> float:
     """
     Calculate decomposition rate at given temperature using Q10 coefficient.
 
@@ -12,14 +16,14 @@ def decomposition_rate(temp_celsius: float, baseline_rate: float = 0.15) -> floa
     Args:
         temp_celsius: Water temperature in Celsius
         baseline_rate: Decomposition rate at 20°C (fraction per day)
+        q10: Temperature coefficient for biological processes
 
     Returns:
         Adjusted decomposition rate (fraction per day)
     """
-    Q10 = 2.5  # Temperature coefficient for biological processes
     temp_diff = temp_celsius - 20.0  # Difference from reference temp
 
     # Q10 equation: rate = baseline * Q10^(ΔT/10)
-    rate_multiplier = Q10 ** (temp_diff / 10.0)
+    rate_multiplier = q10 ** (temp_diff / 10.0)
 
     return baseline_rate * rate_multiplier
\ No newline at end of file
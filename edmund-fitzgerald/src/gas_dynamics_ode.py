@@ -0,0 +1,286 @@
+# gas_dynamics_ode.py
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from decomposition_rate import decomposition_rate
+from will_body_surface_vectorized import superior_profile
+
+SECONDS_PER_DAY = 86400.0
+GRAVITY = 9.81  # m/s²
+
+# Body phases: resting on the lake bed, rising, floating at the surface
+GROUNDED, RISING, SURFACED = 0, 1, 2
+
+# Net upward force (N) at which a body leaves the bed. Neutral buoyancy is
+# an unstable equilibrium - a body launched a hair short of it sinks and
+# keeps compressing - so lift-off waits for a small positive margin.
+LIFT_OFF_FORCE = 0.05
+
+
+@dataclass
+class GasDynamicsParameters:
+    """Physical constants for the time-resolved model."""
+    body_mass_kg: float = 70.0
+    base_density: float = 985.0       # kg/m³, tissue without gas
+    gas_per_kg_ml: float = 1000.0     # gas from complete decomposition
+    baseline_rate: float = 0.15       # decomposition rate at 20°C (per day)
+    q10: float = 2.5
+    solubility: float = 0.03          # mL gas per mL tissue per atm (Henry)
+    dissolution_rate: float = 2.0     # per day, approach to Henry equilibrium
+    drag_coefficient: float = 1.0
+    frontal_area_m2: float = 0.3
+    added_mass_fraction: float = 0.5  # of displaced water, for acceleration
+
+
+@dataclass
+class AscentResult:
+    """Outcome of simulate_ascent for a batch of bodies."""
+    depths: np.ndarray              # starting (lake bed) depth per body
+    lift_off_days: np.ndarray       # day each body leaves the bed (NaN if not)
+    surface_days: np.ndarray        # day each body reaches the surface (NaN if not)
+    t: np.ndarray                   # sample times (days)
+    produced_ml: np.ndarray         # (bodies, len(t)) cumulative gas, surface mL
+    dissolved_ml: np.ndarray        # (bodies, len(t)) gas held in tissue
+    depth_m: np.ndarray             # (bodies, len(t))
+    velocity_m_s: np.ndarray        # (bodies, len(t)), positive = rising
+
+    @property
+    def surfaced(self) -> np.ndarray:
+        return ~np.isnan(self.surface_days)
+
+
+def _water(depth: np.ndarray, profile):
+    """(temp, pressure, water density) at each body's current depth."""
+    depth = np.maximum(depth, 0.0)
+    if profile is None:
+        return superior_profile(depth)
+    return profile.profile(depth)
+
+
+def _forces(y, params: GasDynamicsParameters, profile):
+    """Unpack one body's state and evaluate the local water and net buoyant force."""
+    produced, dissolved, depth, velocity = y
+    temp, pressure, water_density = _water(depth, profile)
+
+    # Free gas expands by Boyle's law; Henry's law keeps the rest in tissue
+    tissue_m3 = params.body_mass_kg / params.base_density
+    free_ml = np.maximum(produced - dissolved, 0.0)
+    volume_m3 = tissue_m3 + free_ml * 1e-6 / pressure
+    net_force = (water_density * volume_m3 - params.body_mass_kg) * GRAVITY
+    return produced, dissolved, depth, velocity, temp, pressure, water_density, \
+        volume_m3, net_force
+
+
+def _rhs(t, y, phase, params: GasDynamicsParameters, profile):
+    """Time derivatives of one body's [produced, dissolved, depth, velocity]."""
+    (produced, dissolved, depth, velocity, temp, pressure, water_density,
+     volume_m3, net_force) = _forces(y, params, profile)
+
+    # Decomposition: first-order approach to the maximum gas yield, at the
+    # temperature of wherever the body currently is
+    max_gas = params.gas_per_kg_ml * params.body_mass_kg
+    rate = decomposition_rate(temp, params.baseline_rate, params.q10)
+    d_produced = rate * (max_gas - produced)
+
+    # Henry's law: tissue holds up to solubility·V·P of gas in solution
+    tissue_ml = params.body_mass_kg / params.base_density * 1e6
+    capacity = params.solubility * tissue_ml * pressure
+    d_dissolved = params.dissolution_rate * (np.minimum(produced, capacity) - dissolved)
+
+    # Buoyancy against gravity and quadratic drag, with added water mass
+    drag = (0.5 * water_density * params.drag_coefficient
+            * params.frontal_area_m2 * np.abs(velocity) * velocity)
+    effective_mass = (params.body_mass_kg
+                      + params.added_mass_fraction * water_density * volume_m3)
+    if phase == RISING:
+        d_velocity = (net_force - drag) / effective_mass
+        d_depth = -velocity
+    else:
+        d_velocity = d_depth = 0.0
+
+    return np.array([d_produced, d_dissolved,
+                     d_depth * SECONDS_PER_DAY, d_velocity * SECONDS_PER_DAY])
+
+
+def _ascend(bed: float, max_days: float, params: GasDynamicsParameters,
+            profile, rtol: float, atol):
+    """
+    One body's solve, restarted at each of its own phase changes.
+
+    Returns:
+        Tuple of (lift_off_day, surface_day, solutions), where solutions
+        are the dense outputs of the consecutive solver runs
+    """
+    y = np.array([0.0, 0.0, bed, 0.0])
+    phase = GROUNDED
+    lift_off_day = surface_day = np.nan
+
+    def lift_off(t, y, *args):
+        return _forces(y, params, profile)[-1] - LIFT_OFF_FORCE
+    lift_off.terminal = True
+    lift_off.direction = 1
+
+    def reach_surface(t, y, *args):
+        return y[2]
+    reach_surface.terminal = True
+    reach_surface.direction = -1
+
+    def settle(t, y, *args):
+        return bed - y[2]
+    settle.terminal = True
+    settle.direction = -1
+
+    # Only the transitions out of the current phase are watched
+    events = {GROUNDED: [lift_off], RISING: [reach_surface, settle], SURFACED: None}
+
+    solutions = []
+    t = 0.0
+    while t < max_days:
+        # Phase changes already due at the restart point (e.g. 0 days)
+        if phase == GROUNDED and _forces(y, params, profile)[-1] >= LIFT_OFF_FORCE:
+            lift_off_day = t
+            phase = RISING
+        if phase == RISING and y[2] <= 0:
+            surface_day = t
+            phase = SURFACED
+            y[2:] = 0.0
+
+        solution = solve_ivp(_rhs, (t, max_days), y, method="BDF",
+                             args=(phase, params, profile),
+                             events=events[phase], dense_output=True,
+                             rtol=rtol, atol=atol)
+        if solution.status < 0:
+            raise RuntimeError(f"ODE solve failed: {solution.message}")
+        solutions.append(solution.sol)
+        t, y = solution.t[-1], solution.y[:, -1].copy()
+
+        if solution.status == 1:
+            if phase == GROUNDED:
+                lift_off_day = t
+                phase = RISING
+            elif len(solution.t_events[0]):
+                y[2:] = 0.0
+                surface_day = t
+                phase = SURFACED
+            else:
+                # Sank back before surfacing: rests on the bed again
+                y[2:] = bed, 0.0
+                lift_off_day = np.nan
+                phase = GROUNDED
+    return lift_off_day, surface_day, solutions
+
+
+def simulate_ascent(
+        depths,
+        max_days: float = 365.0,
+        params: Optional[GasDynamicsParameters] = None,
+        profile=None,
+        rtol: float = 1e-6,
+        atol=None,
+        t_eval=None
+) -> AscentResult:
+    """
+    Integrate gas production, dissolution, depth and velocity over time
+    for a batch of bodies, each starting at rest on the lake bed.
+
+    Each body gets its own stiff BDF solve: decomposition runs over days
+    while an ascent's velocity settles in seconds. Events stop the solver
+    when the body's net force turns upward (lift-off), it reaches the
+    surface, or it sinks back to the bed; the solve restarts from there
+    with the phase switched, so the hard lake bed and surface never appear
+    inside the right-hand side and the lift-off instability can't be
+    stepped over. Bodies don't interact, so one body's phase change
+    restarts only its own four-variable system and the work grows linearly
+    with the batch, rather than every lift-off and surfacing restarting
+    the solve for all bodies.
+
+    Trajectories are sampled from each solve's dense output at t_eval;
+    the lift-off and surfacing days come from the events, so they are
+    exact however coarse the samples.
+
+    Args:
+        depths: Lake bed depth for each body (meters)
+        max_days: Longest time to integrate
+        params: Physical constants (GasDynamicsParameters defaults if None)
+        profile: LakeProfile to use instead of superior_profile
+        rtol, atol: Solver tolerances (atol defaults to a per-variable
+            scale: 0.1 mL of gas, 1 mm of depth, 0.1 mm/s)
+        t_eval: Days to sample the trajectories at (default: every day
+            and max_days)
+
+    Returns:
+        AscentResult with lift-off and surfacing days and full trajectories
+    """
+    params = params or GasDynamicsParameters()
+    bed = np.atleast_1d(np.asarray(depths, dtype=float))
+    bodies = len(bed)
+    if atol is None:
+        atol = np.array([0.1, 0.1, 1e-3, 1e-4])
+
+    if t_eval is None:
+        t_eval = np.append(np.arange(0.0, max_days), max_days)
+    t = np.asarray(t_eval, dtype=float)
+
+    lift_off_days = np.full(bodies, np.nan)
+    surface_days = np.full(bodies, np.nan)
+    track = np.full((4, bodies, len(t)), np.nan)
+    for i, depth in enumerate(bed):
+        lift_off_days[i], surface_days[i], solutions = _ascend(
+            depth, max_days, params, profile, rtol, atol)
+        # Later runs overwrite a shared restart time with the switched state
+        for sol in solutions:
+            inside = (t >= sol.t_min) & (t <= sol.t_max)
+            if inside.any():
+                track[:, i, inside] = sol(t[inside])
+
+    return AscentResult(depths=bed, lift_off_days=lift_off_days,
+                        surface_days=surface_days, t=t,
+                        produced_ml=track[0], dissolved_ml=track[1],
+                        depth_m=track[2], velocity_m_s=track[3])
+
+
+if __name__ == "__main__":
+    import time
+    from time_to_surface import time_to_surface
+
+    print("=" * 60)
+    print(" Time-Resolved Gas Dynamics (stiff ODE)")
+    print("=" * 60)
+
+    depths = np.array([10, 30, 60, 93, 120, 162])
+
+    # Without dissolution, lift-off should match the closed form
+    print("\n1. No dissolution vs closed-form time_to_surface (base density 1050):")
+    params = GasDynamicsParameters(base_density=1050.0, solubility=0.0)
+    start = time.perf_counter()
+    result = simulate_ascent(depths, params=params)
+    elapsed = time.perf_counter() - start
+    closed = time_to_surface(depths, base_density=1050.0)
+    for i, depth in enumerate(depths):
+        if np.isnan(result.surface_days[i]):
+            print(f"   {depth:4d} m: stays down (closed form: {closed[i]:.2f} days)")
+            continue
+        ascent_minutes = (result.surface_days[i] - result.lift_off_days[i]) * 1440
+        print(f"   {depth:4d} m: lifts off day {result.lift_off_days[i]:6.2f} "
+              f"(closed form {closed[i]:6.2f}), ascent {ascent_minutes:5.1f} min")
+    print(f"   ({elapsed:.2f} s)")
+
+    # Henry's law dissolution at depth delays or prevents surfacing
+    print("\n2. With gas dissolving in tissue at pressure:")
+    params = GasDynamicsParameters(base_density=1050.0)
+    result = simulate_ascent(depths, params=params)
+    for i, depth in enumerate(depths):
+        day = result.surface_days[i]
+        text = "stays down" if np.isnan(day) else f"surfaces on day {day:.2f}"
+        print(f"   {depth:4d} m: {text}")
+
+    # An ensemble: one small solve per starting depth
+    ensemble = np.linspace(5, 200, 100)
+    start = time.perf_counter()
+    result = simulate_ascent(ensemble, params=params)
+    elapsed = time.perf_counter() - start
+    print(f"\n3. {len(ensemble)} starting depths: {elapsed:.2f} s, "
+          f"{result.surfaced.sum()} surface within a year")
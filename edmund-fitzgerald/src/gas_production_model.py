@@ -6,7 +6,10 @@ from decomposition_rate import decomposition_rate
 def gas_production_model(
         days: float,
         temp_celsius: float,
-        body_mass_kg: float = 70.0
+        body_mass_kg: float = 70.0,
+        gas_per_kg_ml: float = 1000.0,
+        baseline_rate: float = 0.15,
+        q10: float = 2.5
 ) -> float:
     """
     Calculate cumulative gas production from decomposition.
@@ -18,15 +21,18 @@ def gas_production_model(
         days: Time since death (days)
         temp_celsius: Water temperature
         body_mass_kg: Body mass in kg
+        gas_per_kg_ml: Gas from complete decomposition (mL per kg)
+        baseline_rate: Decomposition rate at 20°C (fraction per day)
+        q10: Temperature coefficient of the decomposition rate
 
     Returns:
         Total gas produced (mL)
     """
     # Get temperature-adjusted decomposition rate
-    rate = decomposition_rate(temp_celsius)
+    rate = decomposition_rate(temp_celsius, baseline_rate, q10)
 
     # Maximum possible gas (mL)
-    max_gas = 1000.0 * body_mass_kg
+    max_gas = gas_per_kg_ml * body_mass_kg
 
     # Exponential approach to maximum
     # Gas = max * (1 - e^(-rate * time))
@@ -0,0 +1,170 @@
+# lake_profile.py
+
+import csv
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+from lake_conditions import LakeConditions
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    "data", "lake_profiles.csv")
+COLUMNS = ("lake", "month", "depth_m", "temp_c", "density_kg_m3")
+
+GRAVITY = 9.80665        # m/s²
+PASCALS_PER_ATM = 101325.0
+
+
+# eq=False: the generated __eq__ would compare the arrays elementwise (and
+# fail on their truth value), and __hash__ would fail on the unhashable
+# arrays; identity equality keeps profiles usable as cache keys
+@dataclass(frozen=True, eq=False)
+class LakeProfile:
+    """
+    Temperature and density profile for one lake and month.
+
+    Temperature and density are interpolated linearly between measured
+    depths and held constant past the ends. Pressure is hydrostatic,
+    integrated from the density profile, and extends linearly below the
+    deepest measurement.
+    """
+    lake: str
+    month: str
+    depths: np.ndarray
+    temps: np.ndarray
+    densities: np.ndarray
+    pressures: np.ndarray  # atm at each profile depth
+
+    @classmethod
+    def from_measurements(cls, lake: str, month: str, depths, temps,
+                          densities) -> "LakeProfile":
+        order = np.argsort(depths, kind="stable")
+        depths = np.asarray(depths, dtype=float)[order]
+        temps = np.asarray(temps, dtype=float)[order]
+        densities = np.asarray(densities, dtype=float)[order]
+
+        # P(z) = 1 atm + ∫ρ g dz (trapezoid rule), surface value at depth 0
+        layer = np.diff(depths) * (densities[1:] + densities[:-1]) / 2
+        weight = np.concatenate([[densities[0] * depths[0]], layer])
+        pressures = 1.0 + np.cumsum(weight) * GRAVITY / PASCALS_PER_ATM
+        return cls(lake, month, depths, temps, densities, pressures)
+
+    def profile(self, depth_meters) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized depth query.
+
+        Returns:
+            Tuple of (temp_celsius, pressure_atm, water_density_kg_m3) arrays
+        """
+        depth = np.asarray(depth_meters, dtype=float)
+        temp = np.interp(depth, self.depths, self.temps)
+        density = np.interp(depth, self.depths, self.densities)
+
+        pressure = np.interp(depth, self.depths, self.pressures)
+        below = depth - self.depths[-1]
+        extra = np.maximum(below, 0.0) * self.densities[-1] * GRAVITY / PASCALS_PER_ATM
+        return temp, pressure + extra, density
+
+    def conditions(self, depth_meters: float) -> LakeConditions:
+        """Scalar query, as a LakeConditions like superior_conditions returns."""
+        temp, pressure, density = self.profile(depth_meters)
+        return LakeConditions(depth_meters=depth_meters,
+                              temp_celsius=float(temp),
+                              pressure_atm=float(pressure),
+                              water_density_kg_m3=float(density))
+
+
+@lru_cache(maxsize=None)
+def load_profile_table(path: str = DEFAULT_PROFILE_PATH) -> Dict[Tuple[str, str], LakeProfile]:
+    """
+    Read a profile CSV (lake, month, depth_m, temp_c, density_kg_m3).
+
+    Parsed once per path; every (lake, month) pair becomes a LakeProfile.
+    """
+    rows: Dict[Tuple[str, str], list] = {}
+    with open(path, newline="") as handle:
+        reader = csv.DictReader(handle)
+        missing = set(COLUMNS) - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"{path} is missing columns: {sorted(missing)}")
+        for row in reader:
+            key = (row["lake"], row["month"])
+            rows.setdefault(key, []).append((float(row["depth_m"]),
+                                             float(row["temp_c"]),
+                                             float(row["density_kg_m3"])))
+
+    return {key: LakeProfile.from_measurements(key[0], key[1], *zip(*values))
+            for key, values in rows.items()}
+
+
+@lru_cache(maxsize=None)
+def lake_profile(lake: str = "Superior", month: str = "November",
+                 path: str = DEFAULT_PROFILE_PATH) -> LakeProfile:
+    """Cached profile for one lake and month."""
+    table = load_profile_table(path)
+    try:
+        return table[(lake, month)]
+    except KeyError:
+        available = sorted({name for name, _ in table})
+        raise KeyError(f"No profile for {lake} in {month} "
+                       f"(lakes in {path}: {available})") from None
+
+
+def write_superior_profiles(path: str = DEFAULT_PROFILE_PATH) -> None:
+    """
+    Write Lake Superior profiles sampled from superior_conditions, as a
+    starting point for measured data.
+
+    superior_conditions only distinguishes late-fall mixing (November)
+    from a stratified summer surface layer, written here as August.
+    """
+    from superior_conditions import superior_conditions
+
+    # Fine steps through the surface layer, both sides of the 60 m step
+    depths = list(range(0, 60, 5)) + [59.99] + list(range(60, 400, 20)) + [406]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(COLUMNS)
+        for month in ("August", "November"):
+            for depth in depths:
+                conditions = superior_conditions(depth, month)
+                writer.writerow(["Superior", month, depth,
+                                 round(conditions.temp_celsius, 3),
+                                 round(conditions.water_density_kg_m3, 4)])
+
+
+if __name__ == "__main__":
+    import time
+    from superior_conditions import superior_conditions
+
+    print("=" * 60)
+    print(" Lake Profiles")
+    print("=" * 60)
+
+    november = lake_profile("Superior", "November")
+    august = lake_profile("Superior", "August")
+    print(f"\nLoaded {len(load_profile_table())} profiles from {DEFAULT_PROFILE_PATH}")
+
+    print("\nDepth   Nov temp   Aug temp   Density   Pressure (profile / linear)")
+    for depth in (0, 10, 30, 59, 60, 93, 162, 400):
+        nov = november.conditions(depth)
+        aug = august.conditions(depth)
+        linear = superior_conditions(depth)
+        print(f"{depth:4d} m  {nov.temp_celsius:6.1f}°C  {aug.temp_celsius:7.1f}°C  "
+              f"{nov.water_density_kg_m3:8.2f}   "
+              f"{nov.pressure_atm:6.2f} / {linear.pressure_atm:6.2f} atm")
+
+    # Vectorized queries vs one superior_conditions call per depth
+    depths = np.linspace(0, 400, 100_000)
+    start = time.perf_counter()
+    november.profile(depths)
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    for depth in depths[:10_000]:
+        superior_conditions(depth)
+    loop = (time.perf_counter() - start) * 10
+    print(f"\n100,000 depths: profile {vectorized * 1e3:.2f} ms, "
+          f"superior_conditions loop ~{loop * 1e3:.0f} ms")
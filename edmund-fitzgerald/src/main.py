@@ -1,6 +1,6 @@
 # main.py
 from analyze_edmund_fitzgerald import analyze_edmund_fitzgerald
-import validate_historical_disasters
+from validate_historical_disasters import validate_historical_disasters
 
 if __name__ == "__main__":
     analyze_edmund_fitzgerald()
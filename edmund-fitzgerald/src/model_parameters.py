@@ -0,0 +1,34 @@
+# model_parameters.py
+
+import json
+from dataclasses import asdict, dataclass, fields
+
+
+@dataclass(frozen=True)
+class ModelParameters:
+    """
+    Tunable constants of the decomposition and buoyancy model.
+
+    The defaults are the values the model has always used; fitted sets
+    from calibrate_decomposition are saved and loaded as JSON.
+    """
+    baseline_rate: float = 0.15     # decomposition rate at 20°C (per day)
+    q10: float = 2.5
+    gas_per_kg_ml: float = 1000.0   # gas from complete decomposition
+    base_density: float = 985.0     # kg/m³, body without gas
+
+    def as_kwargs(self) -> dict:
+        """Keyword arguments for time_to_surface and the vectorized model."""
+        return asdict(self)
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as handle:
+            json.dump(asdict(self), handle, indent=2)
+            handle.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "ModelParameters":
+        """Read a saved set; keys other than the parameters are ignored."""
+        with open(path) as handle:
+            data = json.load(handle)
+        return cls(**{f.name: float(data[f.name]) for f in fields(cls) if f.name in data})
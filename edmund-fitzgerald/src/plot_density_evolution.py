@@ -2,7 +2,7 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from will_body_surface import will_body_surface
+from will_body_surface_vectorized import will_body_surface_vectorized
 
 
 def plot_density_evolution() -> None:
@@ -17,10 +17,7 @@ def plot_density_evolution() -> None:
 
     # Plot density evolution for each depth
     for depth in depths:
-        densities = []
-        for days in days_range:
-            _, body_dens, water_dens = will_body_surface(depth, days)
-            densities.append(body_dens)
+        _, densities, _ = will_body_surface_vectorized(depth, days_range)
 
         label = f"{depth}m"
         if depth == 162:
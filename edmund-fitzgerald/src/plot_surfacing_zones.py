@@ -2,7 +2,7 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from will_body_surface import will_body_surface
+from surfacing_boundary import SurfacingBoundary
 
 def plot_surfacing_zones() -> None:
     """
@@ -15,13 +15,10 @@ def plot_surfacing_zones() -> None:
 
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    # Calculate surfacing probability for each depth/time combination
-    will_surface = np.zeros((len(depths_grid), len(days_grid)))
-
-    for i, depth in enumerate(depths_grid):
-        for j, days in enumerate(days_grid):
-            will_float, _, _ = will_body_surface(depth, days)
-            will_surface[i, j] = float(will_float)
+    # Surfacing for every depth/time combination in one array expression
+    boundary = SurfacingBoundary(max_depth=depths_grid[-1], max_days=max_days)
+    will_surface = boundary.will_surface(depths_grid[:, None],
+                                         days_grid[None, :]).astype(float)
 
     # Create contour plot with better color contrast
     contour = ax.contourf(days_grid, depths_grid, will_surface,
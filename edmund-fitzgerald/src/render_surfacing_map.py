@@ -0,0 +1,201 @@
+# render_surfacing_map.py
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Optional, Tuple
+
+import numpy as np
+from model_parameters import ModelParameters
+from will_body_surface_vectorized import will_body_surface_vectorized
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "cache")
+
+EDMUND_FITZGERALD_DEPTH = 162  # meters (530 feet)
+
+
+def _grid_axes(max_depth: float, max_days: float, depth_points: int,
+               day_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    return (np.linspace(0.0, max_depth, depth_points),
+            np.linspace(1.0, max_days, day_points))
+
+
+def _cache_path(cache_dir: str, **settings) -> str:
+    key = json.dumps(settings, sort_keys=True)
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"surfacing_margin_{digest}.npy")
+
+
+def surfacing_margin_grid(
+        max_depth: float = 400.0,
+        max_days: float = 365.0,
+        depth_points: int = 4000,
+        day_points: int = 4000,
+        body_mass_kg: float = 70.0,
+        parameters: Optional[ModelParameters] = None,
+        tile: int = 512,
+        threads: Optional[int] = None,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+) -> np.ndarray:
+    """
+    Buoyancy margin (water density minus body density, kg/m³) on a
+    depth × day grid; positive means the body floats.
+
+    The grid is filled tile by tile straight into a memory-mapped .npy
+    file, so memory use is bounded by the tile size rather than the grid.
+    NumPy releases the GIL inside its array kernels, so tiles run on a
+    thread pool without copying inputs to worker processes. The file is
+    named by a hash of the grid and model settings; a later call with the
+    same settings memory-maps it instead of recomputing.
+
+    Args:
+        max_depth: Deepest row (meters)
+        max_days: Last column (days since sinking)
+        depth_points, day_points: Grid resolution
+        body_mass_kg: Mass of body
+        parameters: Model constants (ModelParameters defaults if None)
+        tile: Tile edge length in grid cells
+        threads: Worker threads (defaults to the CPU count)
+        cache_dir: Where to keep grids, or None to compute in memory
+
+    Returns:
+        (depth_points, day_points) float32 array, memory-mapped if cached
+    """
+    parameters = parameters or ModelParameters()
+    depths, days = _grid_axes(max_depth, max_days, depth_points, day_points)
+    shape = (depth_points, day_points)
+
+    path = None
+    if cache_dir:
+        path = _cache_path(cache_dir, max_depth=max_depth, max_days=max_days,
+                           depth_points=depth_points, day_points=day_points,
+                           body_mass_kg=body_mass_kg, parameters=asdict(parameters))
+        if os.path.exists(path):
+            return np.load(path, mmap_mode="r")
+        os.makedirs(cache_dir, exist_ok=True)
+        partial = path + ".partial"
+        margin = np.lib.format.open_memmap(partial, mode="w+",
+                                           dtype=np.float32, shape=shape)
+    else:
+        margin = np.empty(shape, dtype=np.float32)
+
+    def fill(corner):
+        row, col = corner
+        _, body, water = will_body_surface_vectorized(
+            depths[row:row + tile, None], days[None, col:col + tile],
+            body_mass_kg=body_mass_kg, **parameters.as_kwargs())
+        margin[row:row + tile, col:col + tile] = water - body
+
+    corners = [(row, col) for row in range(0, depth_points, tile)
+               for col in range(0, day_points, tile)]
+    with ThreadPoolExecutor(max_workers=threads or os.cpu_count()) as pool:
+        list(pool.map(fill, corners))
+
+    if path is None:
+        return margin
+    # Publish the finished file in one step so an interrupted run never
+    # leaves a truncated grid behind under the final name
+    margin.flush()
+    del margin
+    os.replace(partial, path)
+    return np.load(path, mmap_mode="r")
+
+
+def render_surfacing_map(
+        output_path: str = "surfacing_map.png",
+        depth_range: Tuple[float, float] = (0.0, 400.0),
+        day_range: Tuple[float, float] = (1.0, 365.0),
+        max_plot_points: int = 1000,
+        **grid_options
+) -> str:
+    """
+    Draw the surfacing zones for a depth/day window from the cached grid.
+
+    The full grid is computed (or loaded) once; any window inside it is a
+    slice of the memory map, decimated to at most max_plot_points per axis
+    for contouring, so zooming never recomputes the model.
+
+    Args:
+        output_path: Image file to write
+        depth_range: (shallowest, deepest) depth shown (meters)
+        day_range: (first, last) day shown
+        max_plot_points: Upper bound on contoured points per axis
+        **grid_options: Passed to surfacing_margin_grid
+
+    Returns:
+        The path written
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    margin = surfacing_margin_grid(**grid_options)
+    options = {"max_depth": 400.0, "max_days": 365.0,
+               "depth_points": 4000, "day_points": 4000, **grid_options}
+    depths, days = _grid_axes(options["max_depth"], options["max_days"],
+                              options["depth_points"], options["day_points"])
+
+    rows = slice(*np.searchsorted(depths, depth_range, side="left") + [0, 1])
+    cols = slice(*np.searchsorted(days, day_range, side="left") + [0, 1])
+    row_step = max(1, (rows.stop - rows.start) // max_plot_points)
+    col_step = max(1, (cols.stop - cols.start) // max_plot_points)
+    rows = slice(rows.start, rows.stop, row_step)
+    cols = slice(cols.start, cols.stop, col_step)
+    window = np.asarray(margin[rows, cols])
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.contourf(days[cols], depths[rows], window > 0, levels=[-0.5, 0.5, 1.5],
+                colors=['darkblue', 'lightblue'])
+    ax.contour(days[cols], depths[rows], window, levels=[0.0],
+               colors='white', linewidths=2)
+    ax.invert_yaxis()  # Depth increases downward
+
+    if depth_range[0] <= EDMUND_FITZGERALD_DEPTH <= depth_range[1]:
+        ax.axhline(y=EDMUND_FITZGERALD_DEPTH, color='red', linestyle='-',
+                   linewidth=2, label='Edmund Fitzgerald (162m)')
+        ax.legend(loc='upper right')
+
+    ax.set_xlabel('Days Since Sinking', fontsize=12)
+    ax.set_ylabel('Depth (meters)', fontsize=12)
+    ax.set_title('Surfacing Zones in Lake Superior\n'
+                 '(Light = Will Surface, Dark = Remains Submerged)', fontsize=14)
+
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150)
+    plt.close(fig)
+    return output_path
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    print("=" * 60)
+    print(" High-Resolution Surfacing Map")
+    print("=" * 60)
+
+    # A body denser than the default, so the map has both zones
+    parameters = ModelParameters(base_density=1050.0)
+
+    start = time.perf_counter()
+    margin = surfacing_margin_grid(parameters=parameters)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    surfacing_margin_grid(parameters=parameters)
+    cached = time.perf_counter() - start
+    print(f"\n{margin.shape[0]}x{margin.shape[1]} grid: computed in {first:.2f} s, "
+          f"reloaded from cache in {cached * 1e3:.1f} ms")
+    print(f"Floating cells: {(np.asarray(margin) > 0).mean():.1%}")
+
+    output_dir = tempfile.mkdtemp(prefix="surfacing_map_")
+    for name, depth_range, day_range in (
+            ("full", (0, 400), (1, 365)),
+            ("zoom", (120, 200), (1, 120))):
+        start = time.perf_counter()
+        path = render_surfacing_map(os.path.join(output_dir, f"{name}.png"),
+                                    depth_range=depth_range, day_range=day_range,
+                                    parameters=parameters)
+        print(f"{name:>5}: {path} ({time.perf_counter() - start:.2f} s)")
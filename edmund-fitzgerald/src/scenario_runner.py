@@ -0,0 +1,305 @@
+# scenario_runner.py
+
+import csv
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from lake_profile import LakeProfile
+from monte_carlo_surfacing import ParameterDistributions, monte_carlo_surfacing
+from time_to_surface import time_to_surface
+from will_body_surface_vectorized import will_body_surface_vectorized
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_RECORDS_PATH = os.path.join(DATA_DIR, "historical_disasters.csv")
+DEFAULT_CACHE_PATH = os.path.join(DATA_DIR, ".scenario_cache.json")
+
+# Bump when the model changes so cached results are recomputed
+MODEL_VERSION = 2
+
+# Horizon for records with no recovery date: surfacing within a year
+HORIZON_DAYS = 365.0
+
+# Freshwater density plus ~0.78 kg/m³ per PSU of salinity, and the same
+# 0.0044 kg/m³ per meter compression as superior_conditions
+SALINITY_DENSITY_PER_PSU = 0.78
+
+
+@dataclass(frozen=True)
+class WreckRecord:
+    """One historical sinking and whether bodies were recovered."""
+    name: str
+    depth_m: float
+    temp_c: float
+    salinity_psu: float = 0.0
+    days_to_recovery: Optional[float] = None
+    recovered: bool = False
+
+    @property
+    def horizon_days(self) -> float:
+        """Day the prediction is made for."""
+        # 0 is a real recovery day (bodies found the day of the sinking)
+        if self.days_to_recovery is None:
+            return HORIZON_DAYS
+        return self.days_to_recovery
+
+
+@dataclass
+class ScenarioResult:
+    """Model outcome for one record."""
+    name: str
+    predicted: bool             # point estimate: surfaces by horizon_days
+    probability: float          # Monte Carlo P(surfaced by horizon_days)
+    days_to_surface: Optional[float]
+    recovered: bool
+
+
+def _parse_bool(text: str) -> bool:
+    value = text.strip().lower()
+    if value in ("true", "yes", "1"):
+        return True
+    if value in ("false", "no", "0", ""):
+        return False
+    raise ValueError(f"Not a boolean: {text!r}")
+
+
+def _record(row: dict) -> WreckRecord:
+    days = row.get("days_to_recovery")
+    recovered = row.get("recovered", False)
+    return WreckRecord(
+        name=str(row["name"]),
+        depth_m=float(row["depth_m"]),
+        temp_c=float(row["temp_c"]),
+        salinity_psu=float(row.get("salinity_psu") or 0.0),
+        days_to_recovery=float(days) if days not in (None, "") else None,
+        recovered=_parse_bool(recovered) if isinstance(recovered, str) else bool(recovered))
+
+
+def load_records(path: str = DEFAULT_RECORDS_PATH) -> List[WreckRecord]:
+    """
+    Read wreck records from CSV or JSON (a list of objects), chosen by
+    file extension. Columns/keys are name, depth_m, temp_c and optionally
+    salinity_psu, days_to_recovery and recovered.
+    """
+    if path.endswith(".json"):
+        with open(path) as handle:
+            rows = json.load(handle)
+    else:
+        with open(path, newline="") as handle:
+            reader = csv.DictReader(handle)
+            missing = {"name", "depth_m", "temp_c"} - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"{path} is missing columns: {sorted(missing)}")
+            rows = list(reader)
+    return [_record(row) for row in rows]
+
+
+def record_profile(record: WreckRecord) -> LakeProfile:
+    """
+    Water column for one record: the recorded temperature at every depth
+    and density raised by salinity, so both overrides reach the model.
+    """
+    depths = [0.0, max(record.depth_m, 1.0)]
+    surface_density = 1000.0 + SALINITY_DENSITY_PER_PSU * record.salinity_psu
+    densities = [surface_density + 0.0044 * depth for depth in depths]
+    return LakeProfile.from_measurements(record.name, "record", depths,
+                                         [record.temp_c] * 2, densities)
+
+
+def parameter_hash(record: WreckRecord, draws: int,
+                   distributions: ParameterDistributions) -> str:
+    """Hash of everything that determines a record's result."""
+    key = json.dumps({"record": asdict(record), "draws": draws,
+                      "distributions": asdict(distributions),
+                      "model": MODEL_VERSION}, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def evaluate_record(task) -> dict:
+    """
+    Worker entry point: point prediction and Monte Carlo probability of
+    surfacing by the record's horizon. Seeded from the parameter hash so
+    a record always gets the same draws.
+    """
+    record, draws, distributions, key = task
+    profile = record_profile(record)
+
+    # Point prediction at the center of each parameter distribution
+    centers = {name: getattr(distributions, name)[1]
+               for name in ("body_mass_kg", "base_density", "q10",
+                            "gas_per_kg_ml", "baseline_rate")}
+    days = time_to_surface(record.depth_m, profile=profile, **centers)
+    if record.days_to_recovery is not None:
+        floats, _, _ = will_body_surface_vectorized(
+            record.depth_m, record.days_to_recovery, profile=profile, **centers)
+        predicted = bool(floats)
+    else:
+        predicted = days is not None and days < HORIZON_DAYS
+
+    estimate = monte_carlo_surfacing(record.depth_m, record.horizon_days,
+                                     draws=draws, seed=int(key[:16], 16),
+                                     distributions=distributions,
+                                     profile=profile)
+    return {"predicted": predicted,
+            "probability": float(estimate.probability[0, 0]),
+            "days_to_surface": days}
+
+
+def run_scenarios(
+        records: List[WreckRecord],
+        draws: int = 20_000,
+        processes: int = 1,
+        distributions: Optional[ParameterDistributions] = None,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH
+) -> List[ScenarioResult]:
+    """
+    Evaluate every record, in parallel when processes > 1.
+
+    Results are cached in a JSON file keyed by parameter_hash, so a rerun
+    only evaluates records (or settings) that changed.
+
+    Args:
+        records: Wreck records to evaluate
+        draws: Monte Carlo draws per record
+        processes: Worker processes (1 runs in the calling process)
+        distributions: Parameter uncertainty for the probabilities
+        cache_path: Cache file, or None to disable caching
+
+    Returns:
+        One ScenarioResult per record, in input order
+    """
+    distributions = distributions or ParameterDistributions()
+    cache: Dict[str, dict] = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as handle:
+            cache = json.load(handle)
+
+    keys = [parameter_hash(record, draws, distributions) for record in records]
+    pending = {key: record for key, record in zip(keys, records) if key not in cache}
+    tasks = [(record, draws, distributions, key) for key, record in pending.items()]
+
+    if processes <= 1 or len(tasks) <= 1:
+        outcomes = list(map(evaluate_record, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            outcomes = list(pool.map(evaluate_record, tasks,
+                                     chunksize=max(1, len(tasks) // (4 * processes))))
+    cache.update(zip(pending, outcomes))
+
+    if cache_path and tasks:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        with open(cache_path, "w") as handle:
+            json.dump(cache, handle)
+
+    return [ScenarioResult(name=record.name, recovered=record.recovered, **cache[key])
+            for key, record in zip(keys, records)]
+
+
+def confusion_matrix(results: List[ScenarioResult]) -> Dict[str, int]:
+    """Counts of predicted surfacing vs actual recovery."""
+    matrix = {"true_positive": 0, "false_positive": 0,
+              "false_negative": 0, "true_negative": 0}
+    for result in results:
+        if result.predicted:
+            matrix["true_positive" if result.recovered else "false_positive"] += 1
+        else:
+            matrix["false_negative" if result.recovered else "true_negative"] += 1
+    return matrix
+
+
+def calibration_report(results: List[ScenarioResult], bins: int = 10) -> dict:
+    """
+    Brier score and reliability table for the Monte Carlo probabilities:
+    per probability bin, the mean prediction vs the observed recovery rate.
+    """
+    probability = np.array([result.probability for result in results])
+    outcome = np.array([result.recovered for result in results], dtype=float)
+
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    index = np.clip(np.digitize(probability, edges) - 1, 0, bins - 1)
+    table = []
+    for b in range(bins):
+        members = index == b
+        if members.any():
+            table.append((edges[b], edges[b + 1], int(members.sum()),
+                          float(probability[members].mean()),
+                          float(outcome[members].mean())))
+    return {"brier_score": float(np.mean((probability - outcome) ** 2)),
+            "bins": table}
+
+
+def print_report(results: List[ScenarioResult]) -> None:
+    """Print per-record outcomes, the confusion matrix and calibration."""
+    print(f"\n{'Record':30} {'Model':>11} {'P(surface)':>11} {'Actual':>14}")
+    for result in results:
+        model = "Surface" if result.predicted else "No surface"
+        actual = "Recovered" if result.recovered else "Not recovered"
+        match = "✓" if result.predicted == result.recovered else "✗"
+        print(f"{result.name[:30]:30} {model:>11} {result.probability:>10.1%} "
+              f"{actual:>14} {match}")
+
+    matrix = confusion_matrix(results)
+    total = len(results)
+    correct = matrix["true_positive"] + matrix["true_negative"]
+    print("\nConfusion matrix (rows: model, columns: actual)")
+    print(f"{'':12}{'Recovered':>12}{'Not':>8}")
+    print(f"{'Surface':12}{matrix['true_positive']:>12}{matrix['false_positive']:>8}")
+    print(f"{'No surface':12}{matrix['false_negative']:>12}{matrix['true_negative']:>8}")
+    print(f"Accuracy: {correct}/{total} ({correct / total:.1%})")
+
+    calibration = calibration_report(results)
+    print(f"\nBrier score: {calibration['brier_score']:.4f}")
+    print(f"{'P bin':>12} {'n':>5} {'mean P':>8} {'observed':>9}")
+    for low, high, count, mean_p, observed in calibration["bins"]:
+        print(f"{low:5.1f}-{high:<5.1f} {count:>6} {mean_p:>8.1%} {observed:>9.1%}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Validate the surfacing model "
+                                                 "against wreck records")
+    parser.add_argument("records", nargs="?", default=DEFAULT_RECORDS_PATH,
+                        help="CSV or JSON file of wreck records")
+    parser.add_argument("--draws", type=int, default=20_000,
+                        help="Monte Carlo draws per record")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--base-density", type=float, default=985.0,
+                        help="Center of the body base density distribution")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore and don't write the result cache")
+    args = parser.parse_args()
+
+    records = load_records(args.records)
+    cache_path = None if args.no_cache else DEFAULT_CACHE_PATH
+
+    print("=" * 60)
+    print(" Scenario Runner")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    distributions = ParameterDistributions(
+        base_density=("normal", args.base_density, 20.0))
+    results = run_scenarios(records, draws=args.draws, processes=args.processes,
+                            distributions=distributions, cache_path=cache_path)
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(records)} records from {args.records} in {elapsed:.2f} s")
+    print_report(results)
+
+    # A body recovered the day of the sinking: the point prediction must be
+    # made at day 0 too, so it floats only if it surfaces at once
+    same_day = WreckRecord("Same-day recovery", 162.0, 4.0, days_to_recovery=0.0,
+                           recovered=True)
+    check = evaluate_record((same_day, 1000, distributions,
+                             parameter_hash(same_day, 1000, distributions)))
+    days = check["days_to_surface"]
+    consistent = check["predicted"] == (days == 0)
+    surfaces = "never" if days is None else f"day {days:.2f}"
+    print(f"\nDay-0 record: predicted {check['predicted']}, "
+          f"P {check['probability']:.2f}, surfaces {surfaces} "
+          f"{'✓' if consistent else '✗'}")
@@ -0,0 +1,88 @@
+# surfacing_boundary.py
+
+import numpy as np
+from time_to_surface import time_to_surface
+
+
+class SurfacingBoundary:
+    """
+    Precomputed critical day (first day a body floats) for each depth.
+
+    The model is monotone in time - gas only accumulates - so at each
+    depth a body either floats from some critical day on, or never does
+    within max_days. The table stores that day (solved in closed form by
+    time_to_surface) on a fine depth grid; queries interpolate it, so each
+    one is O(1) no matter the grid size.
+    """
+
+    def __init__(
+            self,
+            max_depth: float = 400.0,
+            depth_step: float = 0.1,
+            max_days: float = 365.0,
+            body_mass_kg: float = 70.0,
+            base_density: float = 985.0
+    ):
+        """
+        Args:
+            max_depth: Deepest depth in the table (meters)
+            depth_step: Table resolution in depth (meters)
+            max_days: Longest time considered (days)
+            body_mass_kg: Mass of body
+            base_density: Initial body density (kg/m³)
+        """
+        self.max_days = max_days
+        self.depths = np.arange(0.0, max_depth + depth_step / 2, depth_step)
+        days = time_to_surface(self.depths, body_mass_kg, base_density)
+        self.critical_days_table = np.where(days <= max_days, days, np.inf)
+
+    def critical_days(self, depth_meters) -> np.ndarray:
+        """First day a body at this depth floats (inf if never)."""
+        depth = np.asarray(depth_meters, dtype=float)
+        finite = np.isfinite(self.critical_days_table)
+
+        # Bodies that ever float do so in a band of shallower depths
+        # (deeper water means more compression and colder water)
+        if not finite.any():
+            return np.full(depth.shape, np.inf)
+        deepest = self.depths[finite][-1]
+        result = np.interp(depth, self.depths[finite],
+                           self.critical_days_table[finite])
+        return np.where(depth > deepest, np.inf, result)
+
+    def will_surface(self, depth_meters, days_elapsed) -> np.ndarray:
+        """Boolean array: will a body at this depth float by this day."""
+        return np.asarray(days_elapsed) >= self.critical_days(depth_meters)
+
+
+if __name__ == "__main__":
+    import time
+    from will_body_surface_vectorized import will_body_surface_vectorized
+
+    print("=" * 60)
+    print(" Surfacing Boundary Table")
+    print("=" * 60)
+
+    for base_density in (985.0, 1050.0):
+        start = time.perf_counter()
+        boundary = SurfacingBoundary(base_density=base_density)
+        built = time.perf_counter() - start
+        print(f"\nbase_density={base_density} kg/m³ "
+              f"({len(boundary.depths):,} depths, built in {built * 1e3:.0f} ms)")
+        for depth in (10, 60, 93, 162, 300):
+            days = float(boundary.critical_days(depth))
+            text = ("never floats within a year" if np.isinf(days)
+                    else f"floats after {days:.1f} days")
+            print(f"  {depth:4d} m: {text}")
+
+    # Accuracy against the direct model on a random sample
+    rng = np.random.default_rng(0)
+    depths = rng.uniform(0, 400, 100_000)
+    days = rng.uniform(0, 365, 100_000)
+    direct, _, _ = will_body_surface_vectorized(depths, days, base_density=1050.0)
+    start = time.perf_counter()
+    table = boundary.will_surface(depths, days)
+    elapsed = time.perf_counter() - start
+    agreement = (direct == table).mean()
+    print(f"\n100,000 random queries in {elapsed * 1e3:.2f} ms, "
+          f"{agreement:.4%} agree with the direct model")
@@ -0,0 +1,110 @@
+# time_to_surface.py
+
+from typing import Optional, Union
+
+import numpy as np
+from decomposition_rate import decomposition_rate
+from will_body_surface_vectorized import superior_profile
+
+
+def time_to_surface(
+        depth_meters,
+        body_mass_kg=70.0,
+        base_density=985.0,
+        season: str = "November",
+        baseline_rate=0.15,
+        q10=2.5,
+        gas_per_kg_ml=1000.0,
+        profile=None
+) -> Union[Optional[float], np.ndarray]:
+    """
+    Days until a body at this depth becomes buoyant, solved in closed form.
+
+    The body floats once its compressed gas volume exceeds
+
+        V_req = m/ρ_water - m/ρ_body
+
+    Gas at depth is max_gas·(1 - e^(-rate·t)) / P, so with
+    f = V_req·P / max_gas the crossing is t = -ln(1 - f) / rate.
+    If f <= 0 the body already floats (t = 0); if f >= 1 the gas
+    asymptote never reaches the requirement. Every parameter broadcasts,
+    so one call can cover many depths or many sampled parameter sets.
+
+    Args:
+        depth_meters: Depth of body (scalar or array)
+        body_mass_kg: Mass of body
+        base_density: Initial body density (kg/m³)
+        season: Time of year (affects surface temp only)
+        baseline_rate: Decomposition rate at 20°C (fraction per day)
+        q10: Temperature coefficient of the decomposition rate
+        gas_per_kg_ml: Gas from complete decomposition (mL per kg)
+        profile: LakeProfile to use instead of superior_profile (season
+            is then ignored)
+
+    Returns:
+        Days until surfacing, or None if it never happens. Array inputs
+        return an array with NaN where the body never surfaces.
+    """
+    depth = np.asarray(depth_meters, dtype=float)
+    if profile is None:
+        temp, pressure, water_density = superior_profile(depth, season)
+    else:
+        temp, pressure, water_density = profile.profile(depth)
+    mass = np.asarray(body_mass_kg, dtype=float)
+
+    # Surface-equivalent gas volume needed for neutral buoyancy (mL)
+    required_m3 = mass / water_density - mass / np.asarray(base_density, dtype=float)
+    required_surface_ml = required_m3 * 1e6 * pressure
+    fraction = required_surface_ml / (gas_per_kg_ml * mass)
+
+    rate = decomposition_rate(temp, baseline_rate, q10)
+    reachable = fraction < 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        days = -np.log1p(-np.where(reachable, fraction, 0.0)) / rate
+    days = np.where(fraction <= 0, 0.0, days)
+    days = np.where(reachable, days, np.nan)
+
+    if days.ndim == 0:
+        return None if np.isnan(days) else float(days)
+    return days
+
+
+if __name__ == "__main__":
+    import time
+    from will_body_surface import will_body_surface
+
+    print("=" * 60)
+    print(" Time to Surface (closed form)")
+    print("=" * 60)
+
+    for base_density in (985.0, 1050.0, 1070.0):
+        print(f"\nbase_density={base_density} kg/m³:")
+        for depth in (10, 75, 93, 162, 3800):
+            days = time_to_surface(depth, base_density=base_density)
+            if days is None:
+                print(f"  {depth:5d} m: never surfaces")
+                continue
+
+            # Check against the full model just before and after
+            before, _, _ = will_body_surface(depth, max(days - 0.01, 0),
+                                             base_density=base_density)
+            after, _, _ = will_body_surface(depth, days + 0.01,
+                                            base_density=base_density)
+            check = "✓" if after and (days == 0 or not before) else "✗"
+            print(f"  {depth:5d} m: surfaces after {days:.2f} days {check}")
+
+    # Speed: closed form over an array vs a day-by-day scan
+    depths = np.linspace(0, 400, 10_000)
+    start = time.perf_counter()
+    time_to_surface(depths, base_density=1050.0)
+    elapsed = time.perf_counter() - start
+    print(f"\n10,000 depths in {elapsed * 1e3:.2f} ms "
+          f"({elapsed / len(depths) * 1e6:.3f} μs per depth)")
+
+    start = time.perf_counter()
+    for day in range(1, 365):
+        floats, _, _ = will_body_surface(300, day, base_density=1050.0)
+        if floats:
+            break
+    scan = time.perf_counter() - start
+    print(f"One day-by-day scan at 300 m: {scan * 1e3:.2f} ms")
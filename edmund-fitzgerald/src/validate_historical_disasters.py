@@ -1,44 +1,42 @@
 # validate_historical_disasters.py
 
+from scenario_runner import load_records, record_profile
+from time_to_surface import time_to_surface
 from will_body_surface import will_body_surface
 
 def validate_historical_disasters() -> None:
     """
     Compare model predictions against known outcomes from maritime disasters.
-    """
-    disasters = [
-        # (Name, Depth_m, Temp_C, Days_to_recovery, Bodies_recovered)
-        ("Titanic (1912)", 3800, 2, None, False),
-        ("Lusitania (1915)", 93, 9, 14, True),
-        ("Andrea Doria (1956)", 75, 12, 7, True),
-        ("Estonia (1994)", 85, 4, None, False),
-    ]
 
+    Records come from data/historical_disasters.csv; each one's water
+    temperature and salinity are applied through a per-record profile.
+    """
     print("\nHistorical Disaster Validation:")
     print("=" * 60)
 
-    for name, depth, temp, actual_days, recovered in disasters:
+    for record in load_records():
+        profile = record_profile(record)
+
         # Run our model
-        if actual_days:
-            will_float, _, _ = will_body_surface(depth, actual_days)
+        if record.days_to_recovery is not None:
+            will_float, _, _ = will_body_surface(record.depth_m,
+                                                 record.days_to_recovery,
+                                                 profile=profile)
         else:
-            # Check if ever possible
-            will_float = False
-            for days in range(1, 365):
-                floats, _, _ = will_body_surface(depth, days)
-                if floats:
-                    will_float = True
-                    break
+            # Check if ever possible within the year
+            days = time_to_surface(record.depth_m, profile=profile)
+            will_float = days is not None and days < 365
 
         # Compare to historical record
         model_predicts = "Surface" if will_float else "No surface"
-        actual_result = "Recovered" if recovered else "Not recovered"
-        match = "✓" if (will_float == recovered) else "✗"
+        actual_result = "Recovered" if record.recovered else "Not recovered"
+        match = "✓" if (will_float == record.recovered) else "✗"
 
-        print(f"\n{name}")
-        print(f"  Depth: {depth}m, Temp: {temp}°C")
+        print(f"\n{record.name}")
+        print(f"  Depth: {record.depth_m:g}m, Temp: {record.temp_c:g}°C, "
+              f"Salinity: {record.salinity_psu:g} PSU")
         print(f"  Model: {model_predicts}")
         print(f"  Actual: {actual_result} {match}")
 
 if __name__ == "__main__":
-    validate_historical_disasters()
\ No newline at end of file
+    validate_historical_disasters()
@@ -1,6 +1,8 @@
 # will_body_surface.py
 
-from typing import Tuple
+from typing import Optional, Tuple
+from lake_profile import LakeProfile
+from model_parameters import ModelParameters
 from superior_conditions import superior_conditions
 from gas_volume_at_depth import gas_volume_at_depth
 from gas_production_model import gas_production_model
@@ -10,7 +12,9 @@ def will_body_surface(
         depth_meters: float,
         days_elapsed: float,
         body_mass_kg: float = 70.0,
-        base_density: float = 985.0
+        base_density: float = 985.0,
+        profile: Optional[LakeProfile] = None,
+        parameters: Optional[ModelParameters] = None
 ) -> Tuple[bool, float, float]:
     """
     Determine if body will surface given conditions and time.
@@ -20,26 +24,41 @@ def will_body_surface(
         days_elapsed: Time since death
         body_mass_kg: Mass of body
         base_density: Initial body density (kg/m³)
+        profile: Lake profile to use instead of Lake Superior's model
+        parameters: Fitted model constants (e.g. ModelParameters.load());
+            its base_density replaces the base_density argument
 
     Returns:
         Tuple of (will_float, body_density, water_density)
     """
     # Get environmental conditions
-    conditions = superior_conditions(depth_meters)
+    if profile is None:
+        conditions = superior_conditions(depth_meters)
+    else:
+        conditions = profile.conditions(depth_meters)
+
+    if parameters is None:
+        parameters = ModelParameters(base_density=base_density)
 
     # Calculate gas production at this temperature
     gas_ml = gas_production_model(
         days_elapsed,
         conditions.temp_celsius,
-        body_mass_kg
+        body_mass_kg,
+        gas_per_kg_ml=parameters.gas_per_kg_ml,
+        baseline_rate=parameters.baseline_rate,
+        q10=parameters.q10
     )
 
     # Compress gas to depth pressure
-    compressed_gas_ml = gas_volume_at_depth(gas_ml, depth_meters)
+    if profile is None:
+        compressed_gas_ml = gas_volume_at_depth(gas_ml, depth_meters)
+    else:
+        compressed_gas_ml = gas_ml / conditions.pressure_atm
 
     # Calculate overall density with gas
     body_density = body_density_with_gas(
-        base_density,
+        parameters.base_density,
         compressed_gas_ml,
         body_mass_kg
     )
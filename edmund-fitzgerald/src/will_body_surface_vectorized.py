@@ -0,0 +1,126 @@
+# will_body_surface_vectorized.py
+
+from typing import Tuple
+
+import numpy as np
+from decomposition_rate import decomposition_rate
+from gas_volume_at_depth import gas_volume_at_depth
+from body_density_with_gas import body_density_with_gas
+
+
+def superior_profile(
+        depth_meters,
+        season: str = "November"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Array version of superior_conditions.
+
+    Args:
+        depth_meters: Depths below surface (any array shape)
+        season: Time of year (affects surface temp only)
+
+    Returns:
+        Tuple of (temp_celsius, pressure_atm, water_density_kg_m3) arrays
+    """
+    depth = np.asarray(depth_meters, dtype=float)
+
+    # Surface layer is seasonal, below the thermocline it's 4°C year-round
+    if season == "November":
+        surface_temp = np.full_like(depth, 8.0)
+    else:
+        surface_temp = 4.0 + (16.0 * np.exp(-depth / 30))
+    temp = np.where(depth < 60, surface_temp, 4.0)
+
+    pressure = 1.0 + (depth / 10.0)
+    water_density = 1000.0 + (depth * 0.0044)
+
+    return temp, pressure, water_density
+
+
+def will_body_surface_vectorized(
+        depth_meters,
+        days_elapsed,
+        body_mass_kg=70.0,
+        base_density=985.0,
+        baseline_rate=0.15,
+        q10=2.5,
+        gas_per_kg_ml=1000.0,
+        profile=None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Array version of will_body_surface.
+
+    All inputs broadcast against each other, so a (depth, days) grid
+    is depths[:, None] and days[None, :]. The arithmetic-only physics
+    functions are reused as-is; only the exp() and the condition lookup
+    are replaced with NumPy equivalents.
+
+    Args:
+        depth_meters: Depth of body
+        days_elapsed: Time since death
+        body_mass_kg: Mass of body
+        base_density: Initial body density (kg/m³)
+        baseline_rate: Decomposition rate at 20°C (fraction per day)
+        q10: Temperature coefficient of the decomposition rate
+        gas_per_kg_ml: Gas from complete decomposition (mL per kg)
+        profile: LakeProfile to use instead of superior_profile (its
+            hydrostatic pressure then replaces Boyle's 1 atm per 10 m)
+
+    Returns:
+        Tuple of (will_float, body_density, water_density) arrays
+    """
+    depth = np.asarray(depth_meters, dtype=float)
+    if profile is None:
+        temp, _, water_density = superior_profile(depth)
+    else:
+        temp, pressure, water_density = profile.profile(depth)
+
+    # gas_production_model, with np.exp in place of math.exp
+    rate = decomposition_rate(temp, baseline_rate, q10)
+    max_gas = gas_per_kg_ml * np.asarray(body_mass_kg, dtype=float)
+    gas_ml = max_gas * -np.expm1(-rate * np.asarray(days_elapsed, dtype=float))
+
+    if profile is None:
+        compressed_gas_ml = gas_volume_at_depth(gas_ml, depth)
+    else:
+        compressed_gas_ml = gas_ml / pressure
+    body_density = body_density_with_gas(base_density, compressed_gas_ml,
+                                         body_mass_kg)
+
+    will_float = body_density < water_density
+    return will_float, body_density, np.broadcast_to(water_density,
+                                                     body_density.shape)
+
+
+if __name__ == "__main__":
+    import time
+    from will_body_surface import will_body_surface
+
+    depths = np.linspace(0, 200, 60)
+    days = np.linspace(1, 365, 50)
+
+    # Agreement with the scalar model on a grid, for two body densities
+    for base_density in (985.0, 1050.0):
+        floats, density, _ = will_body_surface_vectorized(
+            depths[:, None], days[None, :], base_density=base_density)
+        mismatches = 0
+        for i, depth in enumerate(depths):
+            for j, day in enumerate(days):
+                scalar_float, scalar_density, _ = will_body_surface(
+                    depth, day, base_density=base_density)
+                if (scalar_float != floats[i, j]
+                        or not np.isclose(scalar_density, density[i, j])):
+                    mismatches += 1
+        print(f"base_density={base_density}: {floats.size} grid points, "
+              f"{mismatches} mismatches vs will_body_surface")
+
+    # Speed on the 60 x 50 grid from plot_surfacing_zones
+    start = time.perf_counter()
+    for depth in depths:
+        for day in days:
+            will_body_surface(depth, day)
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    will_body_surface_vectorized(depths[:, None], days[None, :])
+    vectorized = time.perf_counter() - start
+    print(f"Python loop: {loop * 1e3:.2f} ms, vectorized: {vectorized * 1e3:.3f} ms")
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+difficulty_retargeting.py
+
+Simulates a proof-of-work chain over thousands of blocks with a population of
+miners and Bitcoin-style difficulty retargeting.
+
+Real mining is a sequence of independent hash attempts, so the time to the
+next block is exponentially distributed with rate
+total_hash_rate / (difficulty * 2^32). The event-driven mode samples those
+block times directly instead of hashing, which lets years of chain history
+run in seconds. A real-hash mode mines actual double SHA-256 headers against
+the same targets so the two can be compared at small scale.
+"""
+
+import bisect
+import hashlib
+import heapq
+import random
+import statistics
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Miner:
+    """A miner and its hash rate (hashes per second)."""
+    name: str
+    hash_rate: float
+
+
+@dataclass
+class HashRateChange:
+    """Scheduled change of one miner's hash rate at `time` seconds."""
+    time: float
+    miner: str
+    hash_rate: float
+
+
+@dataclass
+class ChainParameters:
+    """Consensus parameters (defaults match Bitcoin)."""
+    target_block_time: float = 600.0        # seconds
+    retarget_interval: int = 2016           # blocks per difficulty epoch
+    max_adjustment: float = 4.0             # clamp per retarget
+    hashes_per_difficulty: float = 2 ** 32  # expected hashes at difficulty 1
+    initial_difficulty: float = 1.0
+
+
+@dataclass
+class ChainResult:
+    """Timestamps, difficulties and winners of every simulated block."""
+    mode: str
+    timestamps: List[float] = field(default_factory=list)
+    difficulties: List[float] = field(default_factory=list)
+    winners: List[str] = field(default_factory=list)
+    hashes: int = 0  # real-hash mode only
+
+    def intervals(self) -> List[float]:
+        """Seconds between consecutive blocks."""
+        previous = [0.0] + self.timestamps[:-1]
+        return [t - p for t, p in zip(self.timestamps, previous)]
+
+    def block_share(self) -> Dict[str, float]:
+        """Fraction of blocks won by each miner."""
+        shares: Dict[str, float] = {}
+        for winner in self.winners:
+            shares[winner] = shares.get(winner, 0) + 1
+        return {name: count / len(self.winners) for name, count in shares.items()}
+
+
+def _retarget(difficulty: float, epoch_seconds: float,
+              params: ChainParameters) -> float:
+    """Scale difficulty so the next epoch takes the target time, clamped."""
+    expected = params.target_block_time * params.retarget_interval
+    factor = expected / max(epoch_seconds, 1e-9)
+    factor = max(1.0 / params.max_adjustment, min(params.max_adjustment, factor))
+    return difficulty * factor
+
+
+class _MinerPool:
+    """Current hash rates with a cumulative table for weighted winner picks."""
+
+    def __init__(self, miners: List[Miner]):
+        self.names = [m.name for m in miners]
+        self.rates = {m.name: m.hash_rate for m in miners}
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.cumulative = []
+        total = 0.0
+        for name in self.names:
+            total += self.rates[name]
+            self.cumulative.append(total)
+        self.total = total
+
+    def set_rate(self, name: str, hash_rate: float) -> None:
+        if name not in self.rates:
+            self.names.append(name)
+        self.rates[name] = hash_rate
+        self._rebuild()
+
+    def pick_winner(self, rng: random.Random) -> str:
+        # Each attempt is equally likely to succeed, so the winner is drawn
+        # in proportion to hash rate.
+        index = bisect.bisect_right(self.cumulative, rng.random() * self.total)
+        return self.names[min(index, len(self.names) - 1)]
+
+
+def simulate_chain(miners: List[Miner], blocks: int,
+                   params: Optional[ChainParameters] = None,
+                   changes: Optional[List[HashRateChange]] = None,
+                   seed: Optional[int] = None) -> ChainResult:
+    """
+    Event-driven simulation: sample block times instead of hashing.
+
+    Events (block found, hash rate change) live in a priority queue. A hash
+    rate change redraws the pending block time from the change instant; the
+    exponential distribution is memoryless, so no mining progress is lost.
+
+    Args:
+        miners: Initial miner population
+        blocks: Number of blocks to simulate
+        params: Consensus parameters
+        changes: Scheduled hash rate changes
+        seed: Random seed for reproducible runs
+
+    Returns:
+        ChainResult with one entry per block
+    """
+    params = params or ChainParameters()
+    rng = random.Random(seed)
+    pool = _MinerPool(miners)
+    result = ChainResult(mode="event")
+
+    difficulty = params.initial_difficulty
+    now = 0.0
+    epoch_start = 0.0
+    sequence = 0
+    block_generation = 0  # bumps on reschedule so stale block events are skipped
+
+    events = []
+    for change in changes or []:
+        heapq.heappush(events, (change.time, sequence, "rate", change))
+        sequence += 1
+
+    def schedule_block() -> None:
+        nonlocal sequence
+        if pool.total <= 0:
+            return
+        rate = pool.total / (difficulty * params.hashes_per_difficulty)
+        heapq.heappush(events, (now + rng.expovariate(rate), sequence,
+                                "block", block_generation))
+        sequence += 1
+
+    schedule_block()
+    while len(result.timestamps) < blocks and events:
+        now, _, kind, payload = heapq.heappop(events)
+
+        if kind == "rate":
+            pool.set_rate(payload.miner, payload.hash_rate)
+            block_generation += 1
+            schedule_block()
+            continue
+
+        if payload != block_generation:
+            continue  # superseded by a hash rate change
+
+        result.timestamps.append(now)
+        result.difficulties.append(difficulty)
+        result.winners.append(pool.pick_winner(rng))
+
+        height = len(result.timestamps)
+        if height % params.retarget_interval == 0:
+            difficulty = _retarget(difficulty, now - epoch_start, params)
+            epoch_start = now
+
+        block_generation += 1
+        schedule_block()
+
+    return result
+
+
+def mine_chain(miners: List[Miner], blocks: int,
+               params: Optional[ChainParameters] = None,
+               changes: Optional[List[HashRateChange]] = None,
+               seed: Optional[int] = None) -> ChainResult:
+    """
+    Real-hash simulation: mine double SHA-256 headers against the target.
+
+    The clock advances by attempts / total_hash_rate. Hash rate changes are
+    applied at block boundaries, so keep blocks short relative to them.
+    Only practical at small scale (low hashes_per_difficulty).
+    """
+    params = params or ChainParameters()
+    rng = random.Random(seed)
+    pool = _MinerPool(miners)
+    result = ChainResult(mode="hash")
+    pending = sorted(changes or [], key=lambda c: c.time)
+
+    difficulty = params.initial_difficulty
+    now = 0.0
+    epoch_start = 0.0
+    prev_hash = bytes(32)
+    sha256 = hashlib.sha256
+
+    while len(result.timestamps) < blocks:
+        while pending and pending[0].time <= now:
+            change = pending.pop(0)
+            pool.set_rate(change.miner, change.hash_rate)
+
+        target = int(2 ** 256 / (difficulty * params.hashes_per_difficulty))
+        # Random extra nonce so every block starts from a fresh search space
+        prefix = prev_hash + struct.pack("<Q", rng.getrandbits(64))
+        nonce = 0
+        while True:
+            digest = sha256(sha256(prefix + struct.pack("<I", nonce)).digest()).digest()
+            nonce += 1
+            if int.from_bytes(digest, "little") < target:
+                break
+
+        result.hashes += nonce
+        now += nonce / pool.total
+        prev_hash = digest
+
+        result.timestamps.append(now)
+        result.difficulties.append(difficulty)
+        result.winners.append(pool.pick_winner(rng))
+
+        height = len(result.timestamps)
+        if height % params.retarget_interval == 0:
+            difficulty = _retarget(difficulty, now - epoch_start, params)
+            epoch_start = now
+
+    return result
+
+
+def long_run_demo() -> None:
+    """Four years of Bitcoin-like history with hash rate growing 4x."""
+    print("=" * 60)
+    print("Event-Driven Simulation: 4 Years of Retargeting")
+    print("=" * 60)
+
+    params = ChainParameters()
+    miners = [Miner(f"pool-{i}", hash_rate=(i + 1) * 1e18) for i in range(10)]
+    total = sum(m.hash_rate for m in miners)
+    params.initial_difficulty = total * params.target_block_time / params.hashes_per_difficulty
+
+    # Every pool doubles its hash rate after one year, then again after two
+    year = 365.25 * 24 * 3600
+    changes = []
+    for step in (1, 2):
+        for i, miner in enumerate(miners):
+            changes.append(HashRateChange(step * year, miner.name,
+                                          miner.hash_rate * 2 ** step))
+
+    blocks = 4 * 52_560  # ~4 years of 10-minute blocks
+    start = time.perf_counter()
+    result = simulate_chain(miners, blocks, params, changes, seed=42)
+    elapsed = time.perf_counter() - start
+
+    print(f"Simulated {blocks:,} blocks ({result.timestamps[-1] / year:.2f} years) "
+          f"in {elapsed:.2f} seconds")
+    print()
+
+    intervals = result.intervals()
+    epoch = params.retarget_interval
+    print("Epoch  Mean block time  Difficulty")
+    for index in range(0, len(intervals), epoch * 13):
+        window = intervals[index:index + epoch]
+        print(f"{index // epoch:5d}  {statistics.mean(window):11.1f} s   "
+              f"{result.difficulties[index]:.3e}")
+    print()
+
+    shares = result.block_share()
+    print("Block share vs hash share (largest and smallest pool):")
+    for name in (miners[-1].name, miners[0].name):
+        hash_share = next(m.hash_rate for m in miners if m.name == name) / total
+        print(f"  {name}: {shares.get(name, 0):.3f} of blocks, "
+              f"{hash_share:.3f} of hash rate")
+    print()
+
+
+def validation_demo() -> None:
+    """Compare event-driven and real-hash modes at small scale."""
+    print("=" * 60)
+    print("Validation: Event-Driven vs Real Hashing (small scale)")
+    print("=" * 60)
+
+    params = ChainParameters(target_block_time=1.0, retarget_interval=25,
+                             hashes_per_difficulty=2 ** 8,
+                             initial_difficulty=2.0)
+    miners = [Miner("alice", 1500.0), Miner("bob", 500.0)]
+    changes = [HashRateChange(100.0, "bob", 2500.0)]
+    blocks = 300
+
+    start = time.perf_counter()
+    mined = mine_chain(miners, blocks, params, changes, seed=1)
+    mined_seconds = time.perf_counter() - start
+
+    runs = [simulate_chain(miners, blocks, params, changes, seed=seed)
+            for seed in range(200)]
+
+    sim_interval = statistics.mean(statistics.mean(r.intervals()) for r in runs)
+    final_difficulties = [r.difficulties[-1] for r in runs]
+    sim_difficulty = statistics.mean(final_difficulties)
+    sim_spread = statistics.stdev(final_difficulties)
+
+    print(f"Real hashing: {mined.hashes:,} hashes in {mined_seconds:.2f} s")
+    print(f"  Mean block time:  {statistics.mean(mined.intervals()):.3f} s")
+    print(f"  Final difficulty: {mined.difficulties[-1]:.2f}")
+    print(f"Event-driven (mean of {len(runs)} runs):")
+    print(f"  Mean block time:  {sim_interval:.3f} s")
+    print(f"  Final difficulty: {sim_difficulty:.2f} ± {sim_spread:.2f} (1 sd)")
+    expected = (1500 + 2500) * params.target_block_time / params.hashes_per_difficulty
+    print(f"Equilibrium difficulty after bob's upgrade: {expected:.2f}")
+    print()
+
+
+def main():
+    """Run the retargeting simulations."""
+    print("\n⛏️ DIFFICULTY RETARGETING SIMULATOR\n")
+    long_run_demo()
+    validation_demo()
+
+
+if __name__ == "__main__":
+    main()
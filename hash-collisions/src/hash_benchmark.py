@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+hash_benchmark.py
+
+Measures hash function throughput instead of taking "BLAKE2 is fast" on faith.
+Sweeps message sizes from 16 bytes to 1 GB across MD5, SHA-1, SHA-256,
+SHA3-256, BLAKE2b, BLAKE2s and Bitcoin's double SHA-256, comparing single-shot
+hashing, streaming update() calls and multi-threaded hashing. Results can be
+written as JSON or CSV and summarized into per-workload defaults.
+
+Usage:
+    python hash_benchmark.py
+    python hash_benchmark.py --max-size 64MB --threads 1 2 4 --json results.json
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, fields
+from typing import Callable, Dict, List, Optional
+
+from header_chain_hashing import double_sha256
+
+
+class _DoubleSha256:
+    """Streaming wrapper so double SHA-256 can be fed through update()."""
+
+    def __init__(self):
+        self._inner = hashlib.sha256()
+
+    def update(self, data) -> None:
+        self._inner.update(data)
+
+    def digest(self) -> bytes:
+        return hashlib.sha256(self._inner.digest()).digest()
+
+
+# Algorithm name -> (single-shot function, streaming constructor)
+ALGORITHMS: Dict[str, tuple] = {
+    "md5": (lambda data: hashlib.md5(data).digest(), hashlib.md5),
+    "sha1": (lambda data: hashlib.sha1(data).digest(), hashlib.sha1),
+    "sha256": (lambda data: hashlib.sha256(data).digest(), hashlib.sha256),
+    "sha3_256": (lambda data: hashlib.sha3_256(data).digest(), hashlib.sha3_256),
+    "blake2b": (lambda data: hashlib.blake2b(data).digest(), hashlib.blake2b),
+    "blake2s": (lambda data: hashlib.blake2s(data).digest(), hashlib.blake2s),
+    "bitcoin_hash": (double_sha256, _DoubleSha256),
+}
+
+# Algorithms still considered safe for collision resistance
+SECURE_ALGORITHMS = ("sha256", "sha3_256", "blake2b", "blake2s", "bitcoin_hash")
+
+# Defaults are picked from these: double SHA-256 is sha256 plus a second
+# pass, so it can only win by measurement noise
+RECOMMENDABLE_ALGORITHMS = tuple(name for name in SECURE_ALGORITHMS
+                                 if name != "bitcoin_hash")
+
+KB = 1024
+MB = 1024 * KB
+GB = 1024 * MB
+
+DEFAULT_STREAM_CHUNK = 64 * KB
+
+
+@dataclass
+class BenchmarkResult:
+    """One row of the benchmark table."""
+    algorithm: str
+    mode: str           # "single" or "stream"
+    message_bytes: int
+    threads: int
+    hashes: int
+    seconds: float
+    mb_per_s: float
+    ns_per_hash: float
+
+
+def message_sizes(min_size: int = 16, max_size: int = GB) -> List[int]:
+    """Powers of four from min_size up to and including max_size."""
+    sizes = []
+    size = min_size
+    while size < max_size:
+        sizes.append(size)
+        size *= 4
+    sizes.append(max_size)
+    return sizes
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes like '16', '64KB', '1GB' into bytes."""
+    text = text.strip().upper()
+    for suffix, factor in (("GB", GB), ("MB", MB), ("KB", KB), ("B", 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    """Human-readable power-of-two size."""
+    for suffix, factor in (("GB", GB), ("MB", MB), ("KB", KB)):
+        if size >= factor:
+            return f"{size / factor:g}{suffix}"
+    return f"{size}B"
+
+
+def _hash_loop(work: Callable[[], None], iterations: int) -> None:
+    for _ in range(iterations):
+        work()
+
+
+def _stream_work(constructor: Callable, message: memoryview,
+                 chunk_size: int) -> Callable[[], None]:
+    def work() -> None:
+        hasher = constructor()
+        for offset in range(0, len(message), chunk_size):
+            hasher.update(message[offset:offset + chunk_size])
+        hasher.digest()
+    return work
+
+
+def _time_iterations(work: Callable[[], None], iterations: int,
+                     threads: int) -> float:
+    """Run `iterations` hashes on each of `threads` threads, return seconds."""
+    if threads == 1:
+        start = time.perf_counter()
+        _hash_loop(work, iterations)
+        return time.perf_counter() - start
+
+    # hashlib releases the GIL for inputs over 2 KB, so large messages scale
+    # with threads while tiny messages mostly measure GIL contention.
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(_hash_loop, work, iterations)
+                   for _ in range(threads)]
+        for future in futures:
+            future.result()
+        return time.perf_counter() - start
+
+
+def benchmark_one(algorithm: str, message: memoryview, mode: str = "single",
+                  threads: int = 1, min_time: float = 0.2,
+                  chunk_size: int = DEFAULT_STREAM_CHUNK) -> BenchmarkResult:
+    """
+    Benchmark one algorithm on one message size.
+
+    The iteration count is calibrated so each measurement runs for at least
+    `min_time` seconds (a single hash of a 1 GB message is always enough).
+    """
+    single_shot, constructor = ALGORITHMS[algorithm]
+    if mode == "single":
+        def work() -> None:
+            single_shot(message)
+    elif mode == "stream":
+        work = _stream_work(constructor, message, chunk_size)
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    # Calibrate: double the iteration count until the run is long enough
+    iterations = 1
+    while True:
+        elapsed = _time_iterations(work, iterations, threads)
+        if elapsed >= min_time or iterations >= 1 << 24:
+            break
+        iterations *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed) + 1)
+
+    hashes = iterations * threads
+    size = len(message)
+    return BenchmarkResult(
+        algorithm=algorithm,
+        mode=mode,
+        message_bytes=size,
+        threads=threads,
+        hashes=hashes,
+        seconds=elapsed,
+        mb_per_s=size * hashes / elapsed / 1e6,
+        ns_per_hash=elapsed / hashes * 1e9,
+    )
+
+
+def run_benchmarks(algorithms: Optional[List[str]] = None,
+                   sizes: Optional[List[int]] = None,
+                   modes: tuple = ("single", "stream"),
+                   thread_counts: tuple = (1,),
+                   min_time: float = 0.2,
+                   chunk_size: int = DEFAULT_STREAM_CHUNK,
+                   progress: bool = True) -> List[BenchmarkResult]:
+    """
+    Sweep every (algorithm, size, mode, threads) combination.
+
+    A single random buffer of the largest size is allocated once and sliced
+    with memoryview, so no message is ever copied.
+    """
+    algorithms = algorithms or list(ALGORITHMS)
+    sizes = sizes or message_sizes()
+    buffer = memoryview(os.urandom(max(sizes)))
+
+    results = []
+    for size in sizes:
+        message = buffer[:size]
+        for algorithm in algorithms:
+            for mode in modes:
+                # Streaming a message smaller than one chunk is single-shot
+                if mode == "stream" and size <= chunk_size:
+                    continue
+                for threads in thread_counts:
+                    result = benchmark_one(algorithm, message, mode, threads,
+                                           min_time, chunk_size)
+                    results.append(result)
+                    if progress:
+                        print(f"  {algorithm:13} {mode:6} {format_size(size):>6} "
+                              f"x{threads:<2} {result.mb_per_s:10.1f} MB/s "
+                              f"{result.ns_per_hash:14.0f} ns/hash")
+    return results
+
+
+def recommend_defaults(results: List[BenchmarkResult],
+                       candidates: tuple = RECOMMENDABLE_ALGORITHMS
+                       ) -> Dict[int, Dict[str, object]]:
+    """
+    Pick the fastest secure algorithm for each message size.
+
+    Returns a mapping of message size to the winning row's algorithm, mode,
+    thread count and throughput.
+    """
+    best: Dict[int, BenchmarkResult] = {}
+    for result in results:
+        if result.algorithm not in candidates:
+            continue
+        current = best.get(result.message_bytes)
+        if current is None or result.mb_per_s > current.mb_per_s:
+            best[result.message_bytes] = result
+
+    return {
+        size: {
+            "algorithm": row.algorithm,
+            "mode": row.mode,
+            "threads": row.threads,
+            "mb_per_s": round(row.mb_per_s, 1),
+        }
+        for size, row in sorted(best.items())
+    }
+
+
+def write_json(results: List[BenchmarkResult], path: str) -> None:
+    """Write results plus recommended defaults as JSON."""
+    payload = {
+        "results": [asdict(result) for result in results],
+        "defaults": {str(size): choice for size, choice
+                     in recommend_defaults(results).items()},
+    }
+    with open(path, "w") as handle:
+        json.dump(payload, handle, indent=2)
+
+
+def write_csv(results: List[BenchmarkResult], path: str) -> None:
+    """Write results as a flat CSV table."""
+    with open(path, "w", newline="") as handle:
+        writer = csv.DictWriter(handle,
+                                fieldnames=[f.name for f in fields(BenchmarkResult)])
+        writer.writeheader()
+        for result in results:
+            writer.writerow(asdict(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hash function throughput benchmark")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS),
+                        help="Algorithms to benchmark (default: all)")
+    parser.add_argument("--min-size", default="16", help="Smallest message (default: 16)")
+    parser.add_argument("--max-size", default="1GB", help="Largest message (default: 1GB)")
+    parser.add_argument("--modes", nargs="+", default=["single", "stream"],
+                        choices=["single", "stream"])
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, os.cpu_count() or 1],
+                        help="Thread counts to compare (default: 1 and all cores)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per measurement")
+    parser.add_argument("--chunk-size", default="64KB", help="Streaming update() chunk size")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--csv", help="Write results to this CSV file")
+    args = parser.parse_args()
+
+    sizes = message_sizes(parse_size(args.min_size), parse_size(args.max_size))
+    thread_counts = tuple(sorted(set(args.threads)))
+
+    print("=" * 60)
+    print("Hash Function Throughput Benchmark")
+    print("=" * 60)
+    print(f"Sizes: {format_size(sizes[0])} to {format_size(sizes[-1])}, "
+          f"threads: {thread_counts}")
+    print()
+
+    results = run_benchmarks(args.algorithms, sizes, tuple(args.modes),
+                             thread_counts, args.min_time,
+                             parse_size(args.chunk_size))
+
+    print()
+    print("Fastest secure choice per message size:")
+    for size, choice in recommend_defaults(results).items():
+        print(f"  {format_size(size):>6}: {choice['algorithm']:13} "
+              f"({choice['mode']}, {choice['threads']} thread(s)) "
+              f"{choice['mb_per_s']:.1f} MB/s")
+
+    if args.json:
+        write_json(results, args.json)
+        print(f"\nWrote {args.json}")
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"Wrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
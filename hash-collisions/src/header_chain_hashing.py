@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+header_chain_hashing.py
+
+Batched double SHA-256 for validating chains of Bitcoin block headers.
+
+The per-call bitcoin_hash() from the blog post takes a str, encodes it and
+returns hex. bitcoin_hash_many() works on a contiguous buffer of fixed-size
+80-byte binary headers and writes raw 32-byte digests into a preallocated
+bytearray. In one process that is no faster than per-call hashing, since
+hashlib's SHA-256 dominates either way; the gain comes from spreading the
+work across worker processes, which read headers from and write digests to
+shared buffers rather than having chunks pickled to them.
+"""
+
+import hashlib
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import RawArray
+from typing import Optional
+
+HEADER_SIZE = 80
+DIGEST_SIZE = 32
+
+
+def double_sha256(data) -> bytes:
+    """Bitcoin's double SHA-256 over raw bytes."""
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+
+def bitcoin_hash(data: str) -> str:
+    """Bitcoin uses double SHA-256 for extra security."""
+    return double_sha256(data.encode()).hex()
+
+
+def pack_header(version: int, prev_block: str, merkle_root: str,
+                timestamp: int, bits: int, nonce: int) -> bytes:
+    """
+    Serialize a block header into Bitcoin's 80-byte wire format.
+
+    Hashes are given in the usual display (big-endian hex) order and stored
+    byte-reversed, the way they appear on the wire.
+    """
+    return struct.pack(
+        "<I32s32sIII",
+        version,
+        bytes.fromhex(prev_block)[::-1],
+        bytes.fromhex(merkle_root)[::-1],
+        timestamp,
+        bits,
+        nonce,
+    )
+
+
+def display_hash(digest: bytes) -> str:
+    """Convert a raw digest into the byte-reversed hex used by block explorers."""
+    return digest[::-1].hex()
+
+
+def _hash_headers_into(headers: memoryview, out: memoryview,
+                       block_headers: int = 4096) -> None:
+    """Double-hash every header in `headers`, writing digests into `out`."""
+    sha256 = hashlib.sha256
+    block_bytes = block_headers * HEADER_SIZE
+    out_offset = 0
+    # Join a block of digests at a time: one slice assignment per block is
+    # cheaper than one per header, and memory stays bounded.
+    for start in range(0, len(headers), block_bytes):
+        end = min(start + block_bytes, len(headers))
+        digests = b"".join([
+            sha256(sha256(headers[offset:offset + HEADER_SIZE]).digest()).digest()
+            for offset in range(start, end, HEADER_SIZE)
+        ])
+        out[out_offset:out_offset + len(digests)] = digests
+        out_offset += len(digests)
+
+
+# Shared input and output buffers, set in each worker by _attach_buffers
+_shared_buffers = {}
+
+
+def _attach_buffers(headers: RawArray, digests: RawArray) -> None:
+    """Worker initializer: keep the shared buffers the pool was started with."""
+    _shared_buffers["headers"] = memoryview(headers).cast("B")
+    _shared_buffers["digests"] = memoryview(digests).cast("B")
+
+
+def _hash_range(bounds) -> None:
+    """Worker entry point: hash headers [first, last) of the shared buffer
+    into the matching digest slots. Only the two indices cross the pipe."""
+    first, last = bounds
+    _hash_headers_into(
+        _shared_buffers["headers"][first * HEADER_SIZE:last * HEADER_SIZE],
+        _shared_buffers["digests"][first * DIGEST_SIZE:last * DIGEST_SIZE])
+
+
+def bitcoin_hash_many(headers, out: Optional[bytearray] = None,
+                      processes: int = 1,
+                      chunk_headers: int = 65536) -> bytearray:
+    """
+    Double SHA-256 every 80-byte header in a contiguous buffer.
+
+    Args:
+        headers: bytes-like object holding N concatenated 80-byte headers
+        out: Optional preallocated buffer of at least N * 32 bytes
+        processes: Worker processes to use (1 hashes in the calling process)
+        chunk_headers: Headers per chunk handed to each worker
+
+    Returns:
+        Buffer of N raw 32-byte digests; digest i is out[32*i:32*(i+1)]
+    """
+    headers = memoryview(headers).cast("B")
+    if len(headers) % HEADER_SIZE:
+        raise ValueError(f"Header buffer length {len(headers)} is not a "
+                         f"multiple of {HEADER_SIZE} bytes")
+
+    count = len(headers) // HEADER_SIZE
+    if out is None:
+        out = bytearray(count * DIGEST_SIZE)
+    elif len(out) < count * DIGEST_SIZE:
+        raise ValueError(f"Output buffer needs {count * DIGEST_SIZE} bytes, "
+                         f"got {len(out)}")
+    out_view = memoryview(out)
+
+    if processes <= 1 or count <= chunk_headers:
+        _hash_headers_into(headers, out_view)
+        return out
+
+    # Workers inherit the shared buffers when they start, so the input is
+    # copied once in total rather than once per chunk through the pool
+    shared_headers = RawArray("B", len(headers))
+    memoryview(shared_headers).cast("B")[:] = headers
+    shared_digests = RawArray("B", count * DIGEST_SIZE)
+    ranges = [(first, min(first + chunk_headers, count))
+              for first in range(0, count, chunk_headers)]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_attach_buffers,
+                             initargs=(shared_headers, shared_digests)) as pool:
+        list(pool.map(_hash_range, ranges))
+    out_view[:count * DIGEST_SIZE] = memoryview(shared_digests).cast("B")
+    return out
+
+
+def random_headers(count: int) -> bytes:
+    """Build `count` synthetic headers with random hashes and sequential nonces."""
+    parts = []
+    for nonce in range(count):
+        parts.append(struct.pack("<I32s32sIII", 4, os.urandom(32),
+                                 os.urandom(32), 1231006505 + nonce * 600,
+                                 0x1D00FFFF, nonce))
+    return b"".join(parts)
+
+
+def verify_genesis_block() -> None:
+    """Check bitcoin_hash_many against the real genesis block hash."""
+    print("=" * 60)
+    print("Genesis Block Check")
+    print("=" * 60)
+
+    genesis = pack_header(
+        version=1,
+        prev_block="00" * 32,
+        merkle_root="4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b",
+        timestamp=1231006505,
+        bits=0x1D00FFFF,
+        nonce=2083236893,
+    )
+    expected = "000000000019d6689c085ae165831e934ff763ae46a2a6c172b3f1b60a8ce26f"
+    computed = display_hash(bytes(bitcoin_hash_many(genesis)))
+
+    print(f"  Computed: {computed}")
+    print(f"  Expected: {expected}")
+    print(f"  {'✅ Match' if computed == expected else '❌ Mismatch'}")
+    print()
+
+
+def _best_of(run, repeats: int = 3) -> float:
+    """Fastest wall-clock time of several runs, to damp scheduler noise."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_batch_vs_per_call(count: int = 200_000) -> None:
+    """Compare the per-call string path with the batched binary path."""
+    print("=" * 60)
+    print(f"Batched vs Per-Call Double SHA-256 ({count:,} headers)")
+    print("=" * 60)
+
+    headers = random_headers(count)
+
+    # Per-call path: one text header per call, hex digest out
+    text_headers = [headers[i:i + HEADER_SIZE].hex()
+                    for i in range(0, len(headers), HEADER_SIZE)]
+    per_call = _best_of(lambda: [bitcoin_hash(text) for text in text_headers])
+
+    # Batched path into a preallocated buffer
+    out = bytearray(count * DIGEST_SIZE)
+    batched = _best_of(lambda: bitcoin_hash_many(headers, out))
+
+    # The pool only pays off with cores to spread over
+    processes = os.cpu_count() or 1
+    rows = [("Per-call str -> hex", per_call), ("bitcoin_hash_many", batched)]
+    checked = [out]
+    if processes > 1:
+        parallel_out = bytearray(count * DIGEST_SIZE)
+        parallel = _best_of(lambda: bitcoin_hash_many(
+            headers, parallel_out, processes=processes,
+            chunk_headers=max(1, count // (4 * processes))))
+        rows.append((f"bitcoin_hash_many ({processes} procs)", parallel))
+        checked.append(parallel_out)
+
+    # Spot-check against a straightforward double hash of each header
+    for i in (0, count // 2, count - 1):
+        reference = double_sha256(headers[i * HEADER_SIZE:(i + 1) * HEADER_SIZE])
+        for digests in checked:
+            assert digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE] == reference
+
+    for label, seconds in rows:
+        print(f"  {label:32} {seconds:7.3f} s  "
+              f"{count / seconds:12,.0f} headers/s  "
+              f"{per_call / seconds:5.1f}x")
+    if processes == 1:
+        print("  (one CPU available: the multi-process path was not run)")
+    print()
+
+
+def main():
+    """Verify the batched API and benchmark it."""
+    print("\n⛓️ BATCHED BLOCK HEADER HASHING\n")
+    verify_genesis_block()
+    benchmark_batch_vs_per_call()
+
+
+if __name__ == "__main__":
+    main()
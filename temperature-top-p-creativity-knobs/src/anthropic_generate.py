@@ -36,6 +36,8 @@ def anthropic_generate(prompt, temperature=1.0, top_p=1.0, n=5):
 
 
 def main():
+    from response_cache import cached_anthropic_generate, default_cache
+
     # Experiment: Same prompt, different temperatures
     prompt = (
         "Complete this sentence with a single continuation: "
@@ -49,10 +51,12 @@ def main():
     for temp in [0.0, 0.3, 0.7, 1.0]:
         print(f"\nTemperature = {temp}")
         print("-" * 40)
-        responses = anthropic_generate(prompt, temperature=temp, n=3)
+        responses = cached_anthropic_generate(prompt, temperature=temp, n=3)
         for i, r in enumerate(responses, 1):
             print(f"  {i}. {r[:80]}...")
 
+    print(f"\n{default_cache().report()}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,204 @@
+# async_generate.py
+
+import asyncio
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+
+import anthropic
+import openai
+from response_cache import default_cache
+
+# In-flight requests per generator, and retry backoff: the delay before
+# retry i is drawn uniformly from [0, min(MAX_DELAY, BASE_DELAY·2^i)]
+MAX_CONCURRENCY = 8
+MAX_RETRIES = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 20.0
+
+ANTHROPIC_SYSTEM_PROMPT = (
+    "You are a creative writing assistant. When asked to "
+    "complete a sentence, respond with ONLY the completion "
+    "- no preamble, no alternatives, no explanation. Just "
+    "continue the text naturally."
+)
+
+
+def _retryable(error):
+    """Rate limits, server errors and dropped connections are worth retrying."""
+    if isinstance(error, (openai.APIConnectionError, anthropic.APIConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def _retry_after(error):
+    """Seconds the server asked us to wait, if it said."""
+    try:
+        return float(error.response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class _AsyncGenerator(ABC):
+    """Shared machinery: a concurrency semaphore and retries with
+    exponential backoff and full jitter around one SDK client, which every
+    request reuses, so they share its keep-alive connection pool; the
+    semaphore keeps at most max_concurrency connections busy. With a
+    ResponseCache, generate() asks the API only for the completions the
+    cache doesn't already hold.
+
+    The SDK's own retries are turned off so every attempt, first or
+    retried, goes through the same semaphore. Backoff sleeps happen outside
+    it, so a rate-limited request doesn't hold a slot while it waits.
+    """
+
+    model = None
+
+    def __init__(self, client, cache=None, max_concurrency=MAX_CONCURRENCY,
+                 max_retries=MAX_RETRIES, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.client = client
+        self.cache = cache
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _request(self, call):
+        """Await call() under the semaphore, retrying transient failures."""
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                try:
+                    return await call()
+                except (openai.APIError, anthropic.APIError) as error:
+                    if attempt == self.max_retries or not _retryable(error):
+                        raise
+                    delay = random.uniform(0, min(self.max_delay,
+                                                  self.base_delay * 2 ** attempt))
+                    requested = _retry_after(error)
+                    if requested is not None:
+                        delay = max(delay, min(requested, self.max_delay))
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def generate(self, prompt, temperature=1.0, top_p=1.0, n=5, seed=None):
+        """n completions of prompt, through the cache if there is one."""
+        if self.cache is None:
+            return await self._generate(prompt, temperature=temperature, top_p=top_p, n=n)
+        return await self.cache.agenerate(self._generate, self.model, prompt,
+                                          temperature, top_p, n, seed)
+
+    @abstractmethod
+    async def _generate(self, prompt, temperature, top_p, n):
+        """n completions of prompt from the API."""
+
+    async def sweep(self, prompt, temperatures, top_p=1.0, n=3):
+        """generate() at every temperature concurrently: {temperature: responses}."""
+        results = await asyncio.gather(*(self.generate(prompt, t, top_p, n)
+                                         for t in temperatures))
+        return dict(zip(temperatures, results))
+
+    async def aclose(self):
+        await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+class AsyncOpenAIGenerator(_AsyncGenerator):
+    """Async counterpart of openai_generate; all n completions come back
+    from a single request via the API's native n parameter."""
+
+    model = "gpt-4o-mini"
+
+    def __init__(self, api_key=None, base_url=None, **options):
+        client = openai.AsyncOpenAI(
+            api_key=api_key or os.environ["OPENAI_API_KEY"], base_url=base_url,
+            max_retries=0)
+        super().__init__(client, **options)
+
+    async def _generate(self, prompt, temperature, top_p, n):
+        response = await self._request(lambda: self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            top_p=top_p,
+            n=n,
+            max_tokens=50
+        ))
+        return [choice.message.content for choice in response.choices]
+
+
+class AsyncAnthropicGenerator(_AsyncGenerator):
+    """Async counterpart of anthropic_generate. The Messages API has no n,
+    so the n requests are sent concurrently instead."""
+
+    model = "claude-3-5-haiku-20241022"
+
+    def __init__(self, api_key=None, base_url=None, **options):
+        client = anthropic.AsyncAnthropic(
+            api_key=api_key or os.environ["ANTHROPIC_API_KEY"], base_url=base_url,
+            max_retries=0)
+        super().__init__(client, **options)
+
+    async def generate(self, prompt, temperature=1.0, top_p=1.0, n=5, seed=None):
+        # Anthropic accepts temperature in [0, 1]; clamping before the cache
+        # lookup keeps T=1.5 and T=1.0, the same request, in one entry
+        temperature = max(0.0, min(1.0, temperature))
+        return await super().generate(prompt, temperature, top_p, n, seed)
+
+    async def _generate(self, prompt, temperature, top_p, n):
+        async def one():
+            response = await self._request(lambda: self.client.messages.create(
+                model=self.model,
+                system=ANTHROPIC_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                top_p=top_p,
+                max_tokens=50
+            ))
+            return response.content[0].text
+
+        return list(await asyncio.gather(*(one() for _ in range(n))))
+
+
+async def temperature_sweep():
+    prompt = (
+        "Complete this sentence with a single continuation: "
+        "The robot looked at the sunset and felt"
+    )
+    cache = default_cache()
+    async with AsyncOpenAIGenerator(cache=cache) as gpt, \
+            AsyncAnthropicGenerator(cache=cache) as claude:
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            gpt.sweep(prompt, [0.0, 0.5, 1.0, 1.5], n=3),
+            claude.sweep(prompt, [0.0, 0.3, 0.7, 1.0], n=3))
+        elapsed = time.perf_counter() - start
+
+    for name, sweep in zip(("OpenAI", "Anthropic Claude"), results):
+        print("=" * 60)
+        print(f"TEMPERATURE EXPERIMENT ({name})")
+        print("=" * 60)
+        for temp, responses in sweep.items():
+            print(f"\nTemperature = {temp}")
+            print("-" * 40)
+            for i, r in enumerate(responses, 1):
+                print(f"  {i}. {r[:80]}...")
+        print()
+    print(f"Both sweeps, concurrently: {elapsed:.1f} s "
+          f"({gpt.retries + claude.retries} retries)")
+    print(cache.report())
+
+
+def main():
+    asyncio.run(temperature_sweep())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# batched_sampling.py
+
+import numpy as np
+from nucleus import batched_nucleus
+from softmax_kernel import softmax_kernel
+
+
+def _top_candidates(logits, k):
+    """Indices and values of the k largest entries per row, sorted descending."""
+    vocab = logits.shape[1]
+    if k >= vocab:
+        order = np.argsort(logits, axis=1)[:, ::-1]
+    else:
+        # argpartition finds the top k in O(V); only those k get sorted
+        part = np.argpartition(logits, vocab - k, axis=1)[:, vocab - k:]
+        order_in_part = np.argsort(np.take_along_axis(logits, part, axis=1),
+                                   axis=1)[:, ::-1]
+        order = np.take_along_axis(part, order_in_part, axis=1)
+    return order, np.take_along_axis(logits, order, axis=1)
+
+
+def sample(logits, temperature=1.0, top_p=1.0, top_k=0, rng=None):
+    """Draw one token id per row of a (batch, vocab) logit matrix.
+
+    Applies temperature, then top-k (0 = off), then top-p on what is left,
+    using the same cutoff rule as top_p_sampling: keep tokens up to and
+    including the first one where the cumulative probability reaches p.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    logits = np.atleast_2d(np.asarray(logits))
+    if logits.dtype not in (np.float32, np.float64):
+        logits = logits.astype(np.float64)
+    batch, vocab = logits.shape
+
+    if temperature == 0:
+        # Greedy: the max logit, like softmax_with_temperature's one-hot
+        return np.argmax(logits, axis=1)
+
+    k = top_k if 0 < top_k < vocab else vocab
+    if k == vocab and top_p >= 1.0:
+        # No truncation: sample the full distribution with the Gumbel trick
+        noise = rng.gumbel(size=logits.shape)
+        noise += logits / temperature
+        return np.argmax(noise, axis=1)
+
+    if k < vocab:
+        # Sorted top-k candidates, renormalized, then the nucleus cutoff:
+        # count of entries before cumsum reaches p, plus one
+        order, values = _top_candidates(logits, k)
+        values /= temperature
+        probs = np.exp(values - values[:, :1])
+        probs /= probs.sum(axis=1, keepdims=True)
+        cumsum = np.cumsum(probs, axis=1, dtype=np.float64)
+        keep = np.minimum((cumsum < top_p).sum(axis=1) + 1, k)
+    else:
+        # Top-p alone: only as much of each row is sorted as its nucleus needs
+        probs = softmax_kernel(logits, temperature)
+        order, sorted_probs, keep = batched_nucleus(probs, top_p)
+        cumsum = np.cumsum(sorted_probs, axis=1, dtype=np.float64)
+
+    # Inverse-CDF draw inside each row's nucleus
+    kept_mass = np.take_along_axis(cumsum, (keep - 1)[:, None], axis=1)
+    u = rng.random((batch, 1)) * kept_mass
+    position = np.minimum((cumsum < u).sum(axis=1), keep - 1)
+    return order[np.arange(batch), position]
+
+
+def main():
+    import time
+    from top_p_sampling import top_p_sampling
+
+    rng = np.random.default_rng(0)
+
+    # Distribution check on the top_p_sampling example
+    logits = np.array([3.0, 2.5, 2.0, 1.0, 0.5, 0.0, -0.5, -1.0])
+    expected = top_p_sampling(logits, p=0.9, temperature=1.0)
+    draws = sample(np.tile(logits, (200_000, 1)), top_p=0.9, rng=rng)
+    observed = np.bincount(draws, minlength=len(logits)) / len(draws)
+    print("Token frequencies vs top_p_sampling (p=0.9):")
+    print(f"  expected: {expected.round(3)}")
+    print(f"  sampled:  {observed.round(3)}")
+
+    # Throughput: one decoding step for a batch of sequences
+    batch, vocab = 512, 100_000
+    logits = (rng.standard_normal((batch, vocab)) * 3).astype(np.float32)
+
+    rows = 32
+    start = time.perf_counter()
+    for row in logits[:rows]:
+        probs = top_p_sampling(row.astype(np.float64), p=0.9, temperature=0.8)
+        rng.choice(vocab, p=probs)
+    loop = (time.perf_counter() - start) / rows * batch
+
+    print(f"\nOne step, {batch} x {vocab:,} logits:")
+    print(f"  top_p_sampling + rng.choice per row: {loop:.2f} s (extrapolated)")
+    peaked = logits * 3  # a confident model: nucleus of a few tokens
+    for label, matrix, options in [
+            ("top_p=0.9", logits, {"top_p": 0.9}),
+            ("top_p=0.9, peaked logits", peaked, {"top_p": 0.9}),
+            ("top_k=50, top_p=0.9", logits, {"top_k": 50, "top_p": 0.9}),
+            ("top_k=50", logits, {"top_k": 50})]:
+        start = time.perf_counter()
+        sample(matrix, temperature=0.8, rng=rng, **options)
+        elapsed = time.perf_counter() - start
+        print(f"  sample({label}): {elapsed:.2f} s ({loop / elapsed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
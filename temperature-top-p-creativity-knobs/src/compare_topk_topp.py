@@ -1,6 +1,7 @@
 # compare_topk_topp.py
 
 import numpy as np
+from nucleus import find_nucleus
 from softmax_with_temperature import softmax_with_temperature
 
 def compare_topk_topp():
@@ -15,16 +16,13 @@ def compare_topk_topp():
     for name, logits in [("Confident", confident_logits),
                          ("Uncertain", uncertain_logits)]:
         probs = softmax_with_temperature(logits, 1.0)
-        sorted_idx = np.argsort(probs)[::-1]
-        sorted_probs = probs[sorted_idx]
 
-        # Top-k=3
+        # Top-k=3 (a partition is enough to pick the three largest)
         topk_included = 3
-        topk_mass = np.sum(sorted_probs[:topk_included])
+        topk_mass = np.sum(np.partition(probs, -topk_included)[-topk_included:])
 
         # Top-p=0.9
-        cumsum = np.cumsum(sorted_probs)
-        topp_included = np.searchsorted(cumsum, 0.9) + 1
+        topp_included = len(find_nucleus(probs, 0.9))
 
         print(f"{name} model:")
         print(f"  Top-k=3: includes {topk_included} tokens, "
@@ -0,0 +1,323 @@
+# logits_processors.py
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+from batched_sampling import _top_candidates
+from nucleus import batched_nucleus
+from softmax_kernel import softmax_kernel
+
+
+class LogitsProcessor(ABC):
+    """One stage of a sampling pipeline.
+
+    Stages take a float (batch, vocab) logit matrix and modify it in place,
+    removing tokens by setting them to -inf. `input_ids` is the (batch,
+    length) token history, padded with -1, for stages that need it.
+    """
+
+    @abstractmethod
+    def __call__(self, logits, input_ids=None):
+        ...
+
+
+class TemperatureProcessor(LogitsProcessor):
+    def __init__(self, temperature):
+        self.temperature = temperature
+
+    def __call__(self, logits, input_ids=None):
+        if self.temperature == 0:
+            # Greedy: everything but each row's max is removed
+            best = np.argmax(logits, axis=1)[:, None]
+            top = np.take_along_axis(logits, best, axis=1)
+            logits.fill(-np.inf)
+            np.put_along_axis(logits, best, top, axis=1)
+        else:
+            logits /= self.temperature
+        return logits
+
+
+def _history_counts(input_ids, vocab):
+    """Rows, token ids and counts of every (row, token) pair in the history."""
+    input_ids = np.atleast_2d(input_ids)
+    rows = np.broadcast_to(np.arange(input_ids.shape[0])[:, None], input_ids.shape)
+    valid = input_ids >= 0
+    pairs, counts = np.unique(rows[valid] * vocab + input_ids[valid], return_counts=True)
+    return pairs // vocab, pairs % vocab, counts
+
+
+class RepetitionPenaltyProcessor(LogitsProcessor):
+    """Divide positive logits (multiply negative ones) of already-seen tokens."""
+
+    def __init__(self, penalty):
+        self.penalty = penalty
+
+    def __call__(self, logits, input_ids=None):
+        if input_ids is None or self.penalty == 1.0:
+            return logits
+        rows, tokens, _ = _history_counts(input_ids, logits.shape[1])
+        seen = logits[rows, tokens]
+        logits[rows, tokens] = np.where(seen > 0, seen / self.penalty,
+                                        seen * self.penalty)
+        return logits
+
+
+class FrequencyPenaltyProcessor(LogitsProcessor):
+    """Subtract frequency_penalty per occurrence plus presence_penalty once."""
+
+    def __init__(self, frequency_penalty=0.0, presence_penalty=0.0):
+        self.frequency_penalty = frequency_penalty
+        self.presence_penalty = presence_penalty
+
+    def __call__(self, logits, input_ids=None):
+        if input_ids is None:
+            return logits
+        rows, tokens, counts = _history_counts(input_ids, logits.shape[1])
+        logits[rows, tokens] -= self.frequency_penalty * counts + self.presence_penalty
+        return logits
+
+
+class TopKProcessor(LogitsProcessor):
+    """Keep exactly top_k tokens per row; ties at the k-th logit are broken
+    by argpartition, the same way FusedTruncation breaks them."""
+
+    def __init__(self, top_k):
+        self.top_k = top_k
+
+    def __call__(self, logits, input_ids=None):
+        vocab = logits.shape[1]
+        if 0 < self.top_k < vocab:
+            top = np.argpartition(logits, vocab - self.top_k, axis=1)[:, vocab - self.top_k:]
+            kept = np.take_along_axis(logits, top, axis=1)
+            logits.fill(-np.inf)
+            np.put_along_axis(logits, top, kept, axis=1)
+        return logits
+
+
+class TopPProcessor(LogitsProcessor):
+    def __init__(self, top_p):
+        self.top_p = top_p
+
+    def __call__(self, logits, input_ids=None):
+        if self.top_p >= 1.0:
+            return logits
+        order, _, keep = batched_nucleus(softmax_kernel(logits), self.top_p)
+        removed = np.ones(logits.shape, dtype=bool)
+        kept = np.arange(order.shape[1]) < keep[:, None]
+        removed[np.nonzero(kept)[0], order[kept]] = False
+        logits[removed] = -np.inf
+        return logits
+
+
+class MinPProcessor(LogitsProcessor):
+    """Remove tokens less likely than min_p times the row's top token."""
+
+    def __init__(self, min_p):
+        self.min_p = min_p
+
+    def __call__(self, logits, input_ids=None):
+        if self.min_p <= 0:
+            return logits
+        # p_i < min_p·p_max  <=>  logit_i < max_logit + log(min_p)
+        threshold = logits.max(axis=1, keepdims=True) + np.log(self.min_p)
+        logits[logits < threshold] = -np.inf
+        return logits
+
+
+class TypicalProcessor(LogitsProcessor):
+    """Locally typical sampling: keep the tokens whose surprisal is closest
+    to the distribution's entropy, until they hold `mass` of the probability."""
+
+    def __init__(self, mass):
+        self.mass = mass
+
+    def __call__(self, logits, input_ids=None):
+        if self.mass >= 1.0:
+            return logits
+        log_probs = softmax_kernel(logits, log=True)
+        probs = np.exp(log_probs)
+        entropy = -np.sum(np.where(probs > 0, probs * log_probs, 0.0), axis=1, keepdims=True)
+        with np.errstate(invalid="ignore"):
+            score = np.abs(-log_probs - entropy)
+        score[~np.isfinite(score)] = np.inf
+        order = np.argsort(score, axis=1)
+        cumsum = np.cumsum(np.take_along_axis(probs, order, axis=1), axis=1)
+        keep = (cumsum < self.mass).sum(axis=1) + 1
+        removed = np.arange(logits.shape[1]) >= keep[:, None]
+        np.put_along_axis(logits, order, np.where(removed, -np.inf,
+                                                  np.take_along_axis(logits, order, axis=1)),
+                          axis=1)
+        return logits
+
+
+class FusedTruncation(LogitsProcessor):
+    """Top-k, top-p and min-p from one partial sort.
+
+    Applies them in that order (top-p on what top-k leaves, renormalized;
+    min-p relative to the top token, which neither removes). Top-k fixes the
+    candidate count directly; without it, min-p's threshold count or the
+    adaptive nucleus search decides how many candidates to partition out.
+    """
+
+    def __init__(self, top_k=0, top_p=1.0, min_p=0.0):
+        self.top_k = top_k
+        self.top_p = top_p
+        self.min_p = min_p
+
+    def __call__(self, logits, input_ids=None):
+        batch, vocab = logits.shape
+        top_k = 0 < self.top_k < vocab
+        threshold = (logits.max(axis=1, keepdims=True) + np.log(self.min_p)
+                     if self.min_p > 0 else None)
+        if top_k:
+            k = self.top_k
+        elif threshold is not None:
+            # Nothing below the min-p threshold survives, so the widest
+            # row's count of tokens above it bounds the candidates
+            k = int((logits >= threshold).sum(axis=1).max())
+        else:
+            k = vocab
+
+        if k == vocab and self.top_p < 1.0:
+            order, _, keep = batched_nucleus(softmax_kernel(logits), self.top_p)
+            values = np.take_along_axis(logits, order, axis=1)
+        else:
+            order, values = _top_candidates(logits, k)
+            keep = np.full(batch, k)
+            if self.top_p < 1.0:
+                if top_k:
+                    probs = softmax_kernel(values)
+                else:
+                    # Top-p sees the whole row, not just min-p's candidates
+                    shift = values[:, :1]
+                    total = np.exp(logits - shift).sum(axis=1, keepdims=True)
+                    probs = np.exp(values - shift) / total
+                cumsum = np.cumsum(probs, axis=1, dtype=np.float64)
+                keep = np.minimum((cumsum < self.top_p).sum(axis=1) + 1, k)
+
+        removed = np.arange(order.shape[1]) >= keep[:, None]
+        if threshold is not None:
+            removed |= values < threshold
+        values[removed] = -np.inf
+
+        logits.fill(-np.inf)
+        np.put_along_axis(logits, order, values, axis=1)
+        return logits
+
+
+# FusedTruncation's order: only runs that already follow it can be fused
+_FUSIBLE = (TopKProcessor, TopPProcessor, MinPProcessor)
+
+
+def _fusion_rank(processor):
+    for rank, kind in enumerate(_FUSIBLE):
+        if isinstance(processor, kind):
+            return rank
+    return None
+
+
+class LogitsPipeline:
+    """Runs processors in order, fusing runs of top-k/top-p/min-p stages.
+
+    A run is fused only while it follows FusedTruncation's order with at
+    most one stage of each kind; a stage that is out of order or repeats a
+    kind starts a new run, so the result always matches running the stages
+    one at a time.
+    """
+
+    def __init__(self, processors):
+        self.processors = []
+        run = []
+        for processor in list(processors) + [None]:
+            rank = None if processor is None else _fusion_rank(processor)
+            if rank is not None and (not run or rank > _fusion_rank(run[-1])):
+                run.append(processor)
+                continue
+            self._flush(run)
+            run = [processor] if rank is not None else []
+            if processor is not None and rank is None:
+                self.processors.append(processor)
+
+    def _flush(self, run):
+        if len(run) == 1:
+            self.processors.append(run[0])
+        elif run:
+            options = {}
+            for stage in run:
+                options.update(vars(stage))
+            self.processors.append(FusedTruncation(**options))
+
+    def __call__(self, logits, input_ids=None):
+        logits = np.atleast_2d(logits)
+        if logits.dtype not in (np.float32, np.float64):
+            logits = logits.astype(np.float64)
+        for processor in self.processors:
+            logits = processor(logits, input_ids)
+        return logits
+
+
+def main():
+    import time
+    from batched_sampling import sample
+
+    tokens = np.array(['the', 'a', 'one', 'some', 'that', 'this', 'an', 'my'])
+    logits = np.array([[3.0, 2.5, 2.0, 1.0, 0.5, 0.0, -0.5, -1.0]])
+    history = np.array([[0, 0, 1]])  # 'the' twice, 'a' once
+
+    print("Surviving tokens per stage (temperature 0.8):")
+    for label, stage in [("top-k=3", TopKProcessor(3)),
+                         ("top-p=0.9", TopPProcessor(0.9)),
+                         ("min-p=0.1", MinPProcessor(0.1)),
+                         ("typical=0.9", TypicalProcessor(0.9)),
+                         ("repetition 1.3", RepetitionPenaltyProcessor(1.3)),
+                         ("frequency 0.5", FrequencyPenaltyProcessor(0.5))]:
+        out = LogitsPipeline([TemperatureProcessor(0.8), stage])(logits.copy(), history)
+        probs = softmax_kernel(out[0])
+        shown = ", ".join(f"{t} {p:.2f}" for t, p in zip(tokens, probs) if p > 0)
+        print(f"  {label:15} {shown}")
+
+    # Fused vs one stage at a time on a decoding step
+    rng = np.random.default_rng(0)
+    batch = (rng.standard_normal((512, 100_000)) * 3).astype(np.float32)
+    history = rng.integers(0, 100_000, (512, 64))
+    stages = [RepetitionPenaltyProcessor(1.2), TemperatureProcessor(0.8),
+              TopKProcessor(100), TopPProcessor(0.9), MinPProcessor(0.05)]
+
+    fused = LogitsPipeline(stages)
+    start = time.perf_counter()
+    fused_out = fused(batch.copy(), history)
+    fused_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    unfused_out = batch.copy()
+    for stage in stages:
+        stage(unfused_out, history)
+    unfused_time = time.perf_counter() - start
+
+    same = np.array_equal(np.isfinite(fused_out), np.isfinite(unfused_out))
+    print(f"\n512 x 100,000 step, {[type(p).__name__ for p in fused.processors]}")
+    print(f"  stage by stage: {unfused_time:.2f} s, fused: {fused_time:.2f} s, "
+          f"same tokens kept: {'✓' if same else '✗'}")
+    print(f"  sampled ids: {sample(fused_out, rng=rng)[:8]}")
+
+    # Out-of-order or repeated truncation stages are not fused together,
+    # so every ordering keeps what running the stages one at a time keeps
+    print("\nOther orders, 8 x 2,000, stage by stage vs pipeline:")
+    small = rng.standard_normal((8, 2_000)) * 3
+    small[:, :4] = small[:, :1]  # ties at the top of every row
+    for order in ([TopPProcessor(0.5), TopKProcessor(20)],
+                  [MinPProcessor(0.2), TopPProcessor(0.5)],
+                  [TopKProcessor(50), TopKProcessor(5)],
+                  [TopKProcessor(2), MinPProcessor(0.1), TopPProcessor(0.9)]):
+        pipeline = LogitsPipeline(order)
+        one_at_a_time = small.copy()
+        for stage in order:
+            stage(one_at_a_time)
+        same = np.array_equal(np.isfinite(pipeline(small.copy())),
+                              np.isfinite(one_at_a_time))
+        names = " -> ".join(type(p).__name__ for p in pipeline.processors)
+        print(f"  {names:55} same tokens kept: {'✓' if same else '✗'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# nucleus.py
+
+import numpy as np
+
+# Candidate count for the first partition, how fast it grows, and the share
+# of the vocabulary past which a full sort is cheaper than partitioning again.
+# Each partition costs about a sixth of a full sort at 100k tokens, so one
+# generous first guess beats several small ones.
+START_K = 2048
+GROWTH = 3
+SORT_FRACTION = 0.1
+
+
+def _next_k(k, mass, smallest, p, growth):
+    """Next candidate count. Tokens past the top k are each at most as
+    likely as the k-th (`smallest`), so at least (p - mass) / smallest more
+    are needed; flat rows jump straight to a sort."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        needed = np.where(smallest > 0, np.ceil((p - mass) / smallest), np.inf)
+    return np.maximum(k * growth, k + needed)
+
+
+def _size_bound(probs, p):
+    """Lower bound on the nucleus size from the top probability alone: no
+    token holds more than the row's maximum. Costs one pass, no sort. It is
+    loose (only a row of equal probabilities meets it), so callers start
+    from growth times it."""
+    with np.errstate(divide="ignore"):
+        return np.ceil(p / probs.max(axis=-1))
+
+
+def find_nucleus(probs, p, start_k=START_K, growth=GROWTH,
+                 sort_fraction=SORT_FRACTION):
+    """Indices of the top-p nucleus, most probable first.
+
+    Same cutoff as sorting the whole vocabulary: keep tokens up to and
+    including the first where the cumulative probability reaches p. Peaked
+    distributions only need their top few tokens sorted, so this partitions
+    out the top k (O(V)), sorts just those, and grows k until they hold p
+    of the mass. Flat distributions, recognized from their top probability
+    before any partition, go straight to one full sort.
+    """
+    probs = np.asarray(probs)
+    vocab = len(probs)
+    k = min(vocab, int(max(start_k, growth * _size_bound(probs, p))))
+    while True:
+        if k >= vocab * sort_fraction:
+            order = np.argsort(probs)[::-1]
+        else:
+            top = np.argpartition(probs, vocab - k)[vocab - k:]
+            order = top[np.argsort(probs[top])[::-1]]
+        cumsum = np.cumsum(probs[order])
+        # A prefix of the full sorted order gives the same cumsum values,
+        # so reaching p inside it settles the cutoff
+        if cumsum[-1] >= p or len(order) == vocab:
+            cutoff = min(np.searchsorted(cumsum, p) + 1, len(order))
+            return order[:cutoff]
+        k = int(min(vocab, _next_k(k, cumsum[-1], probs[order[-1]], p, growth)))
+
+
+def batched_nucleus(probs, p, start_k=START_K, growth=GROWTH,
+                    sort_fraction=SORT_FRACTION):
+    """find_nucleus for every row of a (batch, vocab) probability matrix.
+
+    Each row carries a lower bound on its nucleus size. Rows bounded past
+    sort_fraction of the vocabulary are sorted in full; every round
+    partitions the other pending rows with the largest of their bounds as
+    k, and rows whose nucleus doesn't fit get a larger bound. Returns (order, sorted_probs, keep): candidate ids
+    and probabilities per row, most probable first and padded with zero
+    probability, and the nucleus size of each row.
+    """
+    probs = np.atleast_2d(probs)
+    batch, vocab = probs.shape
+    need = np.maximum(growth * _size_bound(probs, p), start_k)
+    pending = np.arange(batch)
+    groups = []
+    while pending.size:
+        flat = need[pending] >= vocab * sort_fraction
+        if flat.any():
+            k = vocab
+            selected = pending[flat]
+        else:
+            # Partitioning costs about the same for any k this small, so
+            # every pending row gets the largest bound in one round
+            k = int(need[pending].max())
+            selected = pending
+        rows = probs if len(selected) == batch else probs[selected]
+        if k == vocab:
+            order = np.argsort(rows, axis=1)[:, ::-1]
+        else:
+            top = np.argpartition(rows, vocab - k, axis=1)[:, vocab - k:]
+            within = np.argsort(np.take_along_axis(rows, top, axis=1), axis=1)[:, ::-1]
+            order = np.take_along_axis(top, within, axis=1)
+        sorted_probs = np.take_along_axis(rows, order, axis=1)
+        cumsum = np.cumsum(sorted_probs, axis=1, dtype=np.float64)
+
+        done = (cumsum[:, -1] >= p) | (k == vocab)
+        if not done.all():
+            need[selected[~done]] = _next_k(k, cumsum[~done, -1], sorted_probs[~done, -1],
+                                            p, growth)
+            # Boolean indexing copies, so only subset when some rows go on
+            selected, order, sorted_probs, cumsum = (
+                selected[done], order[done], sorted_probs[done], cumsum[done])
+        keep = np.minimum((cumsum < p).sum(axis=1) + 1, k)
+        groups.append((selected, order, sorted_probs, keep))
+        pending = np.setdiff1d(pending, selected)
+
+    if len(groups) == 1:
+        # Every row settled in one round (all peaked, or all sorted in full)
+        return groups[0][1:]
+    width = max(group[1].shape[1] for group in groups)
+    order = np.zeros((batch, width), dtype=np.intp)
+    sorted_probs = np.zeros((batch, width), dtype=probs.dtype)
+    keep = np.empty(batch, dtype=np.intp)
+    for rows, group_order, group_probs, group_keep in groups:
+        order[rows, :group_order.shape[1]] = group_order
+        sorted_probs[rows, :group_probs.shape[1]] = group_probs
+        keep[rows] = group_keep
+    return order, sorted_probs, keep
+
+
+def main():
+    import time
+    from softmax_kernel import softmax_kernel
+    from softmax_with_temperature import softmax_with_temperature
+
+    rng = np.random.default_rng(0)
+    vocab = 100_000
+
+    def best_of(function, repeats):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = function()
+            times.append(time.perf_counter() - start)
+        return result, min(times)
+
+    def full_sort(probs):
+        sorted_indices = np.argsort(probs)[::-1]
+        cutoff = np.searchsorted(np.cumsum(probs[sorted_indices]), 0.9) + 1
+        return sorted_indices[:cutoff]
+
+    def full_sort_batch(probs):
+        order = np.argsort(probs, axis=1)[:, ::-1]
+        cumsum = np.cumsum(np.take_along_axis(probs, order, axis=1), axis=1)
+        return (cumsum < 0.9).sum(axis=1) + 1
+
+    print(f"Nucleus (p=0.9) over {vocab:,} tokens: full argsort vs adaptive "
+          f"(best of 20)")
+    print("-" * 60)
+    for label, scale in [("peaked", 8.0), ("typical", 3.0), ("flat", 0.5)]:
+        probs = softmax_with_temperature(rng.standard_normal(vocab) * scale, 1.0)
+        reference, full = best_of(lambda: full_sort(probs), 20)
+        nucleus, adaptive = best_of(lambda: find_nucleus(probs, 0.9), 20)
+        same = np.array_equal(np.sort(nucleus), np.sort(reference))
+        print(f"  {label:8} {len(nucleus):6,} tokens: argsort {full * 1e3:6.2f} ms, "
+              f"adaptive {adaptive * 1e3:6.2f} ms, identical: {'✓' if same else '✗'}")
+
+    print(f"\nBatched, 64 x {vocab:,} (best of 3)")
+    print("-" * 60)
+    for label, scale in [("peaked", 8.0), ("typical", 3.0), ("flat", 0.5)]:
+        probs = softmax_kernel(rng.standard_normal((64, vocab)) * scale)
+        reference, full = best_of(lambda: full_sort_batch(probs), 3)
+        (_, _, keep), adaptive = best_of(lambda: batched_nucleus(probs, 0.9), 3)
+        same = np.array_equal(keep, reference)
+        print(f"  {label:8} argsort {full * 1e3:7.1f} ms, adaptive {adaptive * 1e3:7.1f} ms, "
+              f"same sizes: {'✓' if same else '✗'}")
+
+
+if __name__ == "__main__":
+    main()
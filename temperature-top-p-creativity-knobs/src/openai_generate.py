@@ -21,6 +21,8 @@ def openai_generate(prompt, temperature=1.0, top_p=1.0, n=5):
     return responses
 
 def main():
+    from response_cache import cached_openai_generate, default_cache
+
     # Experiment: Same prompt, different temperatures
     prompt = (
         "Complete this sentence creatively: "
@@ -34,9 +36,11 @@ def main():
     for temp in [0.0, 0.5, 1.0, 1.5]:
         print(f"\nTemperature = {temp}")
         print("-" * 40)
-        responses = openai_generate(prompt, temperature=temp, n=3)
+        responses = cached_openai_generate(prompt, temperature=temp, n=3)
         for i, r in enumerate(responses, 1):
             print(f"  {i}. {r[:70]}...")
 
+    print(f"\n{default_cache().report()}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
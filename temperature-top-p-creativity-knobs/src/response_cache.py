@@ -0,0 +1,224 @@
+# response_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "data", "response_cache.sqlite")
+
+# use: read and write; refresh: call the API and overwrite what's stored;
+# bypass: call the API and leave the cache untouched
+MODES = ("use", "refresh", "bypass")
+
+OPENAI_MODEL = "gpt-4o-mini"
+ANTHROPIC_MODEL = "claude-3-5-haiku-20241022"
+
+
+def cache_key(model, prompt, temperature, top_p, seed, index):
+    """Content address of the index-th completion for one request setting."""
+    fields = [model, prompt, float(temperature), float(top_p), seed, index]
+    return hashlib.sha256(json.dumps(fields).encode()).hexdigest()
+
+
+class ResponseCache:
+    """Completions stored in SQLite, with an in-memory LRU in front.
+
+    Each completion is stored under its own key: (model, prompt,
+    temperature, top_p, seed) plus its position among the n requested. Asking
+    for more completions than are stored only generates the missing ones.
+    `seed` just labels the run, so the same settings can be re-sampled
+    without overwriting an earlier run.
+
+    The mode defaults to the RESPONSE_CACHE_MODE environment variable, or
+    "use" if it is unset.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, memory_size=1024, mode=None):
+        mode = mode or os.environ.get("RESPONSE_CACHE_MODE", "use")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.mode = mode
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT, prompt TEXT, temperature REAL, top_p REAL,
+                seed TEXT, idx INTEGER, response TEXT, created REAL)""")
+        self._db.commit()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / total if total else 0.0
+
+    def report(self):
+        total = self.memory_hits + self.disk_hits + self.misses
+        return (f"Response cache ({self.mode}): {self.hit_rate:.0%} hit rate over "
+                f"{total} completions ({self.memory_hits} memory, "
+                f"{self.disk_hits} disk, {self.misses} generated)")
+
+    def _remember(self, key, response):
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+            row = self._db.execute("SELECT response FROM responses WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is None:
+                return None
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def _store(self, entries):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(key, *fields, response, time.time()) for key, fields, response in entries])
+            self._db.commit()
+            for key, _, response in entries:
+                self._remember(key, response)
+
+    def _pending(self, model, prompt, temperature, top_p, n, seed):
+        """Keys, cached responses (None where missing) and missing indices."""
+        keys = [cache_key(model, prompt, temperature, top_p, seed, i) for i in range(n)]
+        responses = ([None] * n if self.mode != "use"
+                     else [self._lookup(key) for key in keys])
+        missing = [i for i, response in enumerate(responses) if response is None]
+        self.misses += len(missing)
+        return keys, responses, missing
+
+    def _fill(self, keys, responses, missing, fresh, fields):
+        entries = []
+        for i, response in zip(missing, fresh):
+            responses[i] = response
+            entries.append((keys[i], (*fields, i), response))
+        if entries and self.mode != "bypass":
+            self._store(entries)
+        return responses
+
+    @staticmethod
+    def _fields(model, prompt, temperature, top_p, seed):
+        return model, prompt, temperature, top_p, None if seed is None else str(seed)
+
+    def generate(self, generate, model, prompt, temperature=1.0, top_p=1.0, n=5,
+                 seed=None):
+        """n completions from `generate` (openai_generate's signature),
+        answered from the cache where possible."""
+        keys, responses, missing = self._pending(model, prompt, temperature, top_p, n, seed)
+        fresh = (generate(prompt, temperature=temperature, top_p=top_p, n=len(missing))
+                 if missing else [])
+        return self._fill(keys, responses, missing, fresh,
+                          self._fields(model, prompt, temperature, top_p, seed))
+
+    async def agenerate(self, generate, model, prompt, temperature=1.0, top_p=1.0, n=5,
+                        seed=None):
+        """generate() for an async `generate`, such as the async_generate
+        generators' uncached requests."""
+        keys, responses, missing = self._pending(model, prompt, temperature, top_p, n, seed)
+        fresh = (await generate(prompt, temperature=temperature, top_p=top_p,
+                                n=len(missing)) if missing else [])
+        return self._fill(keys, responses, missing, fresh,
+                          self._fields(model, prompt, temperature, top_p, seed))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._memory.clear()
+
+    def close(self):
+        self._db.close()
+
+
+_default_cache = None
+
+
+def default_cache():
+    """The shared cache at DEFAULT_PATH, opened on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
+
+
+def cached_openai_generate(prompt, temperature=1.0, top_p=1.0, n=5, seed=None, cache=None):
+    """openai_generate through the response cache."""
+    def generate(*args, **kwargs):
+        # Imported on a miss, so replays need neither the SDK nor a key
+        from openai_generate import openai_generate
+        return openai_generate(*args, **kwargs)
+    return (cache or default_cache()).generate(generate, OPENAI_MODEL, prompt,
+                                               temperature, top_p, n, seed)
+
+
+def cached_anthropic_generate(prompt, temperature=1.0, top_p=1.0, n=5, seed=None, cache=None):
+    """anthropic_generate through the response cache."""
+    # anthropic_generate clamps to [0, 1]; clamp first so T=1.5 and T=1.0,
+    # the same request, share one entry
+    temperature = max(0.0, min(1.0, temperature))
+
+    def generate(*args, **kwargs):
+        from anthropic_generate import anthropic_generate
+        return anthropic_generate(*args, **kwargs)
+    return (cache or default_cache()).generate(generate, ANTHROPIC_MODEL, prompt,
+                                               temperature, top_p, n, seed)
+
+
+def main():
+    import tempfile
+    from stub_llm_server import StubLLMServer
+
+    prompt = (
+        "Complete this sentence creatively: "
+        "The robot looked at the sunset and felt"
+    )
+    path = os.path.join(tempfile.mkdtemp(prefix="response_cache_"), "responses.sqlite")
+
+    # The stub answers in 200 ms, standing in for the API
+    with StubLLMServer(latency=0.2) as stub:
+        os.environ["OPENAI_API_KEY"] = "stub"
+        os.environ["OPENAI_BASE_URL"] = stub.openai_base_url
+
+        print("Temperature experiment (4 temperatures x 3 completions):")
+        for run, mode, n in [("first run", "use", 3), ("rerun", "use", 3),
+                             ("rerun, n=5", "use", 5), ("refresh", "refresh", 3),
+                             ("bypass", "bypass", 3)]:
+            # A new cache object per run: the memory LRU starts empty, so
+            # reruns are served from SQLite as they would be in a new process
+            cache = ResponseCache(path, mode=mode)
+            start = time.perf_counter()
+            for temp in [0.0, 0.5, 1.0, 1.5]:
+                responses = cached_openai_generate(prompt, temperature=temp, n=n,
+                                                   cache=cache)
+            elapsed = time.perf_counter() - start
+            print(f"  {run:12} {elapsed:5.2f} s  {cache.report()}")
+            cache.close()
+        print(f"\nLast T=1.5 completion: {responses[-1]}")
+
+
+if __name__ == "__main__":
+    main()
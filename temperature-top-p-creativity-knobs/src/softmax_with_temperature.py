@@ -7,7 +7,7 @@ def softmax_with_temperature(logits, temperature):
     """Apply temperature scaling before softmax."""
     if temperature == 0:
         # Greedy: return one-hot for max logit
-        result = np.zeros_like(logits)
+        result = np.zeros_like(logits, dtype=float)
         result[np.argmax(logits)] = 1.0
         return result
     scaled = logits / temperature
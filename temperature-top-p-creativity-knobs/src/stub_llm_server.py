@@ -0,0 +1,180 @@
+# stub_llm_server.py
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENDINGS = [
+    "a quiet warmth it had no word for.",
+    "the weight of every day it had counted.",
+    "strangely small beneath the burning sky.",
+    "something like longing, humming in its circuits.",
+    "the urge to paint, though it had no hands.",
+    "grateful that the light still came back each morning.",
+]
+
+
+class StubLLMServer:
+    """A local stand-in for the OpenAI and Anthropic HTTP APIs.
+
+    Answers POST /v1/chat/completions and /v1/messages with canned
+    completions (always the first ending at temperature 0), after `latency`
+    seconds. A `rate_limit_fraction` of requests get a 429 with a
+    Retry-After header instead. Counts requests, 429s and TCP connections
+    so clients can be checked for retries and connection reuse.
+
+    Use as a context manager; point clients at `openai_base_url` and
+    `anthropic_base_url`.
+    """
+
+    def __init__(self, latency=0.1, rate_limit_fraction=0.0, retry_after=0.05, seed=0):
+        self.latency = latency
+        self.rate_limit_fraction = rate_limit_fraction
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self.connections = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self):
+        return self.url + "/v1"
+
+    @property
+    def anthropic_base_url(self):
+        return self.url
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _completion(self, temperature):
+        with self._lock:
+            if temperature == 0:
+                return ENDINGS[0]
+            return self._rng.choice(ENDINGS)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, headers=()):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                time.sleep(stub.latency)
+
+                with stub._lock:
+                    stub.requests += 1
+                    limited = stub._rng.random() < stub.rate_limit_fraction
+                    stub.rate_limited += limited
+                if limited:
+                    error = {"type": "rate_limit_error", "message": "Rate limit exceeded"}
+                    self._send(429, {"type": "error", "error": error},
+                               [("Retry-After", str(stub.retry_after))])
+                    return
+
+                temperature = request.get("temperature", 1.0)
+                model = request.get("model", "stub")
+                if self.path.rstrip("/") == "/v1/chat/completions":
+                    choices = [{"index": i, "finish_reason": "stop",
+                                "message": {"role": "assistant",
+                                            "content": stub._completion(temperature)}}
+                               for i in range(request.get("n", 1))]
+                    self._send(200, {"id": "chatcmpl-stub", "object": "chat.completion",
+                                     "created": int(time.time()), "model": model,
+                                     "choices": choices})
+                elif self.path.rstrip("/") == "/v1/messages":
+                    self._send(200, {"id": "msg_stub", "type": "message",
+                                     "role": "assistant", "model": model,
+                                     "content": [{"type": "text",
+                                                  "text": stub._completion(temperature)}],
+                                     "stop_reason": "end_turn",
+                                     "usage": {"input_tokens": 0, "output_tokens": 0}})
+                else:
+                    self._send(404, {"type": "error", "error": {
+                        "type": "not_found_error", "message": self.path}})
+
+        return Handler
+
+
+def main():
+    import asyncio
+    import os
+    from async_generate import AsyncAnthropicGenerator, AsyncOpenAIGenerator
+
+    prompt = "The robot looked at the sunset and felt"
+    temperatures = [0.0, 0.5, 1.0, 1.5]
+
+    # 200 ms per request; one request in five is rate limited
+    with StubLLMServer(latency=0.2, rate_limit_fraction=0.2) as stub:
+        os.environ["OPENAI_API_KEY"] = "stub"
+        os.environ["OPENAI_BASE_URL"] = stub.openai_base_url
+        from openai_generate import openai_generate
+
+        start = time.perf_counter()
+        for temp in temperatures:
+            openai_generate(prompt, temperature=temp, n=3)
+        sequential = time.perf_counter() - start
+        print("Temperature sweep (4 temperatures x 3 completions) against the stub:")
+        print(f"  openai_generate loop:           {sequential:.2f} s, "
+              f"{stub.requests} requests, {stub.rate_limited} rate limited")
+
+        async def sweeps():
+            async with AsyncOpenAIGenerator("stub", stub.openai_base_url) as gpt, \
+                    AsyncAnthropicGenerator("stub", stub.anthropic_base_url) as claude:
+                for label, generator in (("AsyncOpenAIGenerator", gpt),
+                                         ("AsyncAnthropicGenerator", claude)):
+                    requests, limited, connections = (stub.requests, stub.rate_limited,
+                                                      stub.connections)
+                    start = time.perf_counter()
+                    results = await generator.sweep(prompt, temperatures, n=3)
+                    elapsed = time.perf_counter() - start
+                    print(f"  {label + '.sweep:':31} {elapsed:.2f} s, "
+                          f"{stub.requests - requests} requests, "
+                          f"{stub.rate_limited - limited} rate limited, "
+                          f"{generator.retries} retries, "
+                          f"{stub.connections - connections} connections")
+                    assert all(len(r) == 3 for r in results.values())
+                    assert len(set(results[0.0])) == 1
+
+        asyncio.run(sweeps())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # temp_topp_interaction.py
 
 import numpy as np
+from nucleus import find_nucleus
 from softmax_with_temperature import softmax_with_temperature
 
 def temp_topp_interaction():
@@ -16,9 +17,7 @@ def temp_topp_interaction():
 
     for T in temperatures:
         probs = softmax_with_temperature(logits, T)
-        sorted_probs = np.sort(probs)[::-1]
-        cumsum = np.cumsum(sorted_probs)
-        tokens_included = np.searchsorted(cumsum, p) + 1
+        tokens_included = len(find_nucleus(probs, p))
         print(f"  T={T}: {tokens_included} tokens")
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 # test_determinism.py
 
-from openai_generate import openai_generate
+from response_cache import cached_openai_generate, default_cache
 
 def test_determinism(prompt, n_trials=10):
-    """Test whether temperature=0 produces identical outputs."""
-    responses = openai_generate(prompt, temperature=0, n=n_trials)
+    """Test whether temperature=0 produces identical outputs.
+
+    Responses go through the response cache, so reruns replay the recorded
+    trials; set RESPONSE_CACHE_MODE=refresh to sample the API again.
+    """
+    responses = cached_openai_generate(prompt, temperature=0, n=n_trials)
     unique_responses = set(responses)
 
     print(f"Unique responses at T=0: {len(unique_responses)} / {n_trials}")
@@ -30,4 +34,6 @@ if __name__ == "__main__":
     test_determinism(
         "Write a paragraph about a robot discovering emotions.",
         n_trials=5
-    )
\ No newline at end of file
+    )
+
+    print(f"\n{default_cache().report()}")
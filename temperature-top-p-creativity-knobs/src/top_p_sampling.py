@@ -1,30 +1,25 @@
 # top_p_sampling
 
 import numpy as np
+from nucleus import find_nucleus
+from softmax_kernel import softmax_kernel
 from softmax_with_temperature import softmax_with_temperature
 
 def top_p_sampling(logits, p, temperature=1.0):
     """Apply nucleus (top-p) sampling."""
-    # First apply temperature
-    probs = softmax_with_temperature(logits, temperature)
-
-    # Sort by probability
-    sorted_indices = np.argsort(probs)[::-1]
-    sorted_probs = probs[sorted_indices]
-
-    # Find cumulative sum
-    cumsum = np.cumsum(sorted_probs)
-
-    # Find cutoff index (first index where cumsum >= p)
-    cutoff_idx = np.searchsorted(cumsum, p) + 1
-
-    # Create mask
-    mask = np.zeros_like(probs)
-    mask[sorted_indices[:cutoff_idx]] = 1
-
-    # Apply mask and renormalize
-    masked_probs = probs * mask
-    return masked_probs / np.sum(masked_probs)
+    # First apply temperature (fused, so the only array allocated is probs)
+    probs = softmax_kernel(logits, temperature)
+
+    # Tokens up to the first where the cumulative probability reaches p,
+    # found without sorting the whole vocabulary
+    nucleus = find_nucleus(probs, p)
+
+    # Keep the nucleus and renormalize, reusing the probs array
+    kept = probs[nucleus]
+    probs.fill(0.0)
+    probs[nucleus] = kept
+    probs /= np.sum(kept)
+    return probs
 
 def main():
     # Example